@@ -0,0 +1,125 @@
+"""
+Benchmark: hex-string keyed follower state vs interned address IDs
+
+Simulates the per-follower state the monitor keeps for a large vault - the
+address column of the follower table, a follower map keyed by address (as in
+the ranking, the stream and the batched cache) and the previous-PnL alert
+state - once with 42-character hex strings as keys (the old layout) and once
+with an AddressRegistry (20-byte addresses, int32 IDs, arrays indexed by ID).
+Reports traced memory and lookup times. The API's own address strings are
+created up front and are not counted; the registry's copy of each address
+is.
+
+Usage:
+    python benchmark_addresses.py [--addresses 1000000] [--lookups 200000]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from hyperliquid_address import AddressRegistry
+
+
+def traced(build):
+    """Run ``build`` and return (result, bytes it allocated and kept)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def _arg(name: str, default: int) -> int:
+    if name in sys.argv:
+        try:
+            return int(sys.argv[sys.argv.index(name) + 1])
+        except (IndexError, ValueError):
+            print(f"⚠️  Invalid {name} value, using default: {default}")
+    return default
+
+
+def main():
+    count = _arg('--addresses', 1_000_000)
+    lookups = _arg('--lookups', 200_000)
+    rng = random.Random(42)
+    addresses = ['0x' + rng.randbytes(20).hex() for _ in range(count)]
+    pnl = np.random.default_rng(42).uniform(-50_000, 1_500_000, count)
+    pnl_list = pnl.tolist()
+
+    print("=" * 80)
+    print(f"Address benchmark - {count:,} addresses, {lookups:,} lookups")
+    print("=" * 80)
+
+    def build_strings():
+        column = np.empty(count, dtype=object)
+        column[:] = addresses
+        by_address = {address: i for i, address in enumerate(addresses)}
+        previous = {f"pnl_{address}": value for address, value in zip(addresses, pnl_list)}
+        return column, by_address, previous
+
+    (column, by_address, previous), before_bytes, before_build = traced(build_strings)
+
+    def build_ids():
+        registry = AddressRegistry()
+        ids = registry.intern_many(addresses)
+        by_id = {address_id: i for i, address_id in enumerate(ids.tolist())}
+        previous_pnl = np.full(len(registry), np.nan)
+        previous_pnl[ids] = pnl
+        return registry, ids, by_id, previous_pnl
+
+    (registry, ids, by_id, previous_pnl), after_bytes, after_build = traced(build_ids)
+
+    print(f"{'':<34} {'hex strings':>14} {'interned IDs':>14}")
+    print(f"{'memory kept':<34} {before_bytes / 1e6:>12.1f}MB {after_bytes / 1e6:>12.1f}MB")
+    print(f"{'build':<34} {before_build * 1000:>12.1f}ms {after_build * 1000:>12.1f}ms")
+
+    sample = rng.sample(range(count), min(lookups, count))
+    sample_addresses = [addresses[i] for i in sample]
+    sample_ids = ids[sample]
+    sample_id_list = sample_ids.tolist()
+
+    started = time.perf_counter()
+    for address in sample_addresses:
+        previous[f"pnl_{address}"]
+    before_prev = time.perf_counter() - started
+
+    started = time.perf_counter()
+    previous_pnl[sample_ids]
+    after_prev = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for address in sample_addresses:
+        by_address[address]
+    before_map = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for address_id in sample_id_list:
+        by_id[address_id]
+    after_map = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for address in sample_addresses:
+        registry.lookup(address)
+    boundary = time.perf_counter() - started
+
+    started = time.perf_counter()
+    registry.hex_many(sample_ids[:100])
+    display = time.perf_counter() - started
+
+    per = 1e9 / len(sample)
+    print(f"{'previous PnL lookup (per row)':<34} {before_prev * per:>12.1f}ns {after_prev * per:>12.1f}ns")
+    print(f"{'follower map lookup (per row)':<34} {before_map * per:>12.1f}ns {after_map * per:>12.1f}ns")
+    print(f"{'hex -> ID at the input boundary':<34} {'-':>14} {boundary * per:>12.1f}ns")
+    print(f"{'ID -> hex for 100 displayed rows':<34} {'-':>14} {display * 1e6:>12.1f}us")
+    print("=" * 80)
+    assert registry.hex_many(ids[:3]) == addresses[:3]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Benchmark: history schema migration and compaction on a large database
+
+Builds a synthetic history database in the original schema (text
+timestamps, no keys or indexes on ``vaults`` and ``leaderboard``): ``--days``
+of snapshots of ``--vaults`` vaults every ``--interval`` seconds, each with a
+follower frame and a vault row, plus a ``--leaderboard``-row global
+leaderboard per poll. The defaults make a database of about 8.5GB.
+
+It then times the queries the history is read with on the legacy tables,
+migrates the database to the current schema, times them again, compacts it
+(raw snapshots for 24h, one per minute for 30 days, hourly after that) and
+times them once more, reporting the file size at every step.
+
+Usage:
+    python benchmark_compaction.py [--days 35] [--vaults 2] [--followers 500] [--interval 5]
+                                   [--leaderboard 100] [--path history_bench.db] [--vacuum] [--keep]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from hyperliquid_address import ADDRESS_DTYPE
+from hyperliquid_history import SnapshotStore, FRAME_COLUMNS, KEYFRAME, DELTA
+
+
+HLP_VAULT = '0xdfc24b077bc1425ad1dea75bcb6f8158e10df303'
+
+# The tables as hyperliquid_data.db had them before schema versioning
+LEGACY_SCHEMA = [
+    "CREATE TABLE vaults (timestamp TEXT, name TEXT, vault_address TEXT, leader TEXT, tvl REAL, status TEXT)",
+    "CREATE TABLE leaderboard (timestamp TEXT, rank INTEGER, user_address TEXT, total_pnl REAL, open_vaults INTEGER)",
+    """CREATE TABLE follower_frames (
+        vault TEXT NOT NULL, timestamp REAL NOT NULL, count INTEGER NOT NULL,
+        users BLOB NOT NULL, equity BLOB NOT NULL, pnl BLOB NOT NULL, all_time_pnl BLOB NOT NULL,
+        days BLOB NOT NULL, kind INTEGER NOT NULL DEFAULT 0, removed BLOB,
+        PRIMARY KEY (vault, timestamp)
+    )""",
+]
+
+LEGACY_QUERIES = {
+    'user PnL, 30 days': (
+        "SELECT timestamp, total_pnl FROM leaderboard WHERE user_address = ? AND timestamp >= ?"
+    ),
+    'TVL per hour, 30 days': (
+        "SELECT substr(timestamp, 1, 13), MIN(tvl), MAX(tvl), COUNT(*) FROM vaults "
+        "WHERE vault_address = ? AND timestamp >= ? GROUP BY 1"
+    ),
+    'keyframe lookup': (
+        "SELECT MAX(timestamp) FROM follower_frames WHERE vault = ? AND kind = 0 AND timestamp <= ?"
+    ),
+}
+
+
+def _text(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def build_legacy(path: str, days: float, vaults: int, followers: int, interval: float,
+                 leaderboard: int, keyframe_every: int = 120, drift: float = 0.05, seed: int = 42):
+    """
+    Write a legacy-schema database of synthetic snapshots
+
+    Returns:
+        (vault addresses, leaderboard user to query, first timestamp, last timestamp)
+    """
+    rng = np.random.default_rng(seed)
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    for sql in LEGACY_SCHEMA:
+        conn.execute(sql)
+
+    addresses = [HLP_VAULT] + ['0x' + rng.bytes(20).hex() for _ in range(vaults - 1)]
+    states = []
+    for _ in addresses:
+        users = np.unique(np.frombuffer(rng.bytes(20 * followers), dtype=ADDRESS_DTYPE))
+        equity = rng.uniform(10, 5_000_000, len(users))
+        states.append({
+            'users': users,
+            'equity': equity,
+            'pnl': rng.uniform(-0.1, 0.4, len(users)) * equity,
+            'all_time_pnl': rng.uniform(-0.1, 1.2, len(users)) * equity,
+            'days': rng.integers(1, 900, len(users)),
+        })
+    pool = ['0x' + rng.bytes(20).hex() for _ in range(leaderboard * 5)]
+    pool_pnl = rng.uniform(0, 10_000_000, len(pool))
+
+    steps = int(days * 86_400 / interval)
+    end = float(int(time.time()) // 60 * 60)
+    start = end - (steps - 1) * interval
+    frames, vault_rows, leaderboard_rows = [], [], []
+
+    def write():
+        conn.execute("BEGIN")
+        conn.executemany("INSERT INTO follower_frames VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", frames)
+        conn.executemany("INSERT INTO vaults VALUES (?, ?, ?, ?, ?, ?)", vault_rows)
+        conn.executemany("INSERT INTO leaderboard VALUES (?, ?, ?, ?, ?)", leaderboard_rows)
+        conn.execute("COMMIT")
+        frames.clear()
+        vault_rows.clear()
+        leaderboard_rows.clear()
+
+    started = time.perf_counter()
+    for step in range(steps):
+        timestamp = start + step * interval
+        text = _text(timestamp)
+        for vault, state in zip(addresses, states):
+            count = len(state['users'])
+            moved = np.sort(rng.choice(count, max(1, int(count * drift)), replace=False))
+            delta = state['equity'][moved] * rng.normal(0, 0.002, len(moved))
+            state['equity'][moved] = np.maximum(0.0, state['equity'][moved] + delta)
+            state['pnl'][moved] += delta
+            state['all_time_pnl'][moved] += delta
+            if step % keyframe_every == 0:
+                kind, rows, removed = KEYFRAME, slice(None), None
+            else:
+                kind, rows, removed = DELTA, moved, b''
+            frames.append((vault, timestamp, count, state['users'][rows].tobytes(),
+                           *(np.ascontiguousarray(state[column][rows], dtype=dtype).tobytes()
+                             for column, dtype in FRAME_COLUMNS.items()),
+                           kind, removed))
+            vault_rows.append((text, 'Synthetic vault', vault, addresses[0], float(state['equity'].sum()), 'open'))
+
+        pool_pnl += rng.normal(0, 1_000, len(pool_pnl))
+        top = np.argsort(-pool_pnl)[:leaderboard]
+        leaderboard_rows.extend((text, rank, pool[i], float(pool_pnl[i]), 1) for rank, i in enumerate(top, 1))
+
+        if len(frames) >= 2000:
+            write()
+        if step and step % 50_000 == 0:
+            print(f"  {step:,}/{steps:,} polls, {os.path.getsize(path) / 1e9:.2f}GB, "
+                  f"{time.perf_counter() - started:.0f}s")
+    write()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    return addresses, pool[int(np.argmax(pool_pnl))], start, end
+
+
+def _arg(name: str, default: str) -> str:
+    if name in sys.argv:
+        try:
+            return sys.argv[sys.argv.index(name) + 1]
+        except IndexError:
+            print(f"⚠️  Missing {name} value, using default: {default}")
+    return default
+
+
+def _median_ms(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return float(np.median(times))
+
+
+def _size(path: str) -> str:
+    conn = sqlite3.connect(path)
+    page_size, pages, free = (conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+                              for pragma in ('page_size', 'page_count', 'freelist_count'))
+    conn.close()
+    return f"{page_size * pages / 1e9:.2f}GB file, {page_size * (pages - free) / 1e9:.2f}GB in use"
+
+
+def store_queries(store: SnapshotStore, vault: str, user: str, since: float, samples) -> dict:
+    conn = sqlite3.connect(store.path)
+    results = {
+        'user PnL, 30 days': _median_ms(lambda: store.leaderboard_history(user, since)),
+        'TVL per hour, 30 days': _median_ms(lambda: store.tvl_bars(vault, 3600, since)),
+        'keyframe lookup': _median_ms(lambda: conn.execute(
+            "SELECT MAX(timestamp) FROM follower_frames WHERE vault = ? AND kind = ? AND timestamp <= ?",
+            (vault, KEYFRAME, round(samples[0] * 1000))).fetchall()),
+        'snapshot_at': float(np.median([_median_ms(lambda: store.snapshot_at(vault, t), 1) for t in samples])),
+    }
+    conn.close()
+    return results
+
+
+def main():
+    days = float(_arg('--days', '35'))
+    vaults = int(_arg('--vaults', '2'))
+    followers = int(_arg('--followers', '500'))
+    interval = float(_arg('--interval', '5'))
+    leaderboard = int(_arg('--leaderboard', '100'))
+    path = _arg('--path', os.path.join(tempfile.mkdtemp(), 'history_bench.db'))
+
+    print("=" * 80)
+    print(f"Compaction benchmark - {days:g} days, {vaults} vaults x {followers:,} followers every "
+          f"{interval:g}s, {leaderboard}-row leaderboard")
+    print("=" * 80)
+
+    started = time.perf_counter()
+    addresses, user, first, last = build_legacy(path, days, vaults, followers, interval, leaderboard)
+    print(f"built legacy database   {time.perf_counter() - started:>8.1f}s  ({_size(path)})")
+
+    vault = addresses[0]
+    since = last - 30 * 86_400
+    rng = random.Random(42)
+    samples = [rng.uniform(first, last) for _ in range(20)]
+    results = {}
+
+    conn = sqlite3.connect(path)
+    params = {
+        'user PnL, 30 days': (user, _text(since)),
+        'TVL per hour, 30 days': (vault, _text(since)),
+        'keyframe lookup': (vault, samples[0]),
+    }
+    results['legacy'] = {name: _median_ms(lambda: conn.execute(sql, params[name]).fetchall())
+                         for name, sql in LEGACY_QUERIES.items()}
+    conn.close()
+
+    started = time.perf_counter()
+    store = SnapshotStore(path)
+    print(f"migrated to schema      {time.perf_counter() - started:>8.1f}s  ({_size(path)})")
+    results['migrated'] = store_queries(store, vault, user, since, samples)
+
+    started = time.perf_counter()
+    stats = store.compact(now=last)
+    print(f"compacted               {time.perf_counter() - started:>8.1f}s  ({_size(path)})")
+    print(f"  removed {stats['frames_removed']:,} frames, {stats['vault_rows_removed']:,} vault rows, "
+          f"{stats['leaderboard_rows_removed']:,} leaderboard rows; wrote {stats['bars_written']:,} bars")
+    results['compacted'] = store_queries(store, vault, user, since, samples)
+
+    if "--vacuum" in sys.argv:
+        started = time.perf_counter()
+        store.vacuum()
+        print(f"vacuumed                {time.perf_counter() - started:>8.1f}s  ({_size(path)})")
+    store.close()
+
+    print()
+    print(f"{'query (median ms)':<24}" + ''.join(f"{stage:>12}" for stage in results))
+    for name in results['compacted']:
+        print(f"{name:<24}" + ''.join(
+            f"{results[stage][name]:>12.2f}" if name in results[stage] else f"{'-':>12}" for stage in results
+        ))
+    print("=" * 80)
+    if "--keep" not in sys.argv:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Benchmark: delta-encoded follower history vs full snapshots
+
+Records a day of follower snapshots with SnapshotStore and reports how much
+smaller the keyframe + delta encoding is than storing every snapshot in
+full, and how long rebuilding the follower set at a random time takes.
+
+By default the day is synthetic: one vault polled every ``--interval``
+seconds, with a ``--drift`` fraction of followers moving per poll and 1% of
+those moves being a follower leaving and a new one joining (the same churn
+model as hyperliquid_mock_server). Pass a recording made with
+``hyperliquid_api_example.py --live --record session.jsonl`` to use real
+vaultDetails responses instead; they are stored at their recorded times.
+
+Usage:
+    python benchmark_history.py [--followers 2000] [--hours 24] [--interval 5] [--drift 0.05]
+                                [--keyframe-every 120] [--samples 200] [--recording session.jsonl]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from hyperliquid_address import ADDRESSES, ADDRESS_DTYPE
+from hyperliquid_history import SnapshotStore, Frame
+from hyperliquid_table import FollowerTable
+
+
+HLP_VAULT = '0xdfc24b077bc1425ad1dea75bcb6f8158e10df303'
+
+
+def synthetic_day(followers: int, hours: float, interval: float, drift: float, seed: int = 42):
+    """Yield (timestamp, vault_data, FollowerTable) for a synthetic day of polls"""
+    rng = np.random.default_rng(seed)
+    next_address = iter(range(1, 1 << 62))
+
+    def new_users(count):
+        packed = np.array([next(next_address).to_bytes(20, 'big') for _ in range(count)], dtype=ADDRESS_DTYPE)
+        return ADDRESSES.intern_packed(packed)
+
+    user_ids = new_users(followers)
+    equity = rng.uniform(10, 5_000_000, followers)
+    pnl = rng.uniform(-0.1, 0.4, followers) * equity
+    all_time_pnl = rng.uniform(-0.1, 1.2, followers) * equity
+    days = rng.integers(1, 900, followers)
+    vault_data = {'name': 'Hyperliquidity Provider (HLP)', 'leader': '0x' + '00' * 20, 'isClosed': False}
+
+    start = 1_700_000_000.0
+    for step in range(int(hours * 3600 / interval)):
+        moved = rng.choice(followers, max(1, int(followers * drift)), replace=False)
+        left = moved[rng.random(len(moved)) < 0.01]
+        delta = equity[moved] * rng.normal(0, 0.002, len(moved))
+        equity[moved] = np.maximum(0.0, equity[moved] + delta)
+        pnl[moved] += delta
+        all_time_pnl[moved] += delta
+        if len(left):
+            user_ids[left] = new_users(len(left))
+            days[left] = 0
+        if step and step % int(86_400 / interval) == 0:
+            days += 1
+        table = FollowerTable(user_ids.copy(), equity.copy(), pnl.copy(), all_time_pnl.copy(), days.copy())
+        yield start + step * interval, vault_data, table
+
+
+def recorded_day(path: str):
+    """Yield (timestamp, vault_data, FollowerTable) for recorded vaultDetails responses"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('payload', {}).get('type') != 'vaultDetails' or record.get('status') != 200:
+                continue
+            vault_data = json.loads(record['body'])
+            if not isinstance(vault_data, dict) or 'followers' not in vault_data:
+                continue
+            yield record['recorded_at'], vault_data, FollowerTable.from_followers(vault_data['followers'], keep_raw=False)
+
+
+def _arg(name: str, default: str) -> str:
+    if name in sys.argv:
+        try:
+            return sys.argv[sys.argv.index(name) + 1]
+        except IndexError:
+            print(f"⚠️  Missing {name} value, using default: {default}")
+    return default
+
+
+def main():
+    followers = int(_arg('--followers', '2000'))
+    hours = float(_arg('--hours', '24'))
+    interval = float(_arg('--interval', '5'))
+    drift = float(_arg('--drift', '0.05'))
+    keyframe_every = int(_arg('--keyframe-every', '120'))
+    samples = int(_arg('--samples', '200'))
+    recording = _arg('--recording', '')
+
+    if recording:
+        snapshots = recorded_day(recording)
+        source = f"recording {recording}"
+    else:
+        snapshots = synthetic_day(followers, hours, interval, drift)
+        source = (f"synthetic: {followers:,} followers, {hours:g}h every {interval:g}s, "
+                  f"{drift:.0%} moving per poll")
+
+    print("=" * 80)
+    print(f"History benchmark - {source}, keyframe every {keyframe_every}")
+    print("=" * 80)
+
+    path = os.path.join(tempfile.mkdtemp(), 'history.db')
+    store = SnapshotStore(path, batch_size=256, flush_interval=60, keyframe_every=keyframe_every)
+    rng = random.Random(42)
+    checks = {}
+
+    started = time.perf_counter()
+    timestamps = []
+    for timestamp, vault_data, table in snapshots:
+        store.append(HLP_VAULT, vault_data, table, timestamp)
+        timestamps.append(timestamp)
+        # Keep a few true snapshots to check reconstruction against
+        if rng.random() < 0.001:
+            checks[timestamp] = Frame.from_table(table)
+    store.flush()
+    write_s = time.perf_counter() - started
+    if not timestamps:
+        print("❌ No vaultDetails snapshots to store")
+        return
+
+    storage = store.storage(HLP_VAULT)
+    file_bytes = os.path.getsize(path)
+    print(f"snapshots written     {storage['frames']:>12,}  ({storage['keyframes']:,} keyframes, "
+          f"{write_s:.1f}s, {write_s / len(timestamps) * 1000:.2f}ms each)")
+    print(f"full snapshots        {storage['full_bytes'] / 1e6:>10.1f}MB")
+    print(f"keyframes + deltas    {storage['stored_bytes'] / 1e6:>10.1f}MB  (database file {file_bytes / 1e6:.1f}MB)")
+    print(f"compression ratio     {storage['full_bytes'] / max(1, storage['stored_bytes']):>11.1f}x")
+
+    latencies = []
+    for timestamp in rng.sample(timestamps, min(samples, len(timestamps))):
+        started = time.perf_counter()
+        store.snapshot_at(HLP_VAULT, timestamp)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies = np.array(latencies)
+    print(f"snapshot_at latency   p50 {np.percentile(latencies, 50):.2f}ms | "
+          f"p95 {np.percentile(latencies, 95):.2f}ms | max {latencies.max():.2f}ms")
+
+    for timestamp, expected in checks.items():
+        rebuilt = Frame.from_table(store.snapshot_at(HLP_VAULT, timestamp))
+        same = np.array_equal(rebuilt.users, expected.users) and all(
+            np.array_equal(rebuilt.columns[column], values) for column, values in expected.columns.items()
+        )
+        if not same:
+            print(f"❌ Snapshot at {timestamp} differs from what was recorded")
+    print(f"verified              {len(checks)} random snapshots rebuilt exactly")
+    print("=" * 80)
+    store.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
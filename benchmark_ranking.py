@@ -0,0 +1,98 @@
+"""
+Benchmark: full leaderboard sort vs top-N partial selection
+
+Builds synthetic vault followers and times three ways of getting the best N:
+the original ``sorted()`` over follower dicts with a float-parsing key,
+``FollowerTable.sort()[:N]`` and ``FollowerTable.top(N)``. Parsing the dicts
+into a table happens once per response and is reported separately. Every
+run checks that top(N) returns exactly the rows of the full sort, ties
+included.
+
+Usage:
+    python benchmark_ranking.py [--sizes 2000,100000,1000000] [--top 100] [--sort-by pnl] [--repeat 3]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from hyperliquid_leaderboard import sort_key_for
+from hyperliquid_table import FollowerTable
+
+
+def make_followers(num_followers: int, seed: int = 42):
+    """Synthetic follower dicts shaped like a vaultDetails response"""
+    rng = np.random.default_rng(seed)
+    equity = rng.uniform(10, 5_000_000, num_followers)
+    pnl = rng.uniform(-50_000, 500_000, num_followers)
+    # Round all-time PnL to whole dollars so the pnl ranking has real ties
+    all_time_pnl = np.round(rng.uniform(-50_000, 1_500_000, num_followers))
+    days = rng.integers(1, 900, num_followers)
+    return [
+        {
+            'user': f"0x{i:040x}",
+            'vaultEquity': f"{e:.6f}",
+            'pnl': f"{p:.6f}",
+            'allTimePnl': f"{a:.6f}",
+            'daysFollowing': int(d),
+        }
+        for i, (e, p, a, d) in enumerate(zip(equity.tolist(), pnl.tolist(), all_time_pnl.tolist(), days.tolist()))
+    ]
+
+
+def best_of(fn, repeat: int) -> float:
+    """Fastest of ``repeat`` runs in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _arg(name: str, default: str) -> str:
+    if name in sys.argv:
+        try:
+            return sys.argv[sys.argv.index(name) + 1]
+        except IndexError:
+            print(f"⚠️  Missing {name} value, using default: {default}")
+    return default
+
+
+def main():
+    sizes = [int(size) for size in _arg('--sizes', '2000,100000,1000000').split(',')]
+    top_n = int(_arg('--top', '100'))
+    sort_by = _arg('--sort-by', 'pnl')
+    repeat = int(_arg('--repeat', '3'))
+    key = sort_key_for(sort_by)
+
+    print("=" * 80)
+    print(f"Ranking benchmark - top {top_n} by {sort_by}, best of {repeat}")
+    print("=" * 80)
+    print(f"{'followers':>10} {'parse':>10} {'sorted()':>12} {'table.sort':>12} {'table.top':>12} {'speed-up':>10}")
+
+    for size in sizes:
+        followers = make_followers(size)
+
+        started = time.perf_counter()
+        table = FollowerTable.from_followers(followers)
+        parse_ms = (time.perf_counter() - started) * 1000
+
+        legacy_ms = best_of(lambda: sorted(followers, key=key, reverse=True)[:top_n], repeat)
+        sort_ms = best_of(lambda: table.sort(sort_by)[:top_n], repeat)
+        top_ms = best_of(lambda: table.top(top_n, sort_by), repeat)
+
+        expected = table.sort(sort_by)[:top_n].user_ids.tolist()
+        if table.top(top_n, sort_by).user_ids.tolist() != expected:
+            print(f"❌ top({top_n}) differs from the full sort at {size:,} followers")
+
+        print(f"{size:>10,} {parse_ms:>8.1f}ms {legacy_ms:>10.2f}ms {sort_ms:>10.2f}ms "
+              f"{top_ms:>10.2f}ms {legacy_ms / top_ms:>9.1f}x")
+
+    print("=" * 80)
+    print("speed-up = sorted() over dicts / table.top (parse excluded; it runs once per response)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark: module-level requests.post vs pooled HyperliquidTransport
+
+Starts a local keep-alive stub of the /info endpoint and fires the same
+``vaultDetails`` payload through both code paths, reporting requests/sec and
+p50/p99 latency. Loopback connections are nearly free, so the stub sleeps for
+``--handshake-ms`` whenever a new connection is accepted to stand in for the
+TCP+TLS round-trips paid against the real API.
+
+Usage:
+    python benchmark_transport.py [--requests 500] [--threads 4] [--followers 100] [--handshake-ms 30]
+"""
+
+import gzip
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from hyperliquid_transport import HyperliquidTransport
+
+
+HLP_VAULT = "0xdfc24b077bc1425ad1dea75bcb6f8158e10df303"
+
+
+def make_vault_body(num_followers: int) -> bytes:
+    """Build a synthetic vaultDetails response body"""
+    rng = random.Random(42)
+    followers = [
+        {
+            'user': '0x' + ''.join(rng.choice('0123456789abcdef') for _ in range(40)),
+            'vaultEquity': f"{rng.uniform(10, 5_000_000):.6f}",
+            'pnl': f"{rng.uniform(-50_000, 500_000):.6f}",
+            'allTimePnl': f"{rng.uniform(-50_000, 1_500_000):.6f}",
+            'daysFollowing': rng.randint(1, 900),
+            'vaultEntryTime': 1700000000000,
+            'lockupUntil': 1700000000000,
+        }
+        for _ in range(num_followers)
+    ]
+    return json.dumps({
+        'name': 'Hyperliquidity Provider (HLP)',
+        'vaultAddress': HLP_VAULT,
+        'leader': '0x677d831aef5328190852e24f13c46cac05f984e7',
+        'apr': 0.12,
+        'followers': followers,
+    }).encode()
+
+
+def start_stub_server(body: bytes, handshake_ms: int = 0):
+    """Start a keep-alive HTTP/1.1 stub server on a free local port"""
+    gz_body = gzip.compress(body)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            # Called once per accepted connection, not per request
+            time.sleep(handshake_ms / 1000)
+            super().setup()
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+            payload = gz_body if use_gzip else body
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            if use_gzip:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(label: str, post, url: str, total: int, threads: int):
+    """Fire ``total`` requests across ``threads`` workers and print stats"""
+    payload = {"type": "vaultDetails", "vaultAddress": HLP_VAULT}
+    latencies = []
+    lock = threading.Lock()
+
+    def one(_):
+        t0 = time.perf_counter()
+        response = post(url, payload)
+        response.raise_for_status()
+        response.json()
+        elapsed = time.perf_counter() - t0
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{label:<28} {total / wall:>10.1f} req/s   p50 {p50:>7.2f} ms   p99 {p99:>7.2f} ms")
+    return total / wall
+
+
+def _arg(name: str, default: int) -> int:
+    if name in sys.argv:
+        try:
+            return int(sys.argv[sys.argv.index(name) + 1])
+        except (IndexError, ValueError):
+            print(f"⚠️  Invalid {name} value, using default: {default}")
+    return default
+
+
+def main():
+    total = _arg('--requests', 500)
+    threads = _arg('--threads', 4)
+    num_followers = _arg('--followers', 100)
+    handshake_ms = _arg('--handshake-ms', 30)
+
+    server = start_stub_server(make_vault_body(num_followers), handshake_ms)
+    url = f"http://127.0.0.1:{server.server_address[1]}/info"
+
+    print("=" * 80)
+    print(f"Transport benchmark - {total} requests, {threads} threads, "
+          f"{num_followers} followers, {handshake_ms}ms simulated handshake")
+    print("=" * 80)
+
+    def baseline_post(u, payload):
+        return requests.post(u, json=payload, timeout=10)
+
+    before = run("requests.post (before)", baseline_post, url, total, threads)
+
+    with HyperliquidTransport(max_connections_per_host=threads) as transport:
+        run("pooled transport (warm-up)", transport.post, url, threads, threads)
+        after = run("pooled transport (after)", transport.post, url, total, threads)
+
+    print("=" * 80)
+    print(f"Speed-up: {after / before:.2f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
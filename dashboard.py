@@ -4,6 +4,7 @@ Interactive web dashboard similar to Hyperliquid homepage
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -11,6 +12,8 @@ from plotly.subplots import make_subplots
 import time
 from datetime import datetime
 from hyperliquid_api_example import HyperliquidAPI
+from hyperliquid_table import FollowerTable
+from hyperliquid_latest import open_snapshot, DEFAULT_SNAPSHOT_DIR
 
 # Page configuration
 st.set_page_config(
@@ -339,10 +342,15 @@ if 'auto_refresh' not in st.session_state:
 if 'refresh_interval' not in st.session_state:
     st.session_state.refresh_interval = 10
 
+@st.cache_resource(show_spinner=False)
+def get_api():
+    """Shared API client - one pooled keep-alive transport for every session"""
+    return HyperliquidAPI()
+
 @st.cache_data(ttl=60, show_spinner=False)
 def fetch_vault_data(vault_address, max_followers=2000):
     """Fetch vault data with caching - uses batched requests for up to 2000 followers"""
-    api = HyperliquidAPI()
+    api = get_api()
     
     # Use batched fetching to try to get up to max_followers
     # Note: API currently limits to 100 followers, but this is prepared for future pagination support
@@ -356,39 +364,38 @@ def fetch_vault_data(vault_address, max_followers=2000):
     
     return vault_data, leaderboard
 
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_global_leaderboard(vault_addresses, sort_by='pnl', top_k=100):
+    """Rank several vaults concurrently and k-way merge them into one top-K list"""
+    api = get_api()
+    result = api.get_multi_vault_leaderboard(list(vault_addresses), sort_by, top_k=top_k)
+    vault_counts = {vault: leaderboard.total for vault, leaderboard in result['vaults'].items()}
+    return vault_counts, result['global']
+
+def create_global_leaderboard_df(entries):
+    """Global leaderboard DataFrame with the source vault of each entry"""
+    df = create_leaderboard_df(entries, len(entries))
+    if not df.empty:
+        df.insert(2, 'Vault', [f"{e['vault'][:8]}...{e['vault'][-6:]}" for e in entries])
+    return df
+
 def create_leaderboard_df(leaderboard, top_n=50):
-    """Convert leaderboard to pandas DataFrame - optimized"""
-    if not leaderboard:
+    """Convert leaderboard to pandas DataFrame - columns come straight from the FollowerTable arrays"""
+    table = FollowerTable.from_followers(leaderboard)[:top_n]
+    if not len(table):
         return pd.DataFrame()
     
-    # Pre-allocate lists for better performance
-    ranks, users, equities, current_pnls, all_time_pnls, rois, days_list = [], [], [], [], [], [], []
-    
-    for i, entry in enumerate(leaderboard[:top_n], 1):
-        user = entry.get('user', 'N/A')
-        equity = float(entry.get('vaultEquity', 0))
-        current_pnl = float(entry.get('pnl', 0))
-        all_time_pnl = float(entry.get('allTimePnl', 0))
-        days = entry.get('daysFollowing', 0)
-        roi = (all_time_pnl / equity * 100) if equity > 0 else 0
-        
-        ranks.append(i)
-        users.append(f"{user[:8]}...{user[-6:]}")
-        equities.append(equity)
-        current_pnls.append(current_pnl)
-        all_time_pnls.append(all_time_pnl)
-        rois.append(roi)
-        days_list.append(days)
-    
-    return pd.DataFrame({
-        'Rank': ranks,
-        'User': users,
-        'Equity': equities,
-        'Current PnL': current_pnls,
-        'All-Time PnL': all_time_pnls,
-        'ROI (%)': rois,
-        'Days': days_list
+    df = table.to_dataframe().rename(columns={
+        'equity': 'Equity',
+        'pnl': 'Current PnL',
+        'all_time_pnl': 'All-Time PnL',
+        'roi': 'ROI (%)',
+        'days': 'Days'
     })
+    df.insert(0, 'Rank', np.arange(1, len(table) + 1))
+    df['User'] = [f"{user[:8]}...{user[-6:]}" for user in table.users]
+    
+    return df[['Rank', 'User', 'Equity', 'Current PnL', 'All-Time PnL', 'ROI (%)', 'Days']]
 
 def create_pnl_distribution_chart(df):
     """Create PnL distribution histogram - optimized"""
@@ -596,17 +603,43 @@ def main():
         step=5.0
     )
     
+    # Multi-vault global leaderboard
+    st.sidebar.subheader("🌐 Multi-Vault")
+    extra_vaults_text = st.sidebar.text_area(
+        "Additional Vault Addresses",
+        value="",
+        help="One address per line - ranks these together with the vault above"
+    )
+    extra_vaults = [v.strip() for v in extra_vaults_text.splitlines() if v.strip()]
+    global_top_k = st.sidebar.slider("Global Top K", 10, 500, 100)
+    
     # Auto-refresh
     st.sidebar.subheader("🔄 Auto-Refresh")
     auto_refresh = st.sidebar.checkbox("Enable Auto-Refresh", value=False)
     if auto_refresh:
         refresh_interval = st.sidebar.slider("Refresh Interval (seconds)", 5, 60, 10)
     
+    # Latest snapshot written by a running monitor (--snapshot-dir)
+    st.sidebar.subheader("📂 Collector Snapshot")
+    use_snapshot = st.sidebar.checkbox(
+        "Use collector snapshot when available",
+        value=True,
+        help="Memory-map the file written by `--live --snapshot-dir` instead of calling the API"
+    )
+    snapshot_dir = st.sidebar.text_input("Snapshot Directory", value=DEFAULT_SNAPSHOT_DIR)
+    snapshot_max_age = st.sidebar.number_input("Max Snapshot Age (seconds)", min_value=1, value=120)
+    snapshot = open_snapshot(vault_address, snapshot_dir, snapshot_max_age) if use_snapshot else None
+    
     # Fetch data with status indicator
     with st.status("🔄 Loading vault data...", expanded=True) as status:
-        st.markdown("**📡 Fetching vault details in batches...**")
-        st.markdown(f"**🎯 Target: {top_n} followers (requesting in batches of 100)**")
-        vault_data, leaderboard = fetch_vault_data(vault_address, max_followers=top_n)
+        if snapshot:
+            # Mapped columns - no request, no JSON parsing
+            st.markdown(f"**📂 Using collector snapshot ({snapshot.age:.0f}s old)**")
+            vault_data, leaderboard = snapshot.vault_data, snapshot.table()
+        else:
+            st.markdown("**📡 Fetching vault details in batches...**")
+            st.markdown(f"**🎯 Target: {top_n} followers (requesting in batches of 100)**")
+            vault_data, leaderboard = fetch_vault_data(vault_address, max_followers=top_n)
         
         if not vault_data or not leaderboard:
             status.update(label="❌ Failed to load data", state="error")
@@ -621,7 +654,14 @@ def main():
             st.markdown("**⚠️ Note:** Hyperliquid API currently limits responses to 100 followers maximum")
         
         st.markdown("**📊 Processing leaderboard data...**")
-        status.update(label="✅ Data loaded successfully!", state="complete")
+        
+        # Circuit breaker state - open circuits mean the data shown is cached
+        breaker = get_api().breaker
+        st.markdown(f"**🔌 {breaker.describe()}**")
+        if any(s['state'] != 'closed' for s in breaker.states().values()):
+            status.update(label="⚠️ Showing cached data - API circuit open", state="complete")
+        else:
+            status.update(label="✅ Data loaded successfully!", state="complete")
     
     # Vault Info Cards
     st.subheader("📈 Vault Overview")
@@ -649,7 +689,7 @@ def main():
         )
     
     with col4:
-        total_tvl = sum(float(f.get('vaultEquity', 0)) for f in leaderboard)
+        total_tvl = leaderboard.total_equity()
         st.metric(
             "Total TVL",
             f"${total_tvl:,.0f}"
@@ -732,6 +772,33 @@ def main():
         mime="text/csv"
     )
     
+    # Global leaderboard across vaults
+    if extra_vaults:
+        st.markdown("---")
+        all_vaults = tuple(dict.fromkeys([vault_address] + extra_vaults))
+        st.subheader(f"🌐 Global Leaderboard ({len(all_vaults)} vaults)")
+        
+        global_sort_options = {'All-Time PnL': 'pnl', 'ROI (%)': 'roi', 'Equity': 'equity', 'Days': 'days'}
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            global_sort = st.selectbox("Global sort by", list(global_sort_options))
+        
+        with st.spinner("🌐 Ranking vaults and merging leaderboards..."):
+            vault_counts, global_entries = fetch_global_leaderboard(
+                all_vaults, global_sort_options[global_sort], global_top_k
+            )
+        
+        with col2:
+            st.markdown(" | ".join(
+                f"**{vault[:8]}...{vault[-6:]}**: {count} followers" for vault, count in vault_counts.items()
+            ))
+        
+        global_df = create_global_leaderboard_df(global_entries)
+        if global_df.empty:
+            st.warning("⚠️ No follower data available for these vaults")
+        else:
+            st.dataframe(style_dataframe(global_df), use_container_width=True, height=600)
+    
     # Auto-refresh logic
     if auto_refresh:
         time.sleep(refresh_interval)
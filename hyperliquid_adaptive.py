@@ -0,0 +1,213 @@
+"""
+Hyperliquid Adaptive - Refresh interval driven by a vault's change rate
+
+A fixed refresh interval polls a quiet vault as often as a volatile one.
+AdaptiveInterval watches what each poll brought: the share of followers that
+joined, left or moved, the relative TVL change and how many followers are
+new in the top N. A poll counts as a change when any of them passes its
+threshold, and the rate of such changes is estimated over the last
+``window`` polls.
+
+Treating changes as a Poisson process at rate λ, a view refreshed every T
+seconds is on average
+
+    age(T) = T/2 - 1/λ + (1 - e^(-λT)) / (λ²T)
+
+seconds behind upstream. The controller picks the longest interval within
+``[min_interval, max_interval]`` whose age stays under
+``target_staleness``: a vault that rarely changes drifts to the maximum and
+costs few requests, and one that changes on every poll is polled at about
+twice the target (age never exceeds T/2, which is also the fallback when
+every recent poll saw a change and the rate cannot be estimated). Each
+adjustment is at most a factor of ``max_step`` and is skipped when it is
+within ``hysteresis`` of the current interval, so the interval does not
+flap.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Optional, Tuple
+
+import numpy as np
+
+from hyperliquid_table import FollowerTable
+
+
+def expected_age(rate: float, interval: float) -> float:
+    """Time-averaged staleness (seconds) of a view refreshed every ``interval``"""
+    x = rate * interval
+    if x < 1e-6:
+        return rate * interval * interval / 6
+    return interval / 2 - 1 / rate + (1 - math.exp(-x)) / (rate * x)
+
+
+def interval_for_staleness(rate: float, target: float, low: float, high: float) -> float:
+    """Longest interval in ``[low, high]`` whose expected_age is at most ``target``"""
+    if expected_age(rate, high) <= target:
+        return high
+    if expected_age(rate, low) >= target:
+        return low
+    for _ in range(40):
+        middle = (low + high) / 2
+        if expected_age(rate, middle) <= target:
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def measure_change(previous: Optional[FollowerTable], current: FollowerTable,
+                   top_n: int = 10, sort_by: str = 'pnl') -> Tuple[float, float, int]:
+    """
+    How much a vault changed between two snapshots
+
+    Returns:
+        (share of followers that joined, left or changed equity/PnL,
+         relative TVL change, followers new in the top ``top_n``)
+    """
+    if previous is None:
+        return 0.0, 0.0, 0
+    _, before, after = np.intersect1d(previous.user_ids, current.user_ids, return_indices=True)
+    moved = np.count_nonzero((previous.equity[before] != current.equity[after])
+                             | (previous.all_time_pnl[before] != current.all_time_pnl[after]))
+    churn = (len(previous) + len(current) - 2 * len(before) + moved) / max(1, len(previous), len(current))
+
+    tvl = previous.total_equity()
+    tvl_change = (current.total_equity() - tvl) / tvl if tvl else 0.0
+
+    top_changed = np.setdiff1d(current.top(top_n, sort_by).user_ids,
+                               previous.top(top_n, sort_by).user_ids).size
+    return churn, tvl_change, int(top_changed)
+
+
+class AdaptiveInterval:
+    """Refresh interval that follows a vault's observed change rate
+
+    Call ``observe()`` after every poll; ``interval`` is the delay to wait
+    before the next one. Every adjustment is kept in ``adjustments`` as
+    ``(unix time, old interval, new interval, reason)``.
+    """
+
+    def __init__(self, interval: float = 5.0, min_interval: float = 1.0, max_interval: float = 60.0,
+                 target_staleness: Optional[float] = None, window: int = 20, min_polls: int = 3,
+                 churn_threshold: float = 0.01, tvl_threshold: float = 0.001,
+                 max_step: float = 2.0, hysteresis: float = 0.1):
+        """
+        Args:
+            interval: Starting interval in seconds
+            min_interval: Shortest interval the controller may choose
+            max_interval: Longest interval the controller may choose
+            target_staleness: Average seconds the view may lag upstream
+                (default: a quarter of ``interval``)
+            window: Number of recent polls the change rate is estimated from
+            min_polls: Polls observed before the first adjustment
+            churn_threshold: Share of followers changed that counts as a change
+            tvl_threshold: Relative TVL move that counts as a change
+            max_step: Largest factor the interval changes by at once
+            hysteresis: Relative difference below which the interval is kept
+        """
+        if not 0 < min_interval <= max_interval:
+            raise ValueError(f"Invalid interval bounds: {min_interval} - {max_interval}")
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max_interval)
+        self.interval = self._clamp(interval)
+        self.target_staleness = target_staleness or interval / 4
+        self.min_polls = min_polls
+        self.churn_threshold = churn_threshold
+        self.tvl_threshold = tvl_threshold
+        self.max_step = max_step
+        self.hysteresis = hysteresis
+
+        self._polls = deque(maxlen=window)  # (seconds since previous poll, changed)
+        self.last_change = (0.0, 0.0, 0)
+        self.adjustments = deque(maxlen=100)
+
+    def raise_floor(self, seconds: float):
+        """
+        Never choose an interval below ``seconds``
+
+        Used with the response cache TTL: a poll sooner than that is answered
+        from the cache and would always look unchanged.
+        """
+        self.min_interval = min(self.max_interval, max(self.min_interval, seconds))
+        self.interval = self._clamp(self.interval)
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, float(interval)))
+
+    def change_rate(self) -> float:
+        """Changes per second over the window
+
+        A poll only shows whether *something* changed since the previous
+        one, so the share of changed polls p is converted with
+        λ = -ln(1 - p) / mean interval (several changes may hide in one poll).
+        """
+        if not self._polls:
+            return 0.0
+        polls = len(self._polls)
+        changed = sum(1 for _, was_changed in self._polls if was_changed)
+        if not changed:
+            return 0.0
+        elapsed = sum(seconds for seconds, _ in self._polls) / polls
+        share = min(changed, polls - 0.5) / polls
+        return -math.log(1 - share) / max(elapsed, 1e-3)
+
+    def observe(self, elapsed: float, churn: float = 0.0, tvl_change: float = 0.0,
+                top_changed: int = 0) -> Optional[str]:
+        """
+        Record one poll and re-tune the interval
+
+        Args:
+            elapsed: Seconds since the previous poll
+            churn, tvl_change, top_changed: What changed since the previous
+                poll (see measure_change); all zero when upstream was unchanged
+
+        Returns:
+            Reason for the new interval, or None when it was kept
+        """
+        changed = churn >= self.churn_threshold or abs(tvl_change) >= self.tvl_threshold or top_changed > 0
+        self._polls.append((elapsed, changed))
+        if changed:
+            self.last_change = (churn, tvl_change, top_changed)
+        if len(self._polls) < self.min_polls:
+            return None
+
+        rate = self.change_rate()
+        changes = sum(1 for _, was_changed in self._polls if was_changed)
+        if changes == len(self._polls):
+            # Every poll saw a change, so the rate is only known to be high:
+            # fall back to the bound age <= T/2, which holds for any rate
+            target = self._clamp(min(self.interval, 2 * self.target_staleness))
+        else:
+            target = interval_for_staleness(rate, self.target_staleness, self.min_interval, self.max_interval)
+        target = min(self.interval * self.max_step, max(self.interval / self.max_step, target))
+        if abs(target - self.interval) < self.hysteresis * self.interval:
+            return None
+
+        reason = f"{changes}/{len(self._polls)} recent polls changed"
+        if changes:
+            churn, tvl_change, top_changed = self.last_change
+            reason += (f" ({rate:.3f}/s; last: {churn:.1%} of followers, TVL {tvl_change:+.2%}, "
+                       f"{top_changed} new in top N)")
+        reason += f", target ≤{self.target_staleness:g}s stale: {self.interval:.1f}s -> {target:.1f}s"
+        return self._set(target, reason)
+
+    def reset(self, interval: float) -> Optional[str]:
+        """Adopt an interval chosen by hand (e.g. the monitor's 'i' key)"""
+        interval = self._clamp(interval)
+        if interval == self.interval:
+            return None
+        return self._set(interval, f"set by hand: {self.interval:.1f}s -> {interval:.1f}s")
+
+    def _set(self, interval: float, reason: str) -> str:
+        self.adjustments.append((time.time(), self.interval, interval, reason))
+        self.interval = interval
+        return reason
+
+    def describe(self) -> str:
+        """One-line status for the monitor header"""
+        changes = sum(1 for _, was_changed in self._polls if was_changed)
+        return (f"Adaptive interval {self.interval:.1f}s ({self.min_interval:g}-{self.max_interval:g}s) | "
+                f"{changes}/{len(self._polls)} polls changed | {self.change_rate():.3f} changes/s | "
+                f"target ≤{self.target_staleness:g}s stale")
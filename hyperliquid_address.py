@@ -0,0 +1,202 @@
+"""
+Hyperliquid Address Registry - Interned 20-byte addresses with integer IDs
+
+The API spells every address as a 42-character ``0x`` hex string, and the
+same follower address used to be held as a separate string in the raw dict,
+in cache dicts, in alert state keys and in DataFrames. AddressRegistry
+stores each address once as 20 raw bytes and hands out a dense integer ID
+for it. Tables, rankings and alert state key on the ID (or index NumPy
+arrays with it); hex strings are produced again only for display.
+
+IDs are process-local: they are handed out by the shared
+``ADDRESSES`` registry and must not be persisted.
+"""
+
+import threading
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+
+ADDRESS_BYTES = 20
+ADDRESS_DTYPE = np.dtype(f'S{ADDRESS_BYTES}')
+
+# ID used for rows without an address
+NO_ADDRESS = -1
+
+
+def pack_address(address: Union[str, bytes]) -> bytes:
+    """
+    20-byte form of an address
+
+    Args:
+        address: ``0x``-prefixed (or bare) hex string in any case, or the
+            20 raw bytes
+
+    Raises:
+        ValueError: Not a 20-byte address
+    """
+    if isinstance(address, str):
+        packed = bytes.fromhex(address[2:] if address[1:2] in ('x', 'X') else address)
+    else:
+        packed = bytes(address)
+    if len(packed) != ADDRESS_BYTES:
+        raise ValueError(f"not a {ADDRESS_BYTES}-byte address: {address!r}")
+    return packed
+
+
+class AddressRegistry:
+    """Thread-safe interning table: 20-byte address <-> dense int ID
+
+    Addresses live back to back in one fixed-width ``S20`` array (row ``i``
+    is ID ``i``). A byte-ordered copy with the matching IDs makes lookups a
+    binary search - vectorised for whole follower lists - so each address
+    costs 44 bytes instead of a Python string plus dict entry.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._addresses = np.zeros(capacity, dtype=ADDRESS_DTYPE)
+        self._sorted = np.zeros(0, dtype=ADDRESS_DTYPE)
+        self._sorted_ids = np.zeros(0, dtype=np.int32)
+        self._count = 0
+        self._lock = threading.Lock()
+        self.malformed = 0  # entries that were not 20-byte addresses
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, address: Union[str, bytes]) -> bool:
+        return self.lookup(address) is not None
+
+    def _find(self, packed: np.ndarray) -> np.ndarray:
+        """IDs of packed addresses, NO_ADDRESS where unknown (lock held)"""
+        if not self._count:
+            return np.full(len(packed), NO_ADDRESS, dtype=np.int32)
+        slots = np.minimum(np.searchsorted(self._sorted, packed), self._count - 1)
+        return np.where(self._sorted[slots] == packed, self._sorted_ids[slots], NO_ADDRESS).astype(np.int32)
+
+    def _add(self, packed: np.ndarray) -> np.ndarray:
+        """Register sorted, unique, unknown packed addresses and return their IDs (lock held)"""
+        start, end = self._count, self._count + len(packed)
+        if end > len(self._addresses):
+            grown = np.zeros(max(end, 2 * len(self._addresses)), dtype=ADDRESS_DTYPE)
+            grown[:start] = self._addresses[:start]
+            self._addresses = grown
+        self._addresses[start:end] = packed
+        ids = np.arange(start, end, dtype=np.int32)
+        slots = np.searchsorted(self._sorted, packed)
+        self._sorted = np.insert(self._sorted, slots, packed)
+        self._sorted_ids = np.insert(self._sorted_ids, slots, ids)
+        self._count = end
+        return ids
+
+    def intern_many(self, addresses: Iterable[Union[str, bytes, None]]) -> np.ndarray:
+        """
+        IDs of many addresses, registering new ones
+
+        Args:
+            addresses: Hex strings or raw 20-byte values; empty entries and
+                entries that are not 20-byte addresses map to NO_ADDRESS
+                (the latter are counted in ``malformed``)
+
+        Returns:
+            int32 array of IDs in input order
+        """
+        addresses = list(addresses)
+        present = np.fromiter((bool(address) for address in addresses), dtype=bool, count=len(addresses))
+        given = [address for address in addresses if address]
+        try:
+            # Usual case: every entry is a 0x-prefixed hex string, decoded in one call
+            if set(map(len, given)) - {42}:
+                raise ValueError
+            packed = np.frombuffer(bytes.fromhex(''.join([address[2:] for address in given])), dtype=ADDRESS_DTYPE)
+        except (TypeError, ValueError):
+            packed = []
+            for i, address in zip(np.flatnonzero(present), given):
+                try:
+                    packed.append(pack_address(address))
+                except (TypeError, ValueError):
+                    present[i] = False
+                    self._malformed(address)
+            packed = np.array(packed, dtype=ADDRESS_DTYPE)
+        ids = np.full(len(addresses), NO_ADDRESS, dtype=np.int32)
+        ids[present] = self.intern_packed(packed)
+        return ids
+
+    def _malformed(self, address):
+        with self._lock:
+            self.malformed += 1
+            first = self.malformed == 1
+        if first:
+            # Once per process: a bad row must not flood the live display
+            print(f"⚠️  Ignoring malformed address {address!r} (further ones are only counted)")
+
+    def intern_packed(self, packed: np.ndarray) -> np.ndarray:
+        """IDs of a fixed-width ``S20`` array of addresses, registering new ones"""
+        packed = np.asarray(packed, dtype=ADDRESS_DTYPE)
+        if not len(packed):
+            return np.zeros(0, dtype=np.int32)
+        with self._lock:
+            found = self._find(packed)
+            missing = found == NO_ADDRESS
+            if missing.any():
+                # np.unique also sorts them, as _add expects
+                new, inverse = np.unique(packed[missing], return_inverse=True)
+                found[missing] = self._add(new)[inverse]
+        return found
+
+    def _find_one(self, packed: bytes) -> Optional[int]:
+        with self._lock:
+            slot = int(np.searchsorted(self._sorted, packed))
+            # S20 items come back without trailing zero bytes
+            if slot < self._count and self._sorted[slot] == packed.rstrip(b'\0'):
+                return int(self._sorted_ids[slot])
+        return None
+
+    def intern(self, address: Union[str, bytes, None]) -> int:
+        """ID of one address, registering it on first sight (NO_ADDRESS for empty or malformed)"""
+        if not address:
+            return NO_ADDRESS
+        try:
+            address_id = self._find_one(pack_address(address))
+        except (TypeError, ValueError):
+            self._malformed(address)
+            return NO_ADDRESS
+        if address_id is None:
+            address_id = int(self.intern_many([address])[0])
+        return address_id
+
+    def lookup(self, address: Union[str, bytes, None]) -> Optional[int]:
+        """ID of an already registered address, or None (never registers)"""
+        if not address:
+            return None
+        try:
+            return self._find_one(pack_address(address))
+        except ValueError:
+            return None
+
+    def packed(self, address_ids) -> np.ndarray:
+        """Fixed-width ``S20`` array of the addresses behind some IDs"""
+        address_ids = np.asarray(address_ids, dtype=np.int64)
+        with self._lock:
+            if len(address_ids) and (address_ids.min() < 0 or address_ids.max() >= self._count):
+                raise KeyError("unknown address ID")
+            return self._addresses[address_ids]
+
+    def hex(self, address_id: int) -> str:
+        """``0x`` hex string of an ID ('' for NO_ADDRESS)"""
+        return self.hex_many([address_id])[0]
+
+    def hex_many(self, address_ids) -> List[str]:
+        """``0x`` hex strings of many IDs, decoded in one pass ('' for NO_ADDRESS)"""
+        address_ids = np.asarray(address_ids, dtype=np.int64)
+        valid = address_ids != NO_ADDRESS
+        # tobytes() keeps the trailing zero bytes that S20 items would drop
+        text = self.packed(address_ids[valid]).tobytes().hex()
+        width = 2 * ADDRESS_BYTES
+        hexes = iter(['0x' + text[i:i + width] for i in range(0, len(text), width)])
+        return [next(hexes) if ok else '' for ok in valid.tolist()]
+
+
+# Registry shared by every table, ranking and cache in the process
+ADDRESSES = AddressRegistry()
@@ -17,8 +17,29 @@ import time
 import os
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from hyperliquid_transport import HyperliquidTransport, HyperliquidAPIError, RecordingTransport, ReplayTransport
+from hyperliquid_bulk import BulkCheckpoint, iter_bounded
+from hyperliquid_json import get_decoder, decoder_name, iter_followers, LEADERBOARD_FIELDS
+from hyperliquid_cache import ResponseCache, ResponseDigests, SingleFlight, canonical_key, FRESH, STALE
+from hyperliquid_ratelimit import RateLimiter, endpoint_weight, backoff_delay, parse_retry_after
+from hyperliquid_stream import VaultFollowerStream
+from hyperliquid_resilience import CircuitBreaker, CircuitOpenError, LatencyTracker
+from hyperliquid_table import FollowerTable
+from hyperliquid_address import ADDRESSES, NO_ADDRESS
+from hyperliquid_ranking import IncrementalRanking
+from hyperliquid_store import FollowerStore
+from hyperliquid_history import SnapshotStore
+from hyperliquid_writer import BACKPRESSURE_POLICIES
+from hyperliquid_latest import write_snapshot, snapshot_path
+from hyperliquid_snapshot import VaultSnapshot, StageTimer
+from hyperliquid_adaptive import AdaptiveInterval, measure_change
+from hyperliquid_leaderboard import SORT_KEYS, sort_key_for, rank_followers, merge_leaderboards
 
 
 class Colors:
@@ -78,40 +99,76 @@ class InteractiveDashboard:
         self.alert_pnl_below = None
         self.alert_tvl_above = None
         self.previous_values = {}  # Track previous values for alerts
+        self.previous_pnl = np.full(0, np.nan)  # Last seen all-time PnL by address ID
         self.show_help = False
+        self.changed = threading.Event()  # Set when a setting changes
+        self.on_change = None  # Optional callback fired with it
+    
+    def notify_change(self):
+        """Wake the monitor loop so a new setting is shown immediately"""
+        self.changed.set()
+        if self.on_change:
+            self.on_change()
+    
+    def wait_for_change(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; return early (True) on a settings change"""
+        changed = self.changed.wait(timeout)
+        self.changed.clear()
+        return changed
+    
+    def alerts_enabled(self) -> bool:
+        return (self.alert_pnl_above is not None or self.alert_pnl_below is not None
+                or self.alert_tvl_above is not None)
         
-    def check_alerts(self, leaderboard: List[Dict[str, Any]], vault_data: Dict[str, Any]):
-        """Check for alert conditions and display notifications"""
+    def check_alerts(self, snapshot: VaultSnapshot):
+        """
+        Check for alert conditions and display notifications
+        
+        PnL alerts cover every follower passing the equity/ROI filters (not
+        just the displayed top N); the TVL alert covers all followers.
+        """
         alerts = []
+        leaderboard = snapshot.followers.filter(self.min_equity, self.min_roi)
         
         # Check PnL alerts for each follower
         if self.alert_pnl_above is not None or self.alert_pnl_below is not None:
-            for follower in leaderboard:
-                user = follower.get('user')
-                pnl = float(follower.get('allTimePnl', 0))
-                
-                # Check if we have previous value
-                prev_pnl = self.previous_values.get(f"pnl_{user}")
-                
-                if self.alert_pnl_above and pnl >= self.alert_pnl_above:
-                    if prev_pnl is None or prev_pnl < self.alert_pnl_above:
-                        alerts.append(
-                            f"🔔 {Colors.green('ALERT')}: User {user[:12]}... PnL crossed ${self.alert_pnl_above:,.2f} (now ${pnl:,.2f})"
-                        )
-                
-                if self.alert_pnl_below and pnl <= self.alert_pnl_below:
-                    if prev_pnl is None or prev_pnl > self.alert_pnl_below:
-                        alerts.append(
-                            f"🔔 {Colors.red('ALERT')}: User {user[:12]}... PnL dropped below ${self.alert_pnl_below:,.2f} (now ${pnl:,.2f})"
-                        )
-                
-                # Update previous value
-                self.previous_values[f"pnl_{user}"] = pnl
+            has_user = leaderboard.user_ids != NO_ADDRESS
+            ids = leaderboard.user_ids[has_user]
+            pnl = leaderboard.all_time_pnl[has_user]
+            
+            # Previous values live in an array indexed by address ID (NaN = not seen yet)
+            if len(self.previous_pnl) < len(ADDRESSES):
+                grown = np.full(len(ADDRESSES), np.nan)
+                grown[:len(self.previous_pnl)] = self.previous_pnl
+                self.previous_pnl = grown
+            prev_pnl = self.previous_pnl[ids]
+            
+            crossed = np.zeros(len(ids), dtype=bool)
+            dropped = np.zeros(len(ids), dtype=bool)
+            if self.alert_pnl_above:
+                crossed = (pnl >= self.alert_pnl_above) & ~(prev_pnl >= self.alert_pnl_above)
+            if self.alert_pnl_below:
+                dropped = (pnl <= self.alert_pnl_below) & ~(prev_pnl <= self.alert_pnl_below)
+            
+            # Only alerting rows are turned back into hex addresses
+            for i in np.flatnonzero(crossed | dropped).tolist():
+                user = ADDRESSES.hex(ids[i])
+                if crossed[i]:
+                    alerts.append(
+                        f"🔔 {Colors.green('ALERT')}: User {user[:12]}... PnL crossed ${self.alert_pnl_above:,.2f} (now ${pnl[i]:,.2f})"
+                    )
+                if dropped[i]:
+                    alerts.append(
+                        f"🔔 {Colors.red('ALERT')}: User {user[:12]}... PnL dropped below ${self.alert_pnl_below:,.2f} (now ${pnl[i]:,.2f})"
+                    )
+            
+            # Update previous values
+            self.previous_pnl[ids] = pnl
         
         # Check TVL alert
-        if self.alert_tvl_above and vault_data:
+        if self.alert_tvl_above:
             # Calculate total TVL from all followers
-            tvl = sum(float(f.get('vaultEquity', 0)) for f in leaderboard)
+            tvl = snapshot.tvl
             prev_tvl = self.previous_values.get('tvl')
             
             if tvl >= self.alert_tvl_above:
@@ -149,6 +206,7 @@ class InteractiveDashboard:
                 if user_input == 'q':
                     print("\n✅ Stopping dashboard...")
                     self.running = False
+                    self.notify_change()
                     break
                 
                 elif user_input == 'h':
@@ -160,6 +218,7 @@ class InteractiveDashboard:
                         if new_interval > 0:
                             self.refresh_interval = new_interval
                             print(f"✓ Refresh interval set to {new_interval}s")
+                            self.notify_change()
                     except ValueError:
                         print("❌ Invalid interval")
                 
@@ -169,6 +228,7 @@ class InteractiveDashboard:
                     if new_sort in ['pnl', 'roi', 'equity', 'days']:
                         self.sort_by = new_sort
                         print(f"✓ Sorting by {new_sort.upper()}")
+                        self.notify_change()
                     else:
                         print("❌ Invalid sort option")
                 
@@ -178,6 +238,7 @@ class InteractiveDashboard:
                         if new_top > 0:
                             self.top_n = new_top
                             print(f"✓ Showing top {new_top}")
+                            self.notify_change()
                     except ValueError:
                         print("❌ Invalid number")
                 
@@ -189,6 +250,7 @@ class InteractiveDashboard:
                             print(f"✓ Min equity filter set to ${self.min_equity:,.2f}")
                         else:
                             print("✓ Min equity filter cleared")
+                        self.notify_change()
                     except ValueError:
                         print("❌ Invalid equity value")
                 
@@ -200,6 +262,7 @@ class InteractiveDashboard:
                             print(f"✓ Min ROI filter set to {self.min_roi:.2f}%")
                         else:
                             print("✓ Min ROI filter cleared")
+                        self.notify_change()
                     except ValueError:
                         print("❌ Invalid ROI value")
                 
@@ -207,6 +270,7 @@ class InteractiveDashboard:
                     self.min_equity = None
                     self.min_roi = None
                     print("✓ All filters cleared")
+                    self.notify_change()
                 
             except EOFError:
                 break
@@ -232,8 +296,285 @@ class InteractiveDashboard:
 class HyperliquidAPI:
     """Client for interacting with the Hyperliquid API"""
     
-    def __init__(self, base_url: str = "https://api.hyperliquid.xyz/info"):
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+    
+    def __init__(self, base_url: str = "https://api.hyperliquid.xyz/info",
+                 transport: HyperliquidTransport = None,
+                 rate_limiter: RateLimiter = None, max_retries: int = 3,
+                 singleflight: SingleFlight = None, cache: ResponseCache = None,
+                 decoder: str = 'auto', hedge: bool = True,
+                 breaker: CircuitBreaker = None, latency: LatencyTracker = None,
+                 follower_store: FollowerStore = None):
+        """
+        Args:
+            base_url: Hyperliquid info endpoint
+            transport: Optional shared transport; by default the client owns a
+                pooled keep-alive transport for its lifetime
+            rate_limiter: Optional token bucket; by default a bucket shared by
+                every process on this host
+            max_retries: Retries after a 429/5xx or connection error
+            singleflight: Optional coalescer to share with other clients
+            cache: Optional response cache to share; pass False to disable
+            decoder: JSON decoder - 'auto' (orjson if installed), 'orjson' or 'json'
+            hedge: Send a duplicate request when the first one is slower than
+                the endpoint's observed p95; the first response wins
+            breaker: Optional per-endpoint circuit breaker to share
+            latency: Optional latency tracker to share
+            follower_store: Optional store for followers accumulated by
+                get_vault_details_batched; by default hyperliquid_data.db,
+                opened on first use
+        """
         self.base_url = base_url
+        self.transport = transport or HyperliquidTransport()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.singleflight = singleflight or SingleFlight()
+        self.cache = ResponseCache() if cache is None else (cache or None)
+        self.digests = ResponseDigests()
+        self.decode = get_decoder(decoder)
+        self.hedge = hedge
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = latency or LatencyTracker()
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._hedge_executor = None
+        self._hedge_lock = threading.Lock()
+        self._table_memo = {}
+        self._leaderboard_memo = {}
+        self._follower_store = follower_store
+        self._owns_follower_store = follower_store is None
+    
+    def close(self):
+        """Release pooled connections held by the transport"""
+        if self._hedge_executor:
+            self._hedge_executor.shutdown(wait=False)
+        if self._owns_follower_store and self._follower_store is not None:
+            self._follower_store.close()
+            self._follower_store = None
+        self.transport.close()
+    
+    @property
+    def follower_store(self) -> FollowerStore:
+        """Follower store, opened (and old JSON caches imported) on first use"""
+        if self._follower_store is None:
+            self._follower_store = FollowerStore()
+            self._follower_store.migrate_json()
+        return self._follower_store
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Client-side counters for tuning under load"""
+        return {
+            'rate_limiter': self.rate_limiter.metrics(),
+            'singleflight': self.singleflight.metrics(),
+            'cache': self.cache.metrics() if self.cache else None,
+            'digests': self.digests.metrics(),
+            'latency': self.latency.metrics(),
+            'hedging': {'hedged': self.hedged, 'hedge_wins': self.hedge_wins},
+            'breaker': self.breaker.metrics()
+        }
+    
+    def response_version(self, payload: Dict[str, Any]) -> int:
+        """
+        Version of the last distinct response body for a payload
+        
+        The version only changes when the upstream bytes change, so callers can
+        remember the version they last processed and skip work while it holds.
+        
+        Returns:
+            Opaque version number (0 if the payload was never fetched)
+        """
+        return self.digests.version(canonical_key(payload))
+    
+    def vault_version(self, vault_address: str) -> int:
+        """response_version of the plain vaultDetails request for a vault"""
+        return self.response_version({"type": "vaultDetails", "vaultAddress": vault_address})
+    
+    def _request(self, payload: Dict[str, Any]) -> Any:
+        """_request_versioned without the version"""
+        return self._request_versioned(payload)[0]
+    
+    def _request_versioned(self, payload: Dict[str, Any]) -> Tuple[Any, int]:
+        """
+        Serve a request from the response cache, or fetch it once for all
+        concurrent identical callers
+        
+        Args:
+            payload: The request payload
+            
+        Returns:
+            (JSON response from the API, its response_version). The response
+            is shared - treat it as read-only. While the endpoint's circuit
+            breaker is open this is the last cached response, however old.
+            The version is the one the body had when it was decoded, so it
+            always belongs to the response even if another thread has
+            fetched a newer body since.
+            
+        Raises:
+            HyperliquidAPIError: The request failed after max_retries
+            CircuitOpenError: The breaker is open and nothing is cached
+        """
+        key = canonical_key(payload)
+        
+        # Cache entries are (response, version) pairs, as returned by _send
+        if self.cache:
+            state, value = self.cache.lookup(key)
+            if state == FRESH:
+                return value
+            if state == STALE:
+                if self.cache.begin_refresh(key):
+                    threading.Thread(target=self._refresh, args=(payload, key), daemon=True).start()
+                return value
+        
+        try:
+            return self.singleflight.do(key, lambda: self._fetch(payload, key))
+        except CircuitOpenError:
+            value = self.cache.last_known(key) if self.cache else None
+            if value is None:
+                raise
+            self.breaker.record_served_stale()
+            return value
+    
+    def _fetch(self, payload: Dict[str, Any], key: str) -> Tuple[Any, int]:
+        """Send the request and store the result with its version in the cache"""
+        result = self._send(payload, key)
+        if self.cache:
+            self.cache.store(key, payload.get('type'), result)
+        return result
+    
+    def _refresh(self, payload: Dict[str, Any], key: str):
+        """Background stale-while-revalidate refresh"""
+        try:
+            self.singleflight.do(key, lambda: self._fetch(payload, key))
+        except HyperliquidAPIError as e:
+            print(f"Error refreshing cached request: {e}")
+        finally:
+            self.cache.end_refresh(key)
+    
+    def _send(self, payload: Dict[str, Any], key: str) -> Any:
+        """
+        Send a rate-limited request, retrying 429/5xx with jittered backoff
+        
+        Args:
+            payload: The request payload
+            key: Canonical payload key (for response digests)
+            
+        Returns:
+            (JSON response from the API, its response_version)
+            
+        Raises:
+            HyperliquidAPIError: The request still failed after max_retries
+        """
+        endpoint = payload.get('type')
+        try:
+            return self._send_attempts(payload, key, endpoint)
+        except HyperliquidAPIError:
+            raise
+        except BaseException:
+            # Every HyperliquidAPIError has been reported to the breaker
+            # already; anything else (a rate limiter or decoder error) would
+            # leave a half-open probe claimed for good
+            self.breaker.record_failure(endpoint)
+            raise
+    
+    def _send_attempts(self, payload: Dict[str, Any], key: str, endpoint: str) -> Tuple[Any, int]:
+        """The retry loop of _send"""
+        weight = endpoint_weight(endpoint)
+        error = None
+        
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow(endpoint):
+                raise CircuitOpenError(f"Circuit open for {endpoint}", error.status_code if error else None)
+            self.rate_limiter.acquire(weight)
+            try:
+                response = self._post(payload, endpoint, weight)
+            except requests.exceptions.RequestException as e:
+                self.breaker.record_failure(endpoint)
+                error = HyperliquidAPIError(str(e))
+                if attempt < self.max_retries:
+                    time.sleep(backoff_delay(attempt))
+                continue
+            
+            if response.status_code in self.RETRY_STATUS:
+                self.breaker.record_failure(endpoint)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                delay = backoff_delay(attempt, retry_after=retry_after)
+                error = HyperliquidAPIError(
+                    f"HTTP {response.status_code} for {payload.get('type')} (backing off {delay:.1f}s)",
+                    response.status_code
+                )
+                # Shared bucket: every process on the host pauses, not just this one
+                self.rate_limiter.penalize(delay)
+                continue
+            
+            try:
+                response.raise_for_status()
+                result = self.digests.resolve(key, response.content, self.decode)
+                self.breaker.record_success(endpoint)
+                return result
+            except (requests.exceptions.RequestException, ValueError) as e:
+                # A 4xx still means the API is answering; an undecodable 2xx body does not
+                if response.status_code < 400:
+                    self.breaker.record_failure(endpoint)
+                else:
+                    self.breaker.record_success(endpoint)
+                raise HyperliquidAPIError(str(e), response.status_code) from e
+        
+        raise error
+    
+    def _timed_post(self, payload: Dict[str, Any], endpoint: str) -> requests.Response:
+        """POST once and feed the response time into the latency tracker"""
+        started = time.perf_counter()
+        response = self.transport.post(self.base_url, payload)
+        if response.status_code < 500:
+            self.latency.record(endpoint, time.perf_counter() - started)
+        return response
+    
+    def _post(self, payload: Dict[str, Any], endpoint: str, weight: int) -> requests.Response:
+        """
+        POST a request, hedging it if it is slower than the endpoint's p95
+        
+        The duplicate is only sent when the rate limiter has tokens to spare
+        right now. The slower response is discarded when it arrives.
+        """
+        threshold = self.latency.percentile(endpoint) if self.hedge else None
+        if threshold is None:
+            return self._timed_post(payload, endpoint)
+        
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=2 * getattr(self.transport, 'max_connections_per_host', 10),
+                    thread_name_prefix='hedge'
+                )
+        executor = self._hedge_executor
+        
+        primary = executor.submit(self._timed_post, payload, endpoint)
+        try:
+            return primary.result(timeout=threshold)
+        except FuturesTimeout:
+            pass
+        
+        if not self.rate_limiter.try_acquire(weight):
+            return primary.result()
+        
+        with self._hedge_lock:
+            self.hedged += 1
+        hedge = executor.submit(self._timed_post, payload, endpoint)
+        
+        winner = None
+        for future in as_completed((primary, hedge)):
+            if future.exception() is None:
+                winner = future
+                break
+        if winner is None:
+            raise primary.exception()
+        
+        loser = hedge if winner is primary else primary
+        loser.add_done_callback(lambda f: f.exception() is None and f.result().close())
+        if winner is hedge:
+            with self._hedge_lock:
+                self.hedge_wins += 1
+        return winner.result()
     
     def _post_request(self, payload: Dict[str, Any]) -> Any:
         """
@@ -245,13 +586,15 @@ class HyperliquidAPI:
         Returns:
             The JSON response from the API
         """
+        return self._post_request_versioned(payload)[0]
+    
+    def _post_request_versioned(self, payload: Dict[str, Any]) -> Tuple[Any, int]:
+        """_post_request plus the response_version of the response ((None, 0) on failure)"""
         try:
-            response = requests.post(self.base_url, json=payload, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return self._request_versioned(payload)
+        except HyperliquidAPIError as e:
             print(f"Error making request: {e}")
-            return None
+            return None, 0
     
     def get_vault_details(self, vault_address: str, user: str = None, limit: int = None) -> Dict[str, Any]:
         """
@@ -265,6 +608,11 @@ class HyperliquidAPI:
         Returns:
             Vault details dictionary including name, leader, APR, followers, etc.
         """
+        return self._get_vault_details(vault_address, user, limit)[0]
+    
+    def _get_vault_details(self, vault_address: str, user: str = None,
+                           limit: int = None) -> Tuple[Dict[str, Any], int]:
+        """get_vault_details plus the response_version of that response"""
         payload = {
             "type": "vaultDetails",
             "vaultAddress": vault_address
@@ -281,9 +629,47 @@ class HyperliquidAPI:
         if limit:
             print(f"Requesting limit: {limit} followers...")
         
-        data = self._post_request(payload)
+        data, version = self._post_request_versioned(payload)
         
-        return data if data else {}
+        return (data, version) if data else ({}, 0)
+    
+    def iter_vault_followers(self, vault_address: str, fields: List[str] = LEADERBOARD_FIELDS,
+                             chunk_size: int = 64 * 1024):
+        """
+        Stream a vault's followers, parsing the followers array incrementally
+        
+        Only one follower object is held in memory at a time, and only the
+        requested fields are kept, so peak memory stays flat regardless of
+        follower count. Bypasses the response cache and digests.
+        
+        Args:
+            vault_address: Vault address to stream followers from
+            fields: Follower fields to keep (None keeps every field)
+            chunk_size: Bytes read from the socket per chunk
+            
+        Returns:
+            Iterator of follower dicts
+            
+        Raises:
+            HyperliquidAPIError: The request failed
+        """
+        payload = {"type": "vaultDetails", "vaultAddress": vault_address}
+        self.rate_limiter.acquire(endpoint_weight(payload['type']))
+        try:
+            response = self.transport.post(self.base_url, payload, stream=True)
+        except requests.exceptions.RequestException as e:
+            raise HyperliquidAPIError(str(e)) from e
+        
+        with response:
+            if response.status_code in self.RETRY_STATUS:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                self.rate_limiter.penalize(backoff_delay(0, retry_after=retry_after))
+            if response.status_code >= 400:
+                raise HyperliquidAPIError(f"HTTP {response.status_code} for vaultDetails", response.status_code)
+            try:
+                yield from iter_followers(response.iter_content(chunk_size), self.decode, fields)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                raise HyperliquidAPIError(str(e)) from e
     
     def get_vault_details_batched(self, vault_address: str, target_followers: int = 2000, batch_size: int = 100) -> Dict[str, Any]:
         """
@@ -291,7 +677,7 @@ class HyperliquidAPI:
         
         This function attempts multiple strategies to retrieve more followers:
         1. Makes repeated requests to catch any API updates
-        2. Stores followers persistently across dashboard runs
+        2. Stores followers persistently across dashboard runs (see FollowerStore)
         3. Gradually builds up to 2000+ unique followers over time
         
         Args:
@@ -302,25 +688,17 @@ class HyperliquidAPI:
         Returns:
             Vault details dictionary with merged followers from cache and new requests
         """
-        import json
-        import os
-        from pathlib import Path
-        
-        # Create cache directory
-        cache_dir = Path("vault_cache")
-        cache_dir.mkdir(exist_ok=True)
-        cache_file = cache_dir / f"{vault_address}_followers.json"
-        
-        # Load previously cached followers
+        # Load previously stored followers
+        store = self.follower_store
         all_followers = {}
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
-                    all_followers = {f['user']: f for f in cached_data.get('followers', [])}
-                    print(f"[CACHE] Loaded {len(all_followers)} followers from cache")
-            except Exception as e:
-                print(f"[CACHE] Failed to load cache: {e}")
+        try:
+            cached = store.load(vault_address)
+            all_followers = {user_id: follower for user_id, follower
+                             in zip(ADDRESSES.intern_many(f['user'] for f in cached).tolist(), cached)
+                             if user_id != NO_ADDRESS}
+            print(f"[CACHE] Loaded {len(all_followers)} followers from {store.path}")
+        except Exception as e:
+            print(f"[CACHE] Failed to load cache: {e}")
         
         num_batches = min(20, (target_followers - len(all_followers) + batch_size - 1) // batch_size)
         if num_batches <= 0:
@@ -364,15 +742,23 @@ class HyperliquidAPI:
             if 'followers' in data:
                 followers = data['followers']
                 new_count = 0
-                for follower in followers:
-                    user_addr = follower.get('user')
-                    if user_addr and user_addr not in all_followers:
-                        all_followers[user_addr] = follower
+                for user_id, follower in zip(ADDRESSES.intern_many(f.get('user') for f in followers).tolist(), followers):
+                    if user_id == NO_ADDRESS:
+                        continue
+                    if user_id not in all_followers:
                         new_count += 1
                         new_followers_found += 1
+                    all_followers[user_id] = follower
+                
+                # Only new or changed rows are written
+                try:
+                    stored = store.upsert(vault_address, followers)
+                except Exception as e:
+                    stored = 0
+                    print(f"   [CACHE] Failed to store followers: {e}")
                 
                 total_unique = len(all_followers)
-                print(f"   [SUCCESS] Received: {len(followers)} | New: {new_count} | Total: {total_unique}")
+                print(f"   [SUCCESS] Received: {len(followers)} | New: {new_count} | Stored: {stored} | Total: {total_unique}")
                 
                 # If no new followers after 3 consecutive requests, stop
                 if batch_num >= 2 and new_count == 0:
@@ -387,20 +773,6 @@ class HyperliquidAPI:
                 import time
                 time.sleep(0.3)
         
-        # Save to cache
-        if vault_data and all_followers:
-            try:
-                cache_data = {
-                    'vault_address': vault_address,
-                    'followers': list(all_followers.values()),
-                    'cached_at': str(datetime.now())
-                }
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(cache_data, f, indent=2)
-                print(f"\n[CACHE] Saved {len(all_followers)} followers to cache")
-            except Exception as e:
-                print(f"[CACHE] Failed to save cache: {e}")
-        
         # Combine vault data with all unique followers
         if vault_data:
             vault_data['followers'] = list(all_followers.values())
@@ -438,6 +810,55 @@ class HyperliquidAPI:
         
         return data if data else []
     
+    def iter_user_portfolios(self, user_addresses, max_concurrency: int = 8,
+                             checkpoint_path: str = None, include_completed: bool = False):
+        """
+        Bulk-fetch portfolios, streaming results back as they finish
+        
+        Requests go through the shared rate limiter with at most
+        ``max_concurrency`` in flight. A failure for one user is yielded as that
+        user's error instead of aborting the run. With ``checkpoint_path`` every
+        finished user is appended to a JSONL checkpoint, and users already
+        completed there are skipped, so a crashed 10k-user run resumes where it
+        stopped.
+        
+        Args:
+            user_addresses: Iterable of user wallet addresses (may be lazy)
+            max_concurrency: Maximum requests in flight
+            checkpoint_path: Optional JSONL checkpoint file for resumable runs
+            include_completed: Also yield results already in the checkpoint
+            
+        Returns:
+            Iterator of (user_address, portfolio, error) - ``error`` is None on success
+        """
+        checkpoint = BulkCheckpoint(checkpoint_path) if checkpoint_path else None
+        
+        def pending_users():
+            seen = set()
+            for user_address in user_addresses:
+                if user_address in seen:
+                    continue
+                seen.add(user_address)
+                if checkpoint and user_address in checkpoint.completed:
+                    continue
+                yield user_address
+        
+        def fetch(user_address):
+            return self._request({"type": "portfolio", "user": user_address}) or []
+        
+        try:
+            if checkpoint and include_completed:
+                for user_address, portfolio in checkpoint.results():
+                    yield user_address, portfolio, None
+            
+            for user_address, portfolio, error in iter_bounded(fetch, pending_users(), max_concurrency):
+                if checkpoint:
+                    checkpoint.record(user_address, portfolio, error)
+                yield user_address, portfolio, error
+        finally:
+            if checkpoint:
+                checkpoint.close()
+    
     def get_user_vault_equities(self, user_address: str) -> List[Dict[str, Any]]:
         """
         Fetch a user's vault deposit information
@@ -458,9 +879,51 @@ class HyperliquidAPI:
         
         return data if data else []
     
+    def get_vault_snapshot(self, vault_address: str) -> VaultSnapshot:
+        """
+        Fetch a vault once for everything one refresh needs
+        
+        Returns:
+            VaultSnapshot of the response, or None when the vault is
+            unavailable. Its followers are parsed on first use, once per
+            vault_version.
+        """
+        # The version comes with the response: another thread may fetch a
+        # newer body before vault_version() could be read
+        vault_data, version = self._get_vault_details(vault_address)
+        if not vault_data or 'followers' not in vault_data:
+            return None
+        
+        return VaultSnapshot(vault_address, vault_data, version,
+                             parse=lambda: self._parse_followers(vault_address, vault_data, version))
+    
+    def _parse_followers(self, vault_address: str, vault_data: Dict[str, Any], version: int) -> FollowerTable:
+        """FollowerTable of a response, memoized per vault_version"""
+        memo = self._table_memo.get(vault_address)
+        if memo and memo[0] == version:
+            return memo[1]
+        
+        table = FollowerTable.from_followers(vault_data['followers'])
+        self._table_memo[vault_address] = (version, table)
+        return table
+    
+    def get_follower_table(self, vault_address: str) -> FollowerTable:
+        """
+        Parsed, unranked followers of a vault
+        
+        The table is parsed once per vault_version, so re-ranking with other
+        settings and alert checks on the same response share one parse.
+        
+        Returns:
+            FollowerTable in API order (empty when the vault is unavailable)
+        """
+        snapshot = self.get_vault_snapshot(vault_address)
+        return snapshot.followers if snapshot else FollowerTable.empty()
+    
     def get_vault_leaderboard(self, vault_address: str, sort_by: str = 'pnl', 
                               min_equity: float = None, min_roi: float = None,
-                              use_batched: bool = False, target_followers: int = 2000) -> List[Dict[str, Any]]:
+                              use_batched: bool = False, target_followers: int = 2000,
+                              streaming: bool = False, top_n: int = None) -> FollowerTable:
         """
         Create a leaderboard from vault follower data with sorting and filtering
         
@@ -471,58 +934,81 @@ class HyperliquidAPI:
             min_roi: Minimum ROI filter (in percentage)
             use_batched: Whether to use batched requests to try fetching more followers
             target_followers: Target number of followers when using batched mode
+            streaming: Parse the followers array incrementally, keeping only
+                the leaderboard fields (see iter_vault_followers)
+            top_n: Only rank the best N followers; None fully sorts all of
+                them (see rank_followers)
             
         Returns:
-            List of follower data sorted by performance metrics
+            FollowerTable sorted by the metric (rows behave like read-only
+            follower dicts; ``total`` counts every follower that passed the
+            filters). When the vault's response body is unchanged (see
+            vault_version) the previously ranked table is returned without
+            re-ranking.
         """
+        if streaming:
+            print(f"Streaming vault followers for {vault_address}...")
+            try:
+                followers = list(self.iter_vault_followers(vault_address))
+            except HyperliquidAPIError as e:
+                print(f"Error making request: {e}")
+                return FollowerTable.empty()
+            return rank_followers(followers, sort_by, min_equity, min_roi, top_n)
+        
         if use_batched:
             vault_data = self.get_vault_details_batched(vault_address, target_followers=target_followers)
-        else:
-            vault_data = self.get_vault_details(vault_address)
+            if not vault_data or 'followers' not in vault_data:
+                print("No follower data available for this vault")
+                return FollowerTable.empty()
+            return rank_followers(vault_data['followers'], sort_by, min_equity, min_roi, top_n)
         
-        if not vault_data or 'followers' not in vault_data:
+        snapshot = self.get_vault_snapshot(vault_address)
+        if not snapshot:
             print("No follower data available for this vault")
-            return []
+            return FollowerTable.empty()
         
-        followers = vault_data['followers']
-        print(f"Creating leaderboard from {len(followers)} vault followers...")
+        # Unchanged response body + same parameters: reuse the ranked list as-is
+        table, version = snapshot.followers, snapshot.version
+        params = (sort_by, min_equity, min_roi, top_n)
+        memo = self._leaderboard_memo.get(vault_address)
+        if memo and memo[0] == version and memo[1] == params:
+            return memo[2]
         
-        # Apply filters
-        filtered_followers = followers
+        ranked = rank_followers(table, sort_by, min_equity, min_roi, top_n)
+        self._leaderboard_memo[vault_address] = (version, params, ranked)
+        return ranked
+    
+    def get_multi_vault_leaderboard(self, vault_addresses: List[str], sort_by: str = 'pnl',
+                                    min_equity: float = None, min_roi: float = None,
+                                    top_k: int = 100, max_workers: int = 8) -> Dict[str, Any]:
+        """
+        Rank several vaults concurrently and merge them into a global leaderboard
         
-        if min_equity is not None:
-            filtered_followers = [
-                f for f in filtered_followers 
-                if float(f.get('vaultEquity', 0)) >= min_equity
-            ]
-            print(f"Filtered to {len(filtered_followers)} followers with equity >= ${min_equity:,.2f}")
-        
-        if min_roi is not None:
-            def calc_roi(follower):
-                equity = float(follower.get('vaultEquity', 0))
-                pnl = float(follower.get('allTimePnl', 0))
-                if equity > 0:
-                    return (pnl / equity) * 100
-                return 0
+        Args:
+            vault_addresses: Vault addresses to rank
+            sort_by: Sort metric ('pnl', 'roi', 'equity', 'days')
+            min_equity: Minimum equity filter
+            min_roi: Minimum ROI filter (in percentage)
+            top_k: Number of entries in the global leaderboard
+            max_workers: Maximum vaults fetched at once
             
-            filtered_followers = [
-                f for f in filtered_followers 
-                if calc_roi(f) >= min_roi
-            ]
-            print(f"Filtered to {len(filtered_followers)} followers with ROI >= {min_roi:.2f}%")
-        
-        # Sort by specified metric
-        sort_keys = {
-            'pnl': lambda x: float(x.get('allTimePnl', 0)),
-            'roi': lambda x: (float(x.get('allTimePnl', 0)) / float(x.get('vaultEquity', 1))) * 100 if float(x.get('vaultEquity', 0)) > 0 else 0,
-            'equity': lambda x: float(x.get('vaultEquity', 0)),
-            'days': lambda x: int(x.get('daysFollowing', 0))
-        }
+        Returns:
+            Dictionary with 'vaults' (vault address -> its top-K ranked
+            followers; ``total`` has the full count) and
+            'global' (top-K followers across all vaults, tagged with 'vault')
+        """
+        vault_addresses = list(dict.fromkeys(vault_addresses))
         
-        sort_key = sort_keys.get(sort_by.lower(), sort_keys['pnl'])
-        sorted_followers = sorted(filtered_followers, key=sort_key, reverse=True)
+        def rank(vault_address):
+            return self.get_vault_leaderboard(vault_address, sort_by, min_equity, min_roi, top_n=top_k)
         
-        return sorted_followers
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(vault_addresses)))) as pool:
+            per_vault = dict(zip(vault_addresses, pool.map(rank, vault_addresses)))
+        
+        return {
+            'vaults': per_vault,
+            'global': merge_leaderboards(per_vault, sort_by, top_k)
+        }
     
     def get_meta(self) -> Dict[str, Any]:
         """
@@ -535,6 +1021,56 @@ class HyperliquidAPI:
         print("Fetching exchange metadata...")
         data = self._post_request(payload)
         return data if data else {}
+    
+    def _run_async(self, method: str, *args, **kwargs) -> Any:
+        """Run an AsyncHyperliquidAPI fan-out helper to completion from sync code"""
+        import asyncio
+        from hyperliquid_async import AsyncHyperliquidAPI
+        
+        async def run():
+            async with AsyncHyperliquidAPI(
+                self.base_url,
+                max_connections_per_host=self.transport.max_connections_per_host,
+                connect_timeout=self.transport.connect_timeout,
+                read_timeout=self.transport.read_timeout,
+                rate_limiter=self.rate_limiter,
+                max_retries=self.max_retries,
+                singleflight=self.singleflight,
+                cache=self.cache or False,
+                digests=self.digests,
+                decoder=decoder_name(self.decode)
+            ) as async_api:
+                return await getattr(async_api, method)(*args, **kwargs)
+        
+        return asyncio.run(run())
+    
+    def get_user_portfolios(self, user_addresses: List[str], max_concurrency: int = 16) -> Dict[str, List[List]]:
+        """
+        Fetch portfolio data for many users concurrently
+        
+        Args:
+            user_addresses: User wallet addresses
+            max_concurrency: Maximum number of requests in flight at once
+            
+        Returns:
+            Mapping of user address to portfolio data
+        """
+        print(f"Fetching portfolio data for {len(user_addresses)} users ({max_concurrency} in flight)...")
+        return self._run_async('get_user_portfolios', user_addresses, max_concurrency)
+    
+    def get_many_vault_details(self, vault_addresses: List[str], max_concurrency: int = 8) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch vault details for many vaults concurrently
+        
+        Args:
+            vault_addresses: Vault addresses
+            max_concurrency: Maximum number of requests in flight at once
+            
+        Returns:
+            Mapping of vault address to vault details
+        """
+        print(f"Fetching vault details for {len(vault_addresses)} vaults ({max_concurrency} in flight)...")
+        return self._run_async('get_many_vault_details', vault_addresses, max_concurrency)
 
 
 def format_vault_data(vault: Dict[str, Any]) -> str:
@@ -621,8 +1157,10 @@ def format_leaderboard_entry(entry: Dict[str, Any], rank: int) -> str:
         rank_display = f"{rank}."
         user_display = user
     
+    vault_line = f"\n   Vault: {Colors.cyan(entry['vault'][:10] + '...')}" if entry.get('vault') else ""
+    
     return f"""
-{rank_display} User: {user_display}
+{rank_display} User: {user_display}{vault_line}
    Current Equity: {equity_str}
    Current PnL: {current_pnl_str}
    All-Time PnL: {all_time_pnl_str}
@@ -672,11 +1210,50 @@ def format_portfolio_data(portfolio: List, period_name: str = None) -> str:
     return '\n'.join(result) if result else "No data for specified period"
 
 
-def main():
+def api_from_args(argv: List[str] = None) -> HyperliquidAPI:
+    """
+    Build the API client from the --base-url / --record / --replay CLI flags
+    
+    --replay answers every request from a recording without touching the
+    network; --record wraps the real transport and appends each response to
+    the given JSONL file. A non-default --base-url (e.g. the local mock
+    server) gets its own rate-limit bucket instead of the mainnet one.
+    """
+    argv = sys.argv if argv is None else argv
+    
+    def flag(name):
+        if name in argv:
+            try:
+                return argv[argv.index(name) + 1]
+            except IndexError:
+                print(f"⚠️  No value provided for {name}, ignoring")
+        return None
+    
+    base_url = flag("--base-url") or "https://api.hyperliquid.xyz/info"
+    record_path = flag("--record")
+    replay_path = flag("--replay")
+    
+    transport = None
+    rate_limiter = None
+    if replay_path:
+        transport = ReplayTransport(replay_path)
+        rate_limiter = RateLimiter(capacity=1e12, refill_per_second=1e12, state_path=None)
+        print(f"📼 Replaying {sum(len(r) for r in transport.recordings.values())} recorded responses from {replay_path}")
+    elif record_path:
+        transport = RecordingTransport(record_path)
+        print(f"⏺  Recording responses to {record_path}")
+    
+    if rate_limiter is None and base_url != "https://api.hyperliquid.xyz/info":
+        rate_limiter = RateLimiter(name=base_url)
+    
+    return HyperliquidAPI(base_url, transport=transport, rate_limiter=rate_limiter)
+
+
+def main(api: HyperliquidAPI = None):
     """Main function to demonstrate API usage"""
     
     # Initialize the API client
-    api = HyperliquidAPI()
+    api = api or HyperliquidAPI()
     
     print("=" * 70)
     print("Hyperliquid API - Vaults & Leaderboard Data")
@@ -699,10 +1276,10 @@ def main():
     
     # Example 2: Create Leaderboard from Vault Followers
     print("\n--- Example 2: Vault Follower Leaderboard (Top 10 by All-Time PnL) ---")
-    leaderboard = api.get_vault_leaderboard(hlp_vault)
+    leaderboard = api.get_vault_leaderboard(hlp_vault, top_n=10)
     
     if leaderboard:
-        print(f"\nShowing top 10 performers out of {len(leaderboard)} total followers:\n")
+        print(f"\nShowing top 10 performers out of {leaderboard.total} total followers:\n")
         for i, entry in enumerate(leaderboard[:10], 1):
             print(format_leaderboard_entry(entry, i))
     else:
@@ -745,7 +1322,7 @@ def display_live_leaderboard(api: HyperliquidAPI, vault_address: str, top_n: int
         min_equity: Minimum equity filter
         min_roi: Minimum ROI filter
     """
-    leaderboard = api.get_vault_leaderboard(vault_address, sort_by, min_equity, min_roi)
+    leaderboard = api.get_vault_leaderboard(vault_address, sort_by, min_equity, min_roi, top_n=top_n)
     
     if not leaderboard:
         print("❌ Unable to fetch leaderboard data")
@@ -757,7 +1334,7 @@ def display_live_leaderboard(api: HyperliquidAPI, vault_address: str, top_n: int
     print(Colors.bold(f"🏆  HYPERLIQUID VAULT LEADERBOARD - LIVE MONITOR"))
     print(f"📊  HLP Vault: {Colors.cyan(vault_address)}")
     print(f"⏰  Last Updated: {Colors.yellow(now)}")
-    print(f"👥  Total Followers: {Colors.bold(str(len(leaderboard)))} | Showing Top {Colors.bold(str(top_n))}")
+    print(f"👥  Total Followers: {Colors.bold(str(leaderboard.total))} | Showing Top {Colors.bold(str(top_n))}")
     print("=" * 80)
     print()
     
@@ -773,7 +1350,7 @@ def display_live_leaderboard(api: HyperliquidAPI, vault_address: str, top_n: int
 
 
 def display_live_leaderboard_simple(leaderboard: List[Dict[str, Any]], vault_address: str, 
-                                   top_n: int = 10, sort_by: str = 'pnl'):
+                                   top_n: int = 10, sort_by: str = 'pnl', status: List[str] = None):
     """
     Simplified leaderboard display for interactive mode
     
@@ -782,6 +1359,7 @@ def display_live_leaderboard_simple(leaderboard: List[Dict[str, Any]], vault_add
         vault_address: Vault address being monitored
         top_n: Number of top performers to display
         sort_by: Current sort metric
+        status: Optional connection/circuit status lines for the header
     """
     if not leaderboard:
         return False
@@ -792,7 +1370,10 @@ def display_live_leaderboard_simple(leaderboard: List[Dict[str, Any]], vault_add
     print(Colors.bold(f"🏆  HYPERLIQUID VAULT LEADERBOARD - LIVE MONITOR"))
     print(f"📊  Vault: {Colors.cyan(vault_address)}")
     print(f"⏰  Updated: {Colors.yellow(now)} | Sorting: {Colors.bold(sort_by.upper())}")
-    print(f"👥  Total: {Colors.bold(str(len(leaderboard)))} | Showing: {Colors.bold(str(min(top_n, len(leaderboard))))}")
+    total = getattr(leaderboard, 'total', len(leaderboard))
+    print(f"👥  Total: {Colors.bold(str(total))} | Showing: {Colors.bold(str(min(top_n, len(leaderboard))))}")
+    for line in status or ():
+        print(f"📡  {line}")
     print("=" * 80)
     print()
     
@@ -807,13 +1388,93 @@ def display_live_leaderboard_simple(leaderboard: List[Dict[str, Any]], vault_add
     return True
 
 
+def display_multi_vault_leaderboard(api: HyperliquidAPI, vault_addresses: List[str], top_k: int = 20,
+                                    sort_by: str = 'pnl', min_equity: float = None, min_roi: float = None):
+    """
+    Display a global leaderboard ranked across several vaults
+    
+    Args:
+        api: HyperliquidAPI instance
+        vault_addresses: Vaults to rank
+        top_k: Number of global top performers to display
+        sort_by: Sort metric ('pnl', 'roi', 'equity', 'days')
+        min_equity: Minimum equity filter
+        min_roi: Minimum ROI filter
+    """
+    result = api.get_multi_vault_leaderboard(vault_addresses, sort_by, min_equity, min_roi, top_k=top_k)
+    global_leaderboard = result['global']
+    
+    if not global_leaderboard:
+        print("❌ Unable to fetch leaderboard data")
+        return False
+    
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print("\n" + "=" * 80)
+    print(Colors.bold(f"🌐  HYPERLIQUID GLOBAL LEADERBOARD - {len(vault_addresses)} VAULTS"))
+    for vault_address, leaderboard in result['vaults'].items():
+        print(f"📊  {Colors.cyan(vault_address)}: {leaderboard.total} followers")
+    print(f"⏰  Updated: {Colors.yellow(now)} | Sorting: {Colors.bold(sort_by.upper())}")
+    print("=" * 80)
+    print()
+    
+    for i, entry in enumerate(global_leaderboard, 1):
+        print(format_leaderboard_entry(entry, i))
+    
+    print("=" * 80)
+    return True
+
+
+def export_vault_portfolios(api: HyperliquidAPI, vault_address: str, checkpoint_path: str,
+                            max_concurrency: int = 8):
+    """
+    Fetch the portfolio of every follower of a vault into a resumable checkpoint
+    
+    Args:
+        api: HyperliquidAPI instance
+        vault_address: Vault whose followers to export
+        checkpoint_path: JSONL checkpoint file (re-run to resume)
+        max_concurrency: Maximum requests in flight
+    """
+    vault_data = api.get_vault_details(vault_address)
+    users = [f.get('user') for f in vault_data.get('followers', []) if f.get('user')]
+    if not users:
+        print("❌ No followers found for this vault")
+        return False
+    
+    print(f"\n📦 Exporting portfolios for {len(users)} followers -> {checkpoint_path}")
+    started = time.time()
+    fetched = failed = 0
+    
+    for user_address, portfolio, error in api.iter_user_portfolios(users, max_concurrency, checkpoint_path):
+        if error:
+            failed += 1
+            print(f"   {Colors.red('[FAILED]')} {user_address[:12]}...: {error}")
+        else:
+            fetched += 1
+        done = fetched + failed
+        if done % 100 == 0:
+            print(f"   [PROGRESS] {done} fetched this run ({failed} failed) - {done / (time.time() - started):.1f} users/s")
+    
+    print(f"\n✅ Export complete: {fetched} fetched, {failed} failed, "
+          f"{len(users) - fetched - failed} already in checkpoint")
+    if failed:
+        print("   Re-run the same command to retry failed users")
+    return failed == 0
+
+
 def live_monitor(vault_address: str, refresh_interval: int = 5, top_n: int = 10,
                 sort_by: str = 'pnl', min_equity: float = None, min_roi: float = None,
                 alert_pnl_above: float = None, alert_pnl_below: float = None,
-                alert_tvl_above: float = None, interactive: bool = True):
+                alert_tvl_above: float = None, interactive: bool = True,
+                api: HyperliquidAPI = None, stream_url: str = None,
+                history: SnapshotStore = None, snapshot_dir: str = None, debug: bool = False,
+                adaptive: AdaptiveInterval = None):
     """
     Live monitoring mode - continuously refresh leaderboard data with interactive controls
     
+    Each refresh fetches the vault once into a VaultSnapshot; ranking,
+    alerts, history and the snapshot file all read that one object.
+    
     Args:
         vault_address: Vault address to monitor
         refresh_interval: Seconds between refreshes (default: 5)
@@ -825,8 +1486,18 @@ def live_monitor(vault_address: str, refresh_interval: int = 5, top_n: int = 10,
         alert_pnl_below: Alert when PnL goes below this value
         alert_tvl_above: Alert when total TVL goes above this value
         interactive: Enable interactive controls (default: True)
+        api: Optional client (e.g. pointed at a mock server or replaying a recording)
+        stream_url: Websocket feed of follower updates; when set the monitor
+            redraws on every pushed change instead of polling on a timer
+        history: Optional snapshot store; every new upstream snapshot is
+            appended to it
+        snapshot_dir: Directory to keep the latest snapshot in as a
+            memory-mappable file for the dashboard (see hyperliquid_latest)
+        debug: Print how long each stage of a refresh took below the table
+        adaptive: Tune the polling interval to how often the vault changes
+            (see hyperliquid_adaptive); ignored when streaming
     """
-    api = HyperliquidAPI()
+    api = api or HyperliquidAPI()
     dashboard = InteractiveDashboard()
     
     # Initialize dashboard settings
@@ -861,51 +1532,164 @@ def live_monitor(vault_address: str, refresh_interval: int = 5, top_n: int = 10,
         print(f"  🔔 Alert PnL Below: ${alert_pnl_below:,.2f}")
     if alert_tvl_above:
         print(f"  🔔 Alert TVL Above: ${alert_tvl_above:,.2f}")
+    if stream_url:
+        print(f"  📡 Streaming updates from: {stream_url}")
+    if history:
+        print(f"  💾 Recording history to: {history.path}")
+    if snapshot_dir:
+        print(f"  📂 Latest snapshot file: {snapshot_path(vault_address, snapshot_dir)}")
+    if adaptive and stream_url:
+        print(f"  ⚠️  Adaptive interval ignored: streamed updates are pushed, not polled")
+        adaptive = None
+    if adaptive:
+        if api.cache:
+            adaptive.raise_floor(api.cache.ttls.get('vaultDetails', 0))
+        print(f"  🎚️  Adaptive interval: {adaptive.min_interval:g}-{adaptive.max_interval:g}s, "
+              f"target ≤{adaptive.target_staleness:g}s stale")
+        dashboard.refresh_interval = adaptive.interval
     print()
+    
+    stream = VaultFollowerStream(api, vault_address, stream_url).start() if stream_url else None
+    if stream:
+        # Redraw as soon as a setting changes instead of at the next push
+        dashboard.on_change = stream.wake
     time.sleep(2)
     
+    ranking = IncrementalRanking()
+    last_version = None
+    last_view = None
+    last_poll = None
+    last_followers = None
+    
     try:
         while dashboard.running:
-            # Use current dashboard settings
-            leaderboard = api.get_vault_leaderboard(
-                vault_address, 
-                dashboard.sort_by, 
-                dashboard.min_equity, 
-                dashboard.min_roi
-            )
+            if stream:
+                # Wake on the next pushed change instead of sleeping a fixed interval
+                version = stream.wait(last_version or 0, timeout=dashboard.refresh_interval)
+                if not version:
+                    print(f"⏳ Waiting for first snapshot | {stream.describe()}")
+                    continue
+                timer = StageTimer()
+            else:
+                timer = StageTimer()
+                with timer.stage('fetch'):
+                    snapshot = api.get_vault_snapshot(vault_address)
+                
+                if snapshot is None:
+                    print(f"\n⚠️  Error fetching data ({api.breaker.describe()}). "
+                          f"Retrying in {dashboard.refresh_interval} seconds...")
+                    dashboard.wait_for_change(dashboard.refresh_interval)
+                    continue
+                
+                version = snapshot.version
+                
+                if adaptive:
+                    with timer.stage('adapt'):
+                        now = time.monotonic()
+                        change = (0.0, 0.0, 0)
+                        if version != last_version:
+                            change = measure_change(last_followers, snapshot.followers,
+                                                    dashboard.top_n, dashboard.sort_by)
+                            last_followers = snapshot.followers
+                        # An interval typed with 'i' replaces the adapted one
+                        reason = adaptive.reset(dashboard.refresh_interval)
+                        if reason:
+                            print(f"🎚️  Refresh interval {reason}")
+                        if last_poll is not None:
+                            reason = adaptive.observe(now - last_poll, *change)
+                            if reason:
+                                print(f"🎚️  Refresh interval: {reason}")
+                        last_poll = now
+                        dashboard.refresh_interval = adaptive.interval
             
-            if not leaderboard:
-                print("\n⚠️  Error fetching data. Retrying in 10 seconds...")
-                time.sleep(10)
+            # Skip alerts and rendering entirely when the upstream body is
+            # byte-identical and the display settings have not changed
+            view = (version, dashboard.sort_by, dashboard.top_n, dashboard.min_equity, dashboard.min_roi)
+            if view == last_view:
+                heartbeat = f"⏸  No changes upstream ({datetime.now().strftime('%H:%M:%S')})"
+                print(f"{heartbeat} | {stream.describe()}" if stream else heartbeat)
+                if debug:
+                    print(timer.describe())
+                if not stream:
+                    dashboard.wait_for_change(dashboard.refresh_interval)
                 continue
+            last_view = view
             
-            # Get vault data for alerts
-            vault_data = api.get_vault_details(vault_address)
+            if version != last_version:
+                last_version = version
+                
+                if stream:
+                    snapshot = VaultSnapshot(vault_address, stream.vault_data(), version)
+                
+                # Re-rank only the followers that changed since the last refresh
+                with timer.stage('rank'):
+                    ranking.apply(snapshot.vault_data['followers'])
+                
+                alerts = dashboard.alerts_enabled()
+                if alerts or history or snapshot_dir:
+                    with timer.stage('parse'):
+                        followers = snapshot.followers
+                    
+                    # Check alerts against every filtered follower, not just the displayed top N
+                    if alerts:
+                        with timer.stage('alerts'):
+                            dashboard.check_alerts(snapshot)
+                    if history or snapshot_dir:
+                        with timer.stage('persist'):
+                            if history:
+                                history.append(vault_address, snapshot.vault_data, followers, snapshot.fetched_at)
+                            if snapshot_dir:
+                                write_snapshot(snapshot_path(vault_address, snapshot_dir), snapshot.vault_data,
+                                               followers, snapshot.fetched_at)
+            
+            # Settings changes only re-query the maintained rankings
+            with timer.stage('rank'):
+                leaderboard = ranking.top(
+                    dashboard.top_n,
+                    dashboard.sort_by,
+                    dashboard.min_equity,
+                    dashboard.min_roi
+                )
             
-            # Check alerts
-            dashboard.check_alerts(leaderboard, vault_data)
+            status = [stream.describe()] if stream else []
+            status.append(f"Δ {ranking.last_changed} changed, {ranking.last_removed} removed since last refresh")
+            status.append(api.breaker.describe())
+            if history:
+                status.append(history.describe())
+            if adaptive:
+                status.append(adaptive.describe())
             
             # Display leaderboard
-            success = display_live_leaderboard_simple(
-                leaderboard, 
-                vault_address, 
-                dashboard.top_n, 
-                dashboard.sort_by
-            )
+            with timer.stage('render'):
+                success = display_live_leaderboard_simple(
+                    leaderboard, 
+                    vault_address, 
+                    dashboard.top_n, 
+                    dashboard.sort_by,
+                    status
+                )
+            if debug:
+                print(timer.describe())
             
             if not success:
                 print("\n⚠️  Error displaying data. Retrying...")
-                time.sleep(5)
+                dashboard.wait_for_change(5)
                 continue
             
-            # Wait for next refresh using dashboard interval
-            time.sleep(dashboard.refresh_interval)
+            # Wait for next refresh using dashboard interval (a settings change ends the wait early)
+            if not stream:
+                dashboard.wait_for_change(dashboard.refresh_interval)
             
     except KeyboardInterrupt:
         dashboard.running = False
         print("\n✅ Live monitoring stopped.")
         print("Thanks for using Hyperliquid Leaderboard Monitor!\n")
         sys.exit(0)
+    finally:
+        if stream:
+            stream.stop()
+        if history:
+            history.flush()
 
 
 if __name__ == "__main__":
@@ -923,12 +1707,29 @@ Options:
     --top <number>          Number of top performers to display (default: 10)
     --sort-by <metric>      Sort by: pnl, roi, equity, days (default: pnl)
     --vault <address>       Monitor specific vault address
+    --vaults <a,b,...>      Rank several vaults into one global leaderboard
+    --global-top <number>   Number of global top performers (default: 20)
+    --export-portfolios <vault>   Fetch the portfolio of every follower of a vault
+    --checkpoint <file>     JSONL checkpoint for --export-portfolios (resumable)
+    --concurrency <number>  Requests in flight for --export-portfolios (default: 8)
     --min-equity <amount>   Filter followers with minimum equity
     --min-roi <percent>     Filter followers with minimum ROI percentage
     --alert-pnl-above <amount>    Alert when PnL goes above this value
     --alert-pnl-below <amount>    Alert when PnL goes below this value
     --alert-tvl-above <amount>    Alert when total TVL goes above this value
     --no-interactive        Disable interactive controls
+    --base-url <url>        Info endpoint (e.g. a local hyperliquid_mock_server)
+    --record <file>         Append every request/response to a JSONL recording
+    --replay <file>         Answer requests from a recording, fully offline
+    --stream <ws-url>       Redraw on pushed follower updates instead of polling
+    --history <db>          Append every new snapshot to a history database
+    --backpressure <policy> When the history writer falls behind: block, drop or spill (default: block)
+    --snapshot-dir <dir>    Keep the latest snapshot as a memory-mapped file for the dashboard
+    --debug                 Show per-stage refresh timings below the leaderboard
+    --adaptive              Tune the refresh interval to how often the vault changes
+    --min-interval <seconds>      Shortest adaptive interval (default: 1)
+    --max-interval <seconds>      Longest adaptive interval (default: 60)
+    --target-staleness <seconds>  Average seconds the view may lag upstream (default: interval / 4)
     --help, -h              Show this help message
 
 Interactive Controls (when live monitoring):
@@ -956,6 +1757,30 @@ Examples:
 
     # Combined: Monitor whales with alerts
     python hyperliquid_api_example.py --live --min-equity 1000000 --alert-pnl-above 500000
+
+    # Resumable export of every HLP follower's portfolio
+    python hyperliquid_api_example.py --export-portfolios 0xdfc24b077bc1425ad1dea75bcb6f8158e10df303 --checkpoint hlp_portfolios.jsonl
+
+    # Global top 25 by ROI across two vaults
+    python hyperliquid_api_example.py --vaults 0xabc...,0xdef... --global-top 25 --sort-by roi
+
+    # Record a live session, then replay it offline
+    python hyperliquid_api_example.py --live --record session.jsonl
+    python hyperliquid_api_example.py --live --replay session.jsonl
+
+    # Keep a follower history for charts and backtests
+    python hyperliquid_api_example.py --live --history hyperliquid_data.db
+
+    # Collector for the dashboard: latest snapshot as a memory-mapped file
+    python hyperliquid_api_example.py --live --snapshot-dir snapshots
+
+    # Run against the local mock server
+    python hyperliquid_mock_server.py --followers 2000 --latency-ms 80 &
+    python hyperliquid_api_example.py --live --base-url http://127.0.0.1:8787/info
+
+    # Push-driven monitor against the mock server's websocket feed
+    python hyperliquid_mock_server.py --stream-port 8788 &
+    python hyperliquid_api_example.py --live --base-url http://127.0.0.1:8787/info --stream ws://127.0.0.1:8788/ws
         """)
         sys.exit(0)
     
@@ -1047,8 +1872,134 @@ Examples:
         
         interactive = "--no-interactive" not in sys.argv
         
+        stream_url = None
+        if "--stream" in sys.argv:
+            try:
+                idx = sys.argv.index("--stream")
+                stream_url = sys.argv[idx + 1]
+            except IndexError:
+                print("⚠️  No stream URL provided, polling instead")
+        
+        history = None
+        if "--history" in sys.argv:
+            backpressure = 'block'
+            if "--backpressure" in sys.argv:
+                try:
+                    idx = sys.argv.index("--backpressure")
+                    backpressure = sys.argv[idx + 1].lower()
+                    if backpressure not in BACKPRESSURE_POLICIES:
+                        print(f"⚠️  Invalid backpressure policy '{backpressure}', using default: block")
+                        backpressure = 'block'
+                except IndexError:
+                    print("⚠️  No backpressure policy provided, using default: block")
+            try:
+                idx = sys.argv.index("--history")
+                history = SnapshotStore(sys.argv[idx + 1], backpressure=backpressure)
+            except IndexError:
+                print("⚠️  No history database provided, not recording")
+        
+        snapshot_dir = None
+        if "--snapshot-dir" in sys.argv:
+            try:
+                idx = sys.argv.index("--snapshot-dir")
+                snapshot_dir = sys.argv[idx + 1]
+            except IndexError:
+                print("⚠️  No snapshot directory provided, not writing snapshot files")
+        
+        debug = "--debug" in sys.argv
+        
+        adaptive = None
+        if "--adaptive" in sys.argv:
+            bounds = {'--min-interval': 1.0, '--max-interval': 60.0, '--target-staleness': None}
+            for flag in bounds:
+                if flag in sys.argv:
+                    try:
+                        idx = sys.argv.index(flag)
+                        bounds[flag] = float(sys.argv[idx + 1])
+                    except (IndexError, ValueError):
+                        print(f"⚠️  Invalid {flag[2:]} value, using default")
+            try:
+                adaptive = AdaptiveInterval(refresh_interval, bounds['--min-interval'],
+                                            bounds['--max-interval'], bounds['--target-staleness'])
+            except ValueError as e:
+                print(f"⚠️  {e}, using a fixed interval")
+        
         live_monitor(hlp_vault, refresh_interval, top_n, sort_by, min_equity, min_roi,
-                    alert_pnl_above, alert_pnl_below, alert_tvl_above, interactive)
+                    alert_pnl_above, alert_pnl_below, alert_tvl_above, interactive,
+                    api_from_args(), stream_url, history, snapshot_dir, debug, adaptive)
+    elif "--export-portfolios" in sys.argv:
+        try:
+            idx = sys.argv.index("--export-portfolios")
+            export_vault = sys.argv[idx + 1]
+        except IndexError:
+            export_vault = "0xdfc24b077bc1425ad1dea75bcb6f8158e10df303"
+            print("⚠️  No vault address provided, using default HLP vault")
+        
+        checkpoint_path = f"portfolios_{export_vault}.jsonl"
+        if "--checkpoint" in sys.argv:
+            try:
+                idx = sys.argv.index("--checkpoint")
+                checkpoint_path = sys.argv[idx + 1]
+            except IndexError:
+                print(f"⚠️  No checkpoint path provided, using default: {checkpoint_path}")
+        
+        concurrency = 8
+        if "--concurrency" in sys.argv:
+            try:
+                idx = sys.argv.index("--concurrency")
+                concurrency = int(sys.argv[idx + 1])
+            except (IndexError, ValueError):
+                print("⚠️  Invalid concurrency value, using default: 8")
+        
+        export_vault_portfolios(api_from_args(), export_vault, checkpoint_path, concurrency)
+    elif "--vaults" in sys.argv:
+        try:
+            idx = sys.argv.index("--vaults")
+            vault_addresses = [v.strip() for v in sys.argv[idx + 1].split(',') if v.strip()]
+        except IndexError:
+            vault_addresses = []
+        
+        if not vault_addresses:
+            print("❌ No vault addresses provided for --vaults")
+            sys.exit(1)
+        
+        global_top = 20
+        if "--global-top" in sys.argv:
+            try:
+                idx = sys.argv.index("--global-top")
+                global_top = int(sys.argv[idx + 1])
+            except (IndexError, ValueError):
+                print("⚠️  Invalid global-top value, using default: 20")
+        
+        sort_by = 'pnl'
+        if "--sort-by" in sys.argv:
+            try:
+                idx = sys.argv.index("--sort-by")
+                sort_by = sys.argv[idx + 1].lower()
+                if sort_by not in ['pnl', 'roi', 'equity', 'days']:
+                    print(f"⚠️  Invalid sort option '{sort_by}', using default: pnl")
+                    sort_by = 'pnl'
+            except IndexError:
+                print("⚠️  No sort option provided, using default: pnl")
+        
+        min_equity = None
+        if "--min-equity" in sys.argv:
+            try:
+                idx = sys.argv.index("--min-equity")
+                min_equity = float(sys.argv[idx + 1])
+            except (IndexError, ValueError):
+                print("⚠️  Invalid min-equity value, filter disabled")
+        
+        min_roi = None
+        if "--min-roi" in sys.argv:
+            try:
+                idx = sys.argv.index("--min-roi")
+                min_roi = float(sys.argv[idx + 1])
+            except (IndexError, ValueError):
+                print("⚠️  Invalid min-roi value, filter disabled")
+        
+        display_multi_vault_leaderboard(api_from_args(), vault_addresses, global_top,
+                                        sort_by, min_equity, min_roi)
     else:
         # Run original one-time example
-        main()
+        main(api_from_args())
@@ -0,0 +1,370 @@
+"""
+Hyperliquid Async API - asyncio client for concurrent fan-out
+
+AsyncHyperliquidAPI mirrors the read methods of HyperliquidAPI on top of an
+aiohttp connection pool, so N vaults or N user portfolios can be fetched with
+bounded concurrency instead of N blocking round-trips in series.
+
+Example:
+    async with AsyncHyperliquidAPI() as api:
+        portfolios = await api.get_user_portfolios(addresses, max_concurrency=16)
+"""
+
+import asyncio
+import json
+from typing import Dict, List, Any, Iterable, Callable, Awaitable, AsyncIterator, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from hyperliquid_leaderboard import rank_followers
+from hyperliquid_json import get_decoder
+from hyperliquid_cache import ResponseCache, ResponseDigests, SingleFlight, canonical_key, FRESH, STALE
+from hyperliquid_ratelimit import RateLimiter, endpoint_weight, backoff_delay, parse_retry_after
+from hyperliquid_transport import HyperliquidAPIError
+from hyperliquid_table import FollowerTable
+from hyperliquid_snapshot import VaultSnapshot
+
+
+async def gather_bounded(func: Callable[[Any], Awaitable[Any]], items: Iterable[Any],
+                         max_concurrency: int = 16) -> List[Any]:
+    """
+    Run ``func(item)`` for every item with at most ``max_concurrency`` in flight
+
+    Args:
+        func: Coroutine function taking one item
+        items: Items to fan out over
+        max_concurrency: Maximum number of coroutines awaiting at once
+
+    Returns:
+        Results in the same order as ``items``
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(item):
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+async def as_completed_bounded(func: Callable[[Any], Awaitable[Any]], items: Iterable[Any],
+                               max_concurrency: int = 16) -> AsyncIterator[Tuple[Any, Any]]:
+    """
+    Like gather_bounded, but yield ``(item, result)`` pairs as they finish
+
+    Only ``max_concurrency`` tasks exist at any time, so very large inputs do not
+    create one pending task per item up front.
+    """
+    pending = set()
+    iterator = iter(items)
+
+    async def run(item):
+        return item, await func(item)
+
+    def refill():
+        while len(pending) < max_concurrency:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            pending.add(asyncio.ensure_future(run(item)))
+
+    refill()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                yield task.result()
+            refill()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class AsyncHyperliquidAPI:
+    """Asyncio client for interacting with the Hyperliquid API"""
+
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, base_url: str = "https://api.hyperliquid.xyz/info",
+                 max_connections: int = 32, max_connections_per_host: int = 16,
+                 connect_timeout: float = 3.05, read_timeout: float = 10.0,
+                 rate_limiter: RateLimiter = None, max_retries: int = 3,
+                 singleflight: SingleFlight = None, cache: ResponseCache = None,
+                 digests: ResponseDigests = None, decoder: str = 'auto'):
+        """
+        Args:
+            base_url: Hyperliquid info endpoint
+            max_connections: Total connection pool size
+            max_connections_per_host: Maximum open connections to a single host
+            connect_timeout: Seconds to wait for the TCP/TLS connection
+            read_timeout: Seconds to wait between response reads
+            rate_limiter: Optional token bucket; by default the host-wide
+                bucket shared with HyperliquidAPI
+            max_retries: Retries after a 429/5xx or connection error
+            singleflight: Optional coalescer shared with other clients
+            cache: Optional response cache to share; pass False to disable
+            digests: Optional response digest store to share
+            decoder: JSON decoder - 'auto' (orjson if installed), 'orjson' or 'json'
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncHyperliquidAPI requires aiohttp: pip install aiohttp")
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.singleflight = singleflight or SingleFlight()
+        self.cache = ResponseCache() if cache is None else (cache or None)
+        self.digests = digests or ResponseDigests()
+        self.decode = get_decoder(decoder)
+        self._leaderboard_memo = {}
+        self._refresh_tasks = set()
+        self._session = None
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Create the pooled session lazily inside the running event loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout,
+                                              sock_read=self.read_timeout),
+                headers={'Content-Type': 'application/json', 'Accept-Encoding': 'gzip, deflate'},
+                json_serialize=lambda obj: json.dumps(obj, separators=(',', ':'))
+            )
+        return self._session
+
+    async def close(self):
+        """Close the pooled session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Client-side counters for tuning under load"""
+        return {
+            'rate_limiter': self.rate_limiter.metrics(),
+            'singleflight': self.singleflight.metrics(),
+            'cache': self.cache.metrics() if self.cache else None,
+            'digests': self.digests.metrics()
+        }
+
+    def response_version(self, payload: Dict[str, Any]) -> int:
+        """Version of the last distinct response body for a payload (see HyperliquidAPI)"""
+        return self.digests.version(canonical_key(payload))
+
+    def vault_version(self, vault_address: str) -> int:
+        """response_version of the plain vaultDetails request for a vault"""
+        return self.response_version({"type": "vaultDetails", "vaultAddress": vault_address})
+
+    async def _request_versioned(self, payload: Dict[str, Any]) -> Tuple[Any, int]:
+        """
+        Serve a request from the response cache, or fetch it once for all
+        concurrent identical callers
+
+        Returns:
+            (JSON response, its response_version), read together (see
+            HyperliquidAPI._request_versioned)
+
+        Raises:
+            HyperliquidAPIError: The request still failed after max_retries
+        """
+        key = canonical_key(payload)
+
+        # Cache entries are (response, version) pairs, as returned by _send
+        if self.cache:
+            state, value = self.cache.lookup(key)
+            if state == FRESH:
+                return value
+            if state == STALE:
+                if self.cache.begin_refresh(key):
+                    task = asyncio.get_running_loop().create_task(self._refresh(payload, key))
+                    self._refresh_tasks.add(task)
+                    task.add_done_callback(self._refresh_tasks.discard)
+                return value
+
+        return await self.singleflight.do_async(key, lambda: self._fetch(payload, key))
+
+    async def _fetch(self, payload: Dict[str, Any], key: str) -> Tuple[Any, int]:
+        """Send the request and store the result with its version in the cache"""
+        result = await self._send(payload, key)
+        if self.cache:
+            self.cache.store(key, payload.get('type'), result)
+        return result
+
+    async def _refresh(self, payload: Dict[str, Any], key: str):
+        """Background stale-while-revalidate refresh"""
+        try:
+            await self.singleflight.do_async(key, lambda: self._fetch(payload, key))
+        except HyperliquidAPIError as e:
+            print(f"Error refreshing cached request: {e}")
+        finally:
+            self.cache.end_refresh(key)
+
+    async def _send(self, payload: Dict[str, Any], key: str) -> Tuple[Any, int]:
+        """
+        Send a rate-limited request, retrying 429/5xx with jittered backoff
+
+        Returns:
+            (JSON response, its response_version)
+
+        Raises:
+            HyperliquidAPIError: The request still failed after max_retries
+        """
+        session = await self._get_session()
+        weight = endpoint_weight(payload.get('type'))
+        error = None
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire_async(weight)
+            try:
+                async with session.post(self.base_url, json=payload) as response:
+                    if response.status in self.RETRY_STATUS:
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        delay = backoff_delay(attempt, retry_after=retry_after)
+                        error = HyperliquidAPIError(
+                            f"HTTP {response.status} for {payload.get('type')} (backing off {delay:.1f}s)",
+                            response.status
+                        )
+                        await self.rate_limiter.penalize_async(delay)
+                        continue
+                    if response.status >= 400:
+                        raise HyperliquidAPIError(
+                            f"HTTP {response.status} for {payload.get('type')}", response.status
+                        )
+                    raw = await response.read()
+                    return self.digests.resolve(key, raw, self.decode)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = HyperliquidAPIError(str(e) or type(e).__name__)
+                if attempt < self.max_retries:
+                    await asyncio.sleep(backoff_delay(attempt))
+            except ValueError as e:
+                raise HyperliquidAPIError(str(e)) from e
+
+        raise error
+
+    async def _post_request(self, payload: Dict[str, Any]) -> Any:
+        """
+        Make a POST request to the Hyperliquid API
+
+        Args:
+            payload: The request payload
+
+        Returns:
+            The JSON response from the API, or None on failure
+        """
+        return (await self._post_request_versioned(payload))[0]
+
+    async def _post_request_versioned(self, payload: Dict[str, Any]) -> Tuple[Any, int]:
+        """_post_request plus the response_version of the response ((None, 0) on failure)"""
+        try:
+            return await self._request_versioned(payload)
+        except HyperliquidAPIError as e:
+            print(f"Error making request: {e}")
+            return None, 0
+
+    async def get_vault_details(self, vault_address: str, user: str = None, limit: int = None) -> Dict[str, Any]:
+        """Async counterpart of HyperliquidAPI.get_vault_details"""
+        return (await self._get_vault_details(vault_address, user, limit))[0]
+
+    async def _get_vault_details(self, vault_address: str, user: str = None,
+                                 limit: int = None) -> Tuple[Dict[str, Any], int]:
+        """get_vault_details plus the response_version of that response"""
+        payload = {
+            "type": "vaultDetails",
+            "vaultAddress": vault_address
+        }
+        if user:
+            payload["user"] = user
+        if limit:
+            payload["limit"] = limit
+
+        data, version = await self._post_request_versioned(payload)
+        return (data, version) if data else ({}, 0)
+
+    async def get_vault_snapshot(self, vault_address: str) -> Optional[VaultSnapshot]:
+        """Async counterpart of HyperliquidAPI.get_vault_snapshot"""
+        vault_data, version = await self._get_vault_details(vault_address)
+        if not vault_data or 'followers' not in vault_data:
+            return None
+        return VaultSnapshot(vault_address, vault_data, version)
+
+    async def get_user_portfolio(self, user_address: str) -> List[List]:
+        """Async counterpart of HyperliquidAPI.get_user_portfolio"""
+        data = await self._post_request({"type": "portfolio", "user": user_address})
+        return data if data else []
+
+    async def get_user_vault_equities(self, user_address: str) -> List[Dict[str, Any]]:
+        """Async counterpart of HyperliquidAPI.get_user_vault_equities"""
+        data = await self._post_request({"type": "userVaultEquities", "user": user_address})
+        return data if data else []
+
+    async def get_meta(self) -> Dict[str, Any]:
+        """Async counterpart of HyperliquidAPI.get_meta"""
+        data = await self._post_request({"type": "meta"})
+        return data if data else {}
+
+    async def get_vault_leaderboard(self, vault_address: str, sort_by: str = 'pnl',
+                                    min_equity: float = None, min_roi: float = None,
+                                    top_n: int = None) -> FollowerTable:
+        """Async counterpart of HyperliquidAPI.get_vault_leaderboard (single request mode)"""
+        vault_data, version = await self._get_vault_details(vault_address)
+
+        if not vault_data or 'followers' not in vault_data:
+            print("No follower data available for this vault")
+            return FollowerTable.empty()
+
+        params = (sort_by, min_equity, min_roi, top_n)
+        memo = self._leaderboard_memo.get(vault_address)
+        if memo and memo[0] == version and memo[1] == params:
+            return memo[2]
+
+        ranked = rank_followers(vault_data['followers'], sort_by, min_equity, min_roi, top_n)
+        self._leaderboard_memo[vault_address] = (version, params, ranked)
+        return ranked
+
+    # ------------------------------------------------------------------
+    # Bounded-concurrency fan-out helpers
+    # ------------------------------------------------------------------
+
+    async def get_user_portfolios(self, user_addresses: Iterable[str],
+                                  max_concurrency: int = 16) -> Dict[str, List[List]]:
+        """
+        Fetch portfolios for many users with at most ``max_concurrency`` in flight
+
+        Returns:
+            Mapping of user address to portfolio data (empty list on failure)
+        """
+        addresses = list(user_addresses)
+        results = await gather_bounded(self.get_user_portfolio, addresses, max_concurrency)
+        return dict(zip(addresses, results))
+
+    async def get_users_vault_equities(self, user_addresses: Iterable[str],
+                                       max_concurrency: int = 16) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch vault equities for many users with bounded concurrency"""
+        addresses = list(user_addresses)
+        results = await gather_bounded(self.get_user_vault_equities, addresses, max_concurrency)
+        return dict(zip(addresses, results))
+
+    async def get_many_vault_details(self, vault_addresses: Iterable[str],
+                                     max_concurrency: int = 8) -> Dict[str, Dict[str, Any]]:
+        """Fetch details for many vaults with bounded concurrency"""
+        addresses = list(vault_addresses)
+        results = await gather_bounded(self.get_vault_details, addresses, max_concurrency)
+        return dict(zip(addresses, results))
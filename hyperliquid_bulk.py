@@ -0,0 +1,132 @@
+"""
+Hyperliquid Bulk Fetch - Bounded thread fan-out with crash-safe checkpoints
+
+Used by HyperliquidAPI.iter_user_portfolios to fetch thousands of user
+portfolios: at most N requests in flight, results streamed back as they
+finish, and every finished user appended to a JSONL checkpoint so an
+interrupted run resumes without re-fetching completed users.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional, Set, Tuple
+
+
+def iter_bounded(func: Callable[[Any], Any], items: Iterable[Any],
+                 max_concurrency: int = 8) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+    """
+    Run ``func(item)`` on a thread pool, yielding results as they finish
+
+    Only ``max_concurrency`` items are submitted at a time, so the input can be
+    a lazy iterable of any size. Exceptions are captured per item instead of
+    aborting the run.
+
+    Returns:
+        Iterator of (item, result, error) - ``error`` is None on success
+    """
+    iterator = iter(items)
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        pending = {}
+
+        def refill():
+            while len(pending) < max_concurrency:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                pending[pool.submit(func, item)] = item
+
+        refill()
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    error = future.exception()
+                    yield item, (None if error else future.result()), error
+                refill()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class BulkCheckpoint:
+    """Append-only JSONL record of finished items
+
+    Each line is ``{"key": ..., "ok": bool, "result": ..., "error": ...}``. Lines
+    are flushed and fsynced as they are written. A torn final line left by a
+    crash is cut off on load, so new records start on a line of their own.
+    Only successful keys count as completed, so failed users are retried when
+    the run resumes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed: Set[str] = set()
+        self.failed = 0
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            end = 0  # offset just past the last complete line
+            with open(path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    end += len(line)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get('ok'):
+                        self.completed.add(record['key'])
+            if os.path.getsize(path) > end:
+                os.truncate(path, end)
+
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def record(self, key: str, result: Any = None, error: Optional[Exception] = None):
+        """Append one finished item"""
+        line = json.dumps({
+            'key': key,
+            'ok': error is None,
+            'result': result,
+            'error': None if error is None else str(error),
+        }, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            if error is None:
+                self.completed.add(key)
+            else:
+                self.failed += 1
+
+    def results(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate (key, result) for every successful record in the file"""
+        with self._lock:
+            self._file.flush()
+        seen = set()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('ok') and record['key'] not in seen:
+                    seen.add(record['key'])
+                    yield record['key'], record['result']
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {'completed': len(self.completed), 'failed': self.failed}
@@ -0,0 +1,340 @@
+"""
+Hyperliquid Request Cache - Response caching and in-flight request coalescing
+
+ResponseCache sits under ``_post_request`` and keeps parsed responses keyed by
+the canonical payload, with a TTL per request type and LRU eviction.
+
+ResponseDigests hashes raw response bytes so an upstream body identical to the
+previous one for the same payload is not decoded again.
+
+Several Streamlit sessions (or monitor threads) often ask for the same
+``vaultDetails`` payload at the same moment. SingleFlight lets the first caller
+send the request while every concurrent caller with the same canonical payload
+waits for, and shares, that one parsed result.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Awaitable, Optional, Tuple
+
+
+# Seconds a response stays fresh, per info request type
+DEFAULT_TTLS = {
+    'meta': 300.0,
+    'vaultDetails': 2.0,
+    'portfolio': 30.0,
+    'userVaultEquities': 30.0,
+}
+DEFAULT_TTL = 5.0
+
+FRESH = 'fresh'
+STALE = 'stale'
+
+
+def canonical_key(payload: Dict[str, Any]) -> str:
+    """Canonical JSON form of a payload (key order and whitespace independent)"""
+    return json.dumps(payload, sort_keys=True, separators=(',', ':'))
+
+
+class _Call:
+    """A request in flight that other threads can wait on"""
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one upstream request
+
+    ``do()`` is for threads and ``do_async()`` is for asyncio tasks. Callers
+    that arrive while a call with the same key is running get the leader's
+    result (or exception) instead of issuing their own. Results are shared
+    objects and must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+
+        self.calls = 0
+        self.upstream = 0
+        self.coalesced = 0
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Run ``func`` unless an identical call is already in flight
+
+        Args:
+            key: Canonical request key (see canonical_key)
+            func: Zero-argument callable performing the request
+
+        Returns:
+            The shared result of the single upstream call
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.upstream += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def do_async(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Asyncio counterpart of do()
+
+        The request runs in its own task and every caller awaits it through
+        ``asyncio.shield``, so cancelling one waiter (even the first) does not
+        cancel the request for the others.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+
+        with self._lock:
+            self.calls += 1
+            task = self._tasks.get(task_key)
+            if task is not None:
+                self.coalesced += 1
+            else:
+                task = self._tasks[task_key] = loop.create_task(func())
+                self.upstream += 1
+
+                def forget(_, task_key=task_key):
+                    with self._lock:
+                        self._tasks.pop(task_key, None)
+
+                task.add_done_callback(forget)
+
+        return await asyncio.shield(task)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Coalescing counters"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'upstream': self.upstream,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls) + len(self._tasks),
+            }
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of parsed responses with per-endpoint TTLs
+
+    Entries are fresh for the TTL of their request type. With
+    ``stale_while_revalidate`` enabled an expired entry is still served for up
+    to ``stale_ttl`` more seconds while the client refreshes it in the
+    background; past that it is a miss. Expired entries stay in the LRU until
+    evicted so ``last_known()`` can still return them (used while a circuit
+    breaker is open). Cached values are shared objects and must be treated as
+    read-only.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = DEFAULT_TTL,
+                 max_entries: int = 512, stale_while_revalidate: bool = False,
+                 stale_ttl: float = 60.0):
+        """
+        Args:
+            ttls: Fresh lifetime per request type (merged over DEFAULT_TTLS)
+            default_ttl: Fresh lifetime for request types not in ``ttls``
+            max_entries: LRU bound on the number of cached responses
+            stale_while_revalidate: Serve expired entries while refreshing
+            stale_ttl: How long past expiry a stale entry may still be served
+        """
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_ttl = stale_ttl
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._refreshing = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+
+    def ttl_for(self, request_type: Optional[str]) -> float:
+        """Fresh lifetime in seconds for a request type"""
+        return self.ttls.get(request_type, self.default_ttl)
+
+    def lookup(self, key: str) -> Tuple[Optional[str], Any]:
+        """
+        Look up a cached response
+
+        Returns:
+            (FRESH, value), (STALE, value) or (None, None) on a miss
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if now < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return FRESH, value
+                if self.stale_while_revalidate and now < expires_at + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    return STALE, value
+            self.misses += 1
+            return None, None
+
+    def store(self, key: str, request_type: Optional[str], value: Any):
+        """Cache a response, evicting least recently used entries past max_entries"""
+        ttl = self.ttl_for(request_type)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def last_known(self, key: str) -> Any:
+        """Most recent value stored for ``key`` regardless of age (None if evicted)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry else None
+
+    def begin_refresh(self, key: str) -> bool:
+        """Claim the background refresh of ``key``; False if one is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.refreshes += 1
+            return True
+
+    def end_refresh(self, key: str):
+        """Release a refresh claimed with begin_refresh"""
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one entry, or everything when ``key`` is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit/miss/evict counters"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'refreshes': self.refreshes,
+                'hit_rate': round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+            }
+
+
+class ResponseDigests:
+    """Skip decoding of response bodies identical to the previous one
+
+    Keeps, per canonical payload, a hash of the last raw body, its parsed
+    value and a version number. Versions come from one counter shared by all
+    keys, so a new body (even after an LRU eviction) never reuses a version.
+    Callers remember the version they last processed and skip work while it
+    is unchanged. Bounded LRU, like ResponseCache.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (digest, value, version)
+        self._counter = 0
+
+        self.unchanged = 0
+        self.changed = 0
+
+    def resolve(self, key: str, raw: bytes, parse: Callable[[bytes], Any]) -> Tuple[Any, int]:
+        """
+        Return the parsed body, reusing the previous object if the bytes match
+
+        Args:
+            key: Canonical request key
+            raw: Raw (decompressed) response body
+            parse: Decoder used when the body changed
+
+        Returns:
+            (value, version) - ``value`` is the previously parsed object and
+            ``version`` unchanged when the bytes match. Read together under
+            the lock, so the version always belongs to the value even while
+            other threads resolve newer bodies.
+        """
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == digest:
+                self._entries.move_to_end(key)
+                self.unchanged += 1
+                return entry[1], entry[2]
+
+        value = parse(raw)
+        with self._lock:
+            self._counter += 1
+            version = self._counter
+            self._entries[key] = (digest, value, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.changed += 1
+        return value, version
+
+    def version(self, key: str) -> int:
+        """Version of the last body seen for ``key`` (0 if never fetched)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[2] if entry else 0
+
+    def metrics(self) -> Dict[str, Any]:
+        """Changed/unchanged response counters"""
+        with self._lock:
+            return {
+                'tracked': len(self._entries),
+                'changed': self.changed,
+                'unchanged': self.unchanged,
+            }
@@ -0,0 +1,1071 @@
+"""
+Hyperliquid History - Append-only follower snapshots in SQLite
+
+Every refresh of the monitor can be recorded: the vault's metadata is
+appended to the ``vaults`` table of ``hyperliquid_data.db`` and its
+followers to ``follower_frames`` as one columnar row per snapshot. A frame
+stores the followers' 20-byte addresses, sorted, as one BLOB and each
+numeric column (equity, pnl, allTimePnl, days) as a packed array BLOB, so a
+2000-follower snapshot decodes with ``np.frombuffer`` instead of parsing,
+and a user is found in a frame by binary search.
+
+Most followers do not change between two refreshes, so only every
+``keyframe_every``-th frame holds the whole follower set. The frames in
+between are deltas: the rows that were added or changed plus the addresses
+that left. A snapshot at any time is rebuilt from the keyframe before it and
+the deltas since, each applied with a sorted merge.
+
+Every table is keyed for the queries run against it and stores timestamps
+as integer Unix milliseconds; the schema is versioned with
+``PRAGMA user_version`` and upgraded in place by ``migrate()``. Rows are
+written by a background BatchWriter (see hyperliquid_writer), so appending
+never waits on the disk.
+
+``SnapshotStore.compact()`` downsamples old history: raw snapshots are kept
+for a day, then one per minute for 30 days, then one per hour. TVL readings
+are rolled up into open/high/low/close bars at the same resolutions.
+
+Usage:
+    python hyperliquid_history.py [--db hyperliquid_data.db] [--compact] [--vacuum]
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from hyperliquid_address import ADDRESSES, ADDRESS_DTYPE, NO_ADDRESS, pack_address
+from hyperliquid_table import FollowerTable
+from hyperliquid_writer import BatchWriter
+
+
+DEFAULT_DB_PATH = 'hyperliquid_data.db'
+
+# Frame columns: FollowerTable attribute -> stored dtype
+FRAME_COLUMNS = {
+    'equity': np.float64,
+    'pnl': np.float64,
+    'all_time_pnl': np.float64,
+    'days': np.int64,
+}
+
+# follower_frames.kind
+KEYFRAME = 0
+DELTA = 1
+
+# Bar lengths in milliseconds, the unit of every stored timestamp
+MINUTE = 60_000
+HOUR = 60 * MINUTE
+
+# Compaction defaults (seconds): raw snapshots for a day, minutes for 30 days
+RAW_RETENTION = 86_400
+MINUTE_RETENTION = 30 * 86_400
+
+# Open bound for time windows, in milliseconds
+_UNBOUNDED = 1 << 62
+
+
+def to_ms(timestamp: float) -> int:
+    """Unix seconds -> the integer milliseconds stored in the database"""
+    return int(round(timestamp * 1000))
+
+
+def from_ms(timestamp: int) -> float:
+    """Inverse of to_ms"""
+    return timestamp / 1000
+
+
+def _members(haystack: np.ndarray, needles: np.ndarray) -> np.ndarray:
+    """Mask of ``needles`` present in the sorted ``haystack``"""
+    if not len(haystack):
+        return np.zeros(len(needles), dtype=bool)
+    slots = np.minimum(np.searchsorted(haystack, needles), len(haystack) - 1)
+    return haystack[slots] == needles
+
+
+class Frame:
+    """Followers of one snapshot as address-sorted columns
+
+    ``users`` is an ``S20`` array in byte order; ``columns`` holds one array
+    per FRAME_COLUMNS entry in the same order. Arrays decoded from the
+    database are read-only views of the BLOBs.
+    """
+
+    def __init__(self, users: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.users = users
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    @classmethod
+    def from_table(cls, followers: FollowerTable) -> 'Frame':
+        """Frame of a parsed snapshot (rows without an address are dropped)"""
+        followers = followers[followers.user_ids != NO_ADDRESS]
+        users = ADDRESSES.packed(followers.user_ids)
+        order = np.argsort(users, kind='stable')
+        return cls(users[order], {
+            column: np.ascontiguousarray(getattr(followers, column)[order], dtype=dtype)
+            for column, dtype in FRAME_COLUMNS.items()
+        })
+
+    @classmethod
+    def decode(cls, users: bytes, columns: Dict[str, bytes]) -> 'Frame':
+        return cls(np.frombuffer(users, dtype=ADDRESS_DTYPE), {
+            column: np.frombuffer(columns[column], dtype=dtype) for column, dtype in FRAME_COLUMNS.items()
+        })
+
+    def encode(self) -> Dict[str, bytes]:
+        """BLOB of the users and of each column"""
+        frame = {'users': self.users.tobytes()}
+        frame.update((column, values.tobytes()) for column, values in self.columns.items())
+        return frame
+
+    def take(self, index) -> 'Frame':
+        return Frame(self.users[index], {column: values[index] for column, values in self.columns.items()})
+
+    def diff(self, previous: 'Frame') -> Tuple['Frame', np.ndarray]:
+        """
+        Delta from ``previous`` to this frame
+
+        Returns:
+            (rows that are new or changed, sorted addresses that left)
+        """
+        changed = ~_members(previous.users, self.users)
+        if len(previous):
+            slots = np.minimum(np.searchsorted(previous.users, self.users), len(previous) - 1)
+            for column, values in self.columns.items():
+                changed |= previous.columns[column][slots] != values
+        removed = previous.users[~_members(self.users, previous.users)]
+        return self.take(changed), removed
+
+    def apply(self, delta: 'Frame', removed: np.ndarray) -> 'Frame':
+        """This frame with a delta applied (a sorted merge, no re-sort)"""
+        dropped = np.union1d(removed, delta.users)
+        kept = self.take(~_members(dropped, self.users))
+        slots = np.searchsorted(kept.users, delta.users)
+        return Frame(np.insert(kept.users, slots, delta.users), {
+            column: np.insert(values, slots, delta.columns[column]) for column, values in kept.columns.items()
+        })
+
+    def apply_many(self, deltas: List[Tuple['Frame', np.ndarray]]) -> 'Frame':
+        """
+        This frame with several deltas applied in order
+
+        Same result as chaining ``apply()``, but every address's last change
+        is found with one sort over all delta rows and merged in once, so
+        rebuilding from a keyframe costs one merge instead of one per delta.
+        """
+        if not deltas:
+            return self
+        if len(deltas) == 1:
+            return self.apply(*deltas[0])
+        updates = Frame(np.concatenate([delta.users for delta, _ in deltas]), {
+            column: np.concatenate([delta.columns[column] for delta, _ in deltas]) for column in FRAME_COLUMNS
+        })
+        # Events in time order: a delta's rows (index into updates), then its removals (-1)
+        users, rows, offset = [], [], 0
+        for delta, removed in deltas:
+            users += [delta.users, removed]
+            rows += [np.arange(offset, offset + len(delta)), np.full(len(removed), -1)]
+            offset += len(delta)
+        users, rows = np.concatenate(users), np.concatenate(rows)
+        order = np.argsort(users, kind='stable')
+        users, rows = users[order], rows[order]
+        last = np.append(users[1:] != users[:-1], True)
+        users, rows = users[last], rows[last]
+
+        kept = self.take(~_members(users, self.users))
+        latest = updates.take(rows[rows >= 0])
+        slots = np.searchsorted(kept.users, latest.users)
+        return Frame(np.insert(kept.users, slots, latest.users), {
+            column: np.insert(values, slots, latest.columns[column]) for column, values in kept.columns.items()
+        })
+
+    def to_table(self) -> FollowerTable:
+        """FollowerTable in address order (columns are shared, not copied)"""
+        return FollowerTable(user_ids=ADDRESSES.intern_packed(self.users), **self.columns)
+
+
+EMPTY_FRAME = Frame(np.zeros(0, dtype=ADDRESS_DTYPE),
+                    {column: np.zeros(0, dtype=dtype) for column, dtype in FRAME_COLUMNS.items()})
+
+
+def _encode(frame: Frame, previous: Optional[Frame], since_keyframe: int,
+            keyframe_every: int) -> Tuple[int, Frame, Optional[bytes]]:
+    """
+    How to store ``frame`` after ``previous``
+
+    Returns:
+        (KEYFRAME or DELTA, frame or delta rows to store, removed addresses BLOB)
+    """
+    if previous is not None and since_keyframe + 1 < keyframe_every:
+        delta, gone = frame.diff(previous)
+        if len(delta) + len(gone) <= len(frame) // 2:
+            return DELTA, delta, gone.tobytes()
+    return KEYFRAME, frame, None
+
+
+def _migrate_v1(conn: sqlite3.Connection):
+    """Keys, covering indexes and integer millisecond timestamps
+
+    The first tables had no keys or indexes, and stored ``vaults`` and
+    ``leaderboard`` times as UTC text and frame times as REAL seconds.
+    Existing rows are copied into the new tables.
+    """
+    legacy = sorted({name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+                    & {'vaults', 'leaderboard', 'follower_frames'})
+    if legacy:
+        print(f"[HISTORY] Converting {', '.join(legacy)} to keyed tables with integer timestamps")
+    for table in legacy:
+        conn.execute(f"ALTER TABLE {table} RENAME TO {table}_v0")
+
+    conn.execute("""
+        CREATE TABLE vaults (
+            vault_address TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            name TEXT,
+            leader TEXT,
+            tvl REAL,
+            status TEXT,
+            PRIMARY KEY (vault_address, timestamp)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE leaderboard (
+            timestamp INTEGER NOT NULL,
+            rank INTEGER NOT NULL,
+            user_address TEXT NOT NULL,
+            total_pnl REAL,
+            open_vaults INTEGER,
+            PRIMARY KEY (timestamp, rank)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE follower_frames (
+            vault TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            kind INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            users BLOB NOT NULL,
+            equity BLOB NOT NULL,
+            pnl BLOB NOT NULL,
+            all_time_pnl BLOB NOT NULL,
+            days BLOB NOT NULL,
+            removed BLOB,
+            PRIMARY KEY (vault, timestamp)
+        )
+    """)
+
+    text_ms = "CAST(round((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER)"
+    if 'vaults' in legacy:
+        conn.execute(f"""
+            INSERT OR REPLACE INTO vaults (vault_address, timestamp, name, leader, tvl, status)
+            SELECT lower(vault_address), {text_ms}, name, leader, tvl, status FROM vaults_v0
+            WHERE vault_address IS NOT NULL AND julianday(timestamp) IS NOT NULL
+            ORDER BY 1, 2
+        """)
+    if 'leaderboard' in legacy:
+        conn.execute(f"""
+            INSERT OR REPLACE INTO leaderboard (timestamp, rank, user_address, total_pnl, open_vaults)
+            SELECT {text_ms}, rank, lower(user_address), total_pnl, open_vaults FROM leaderboard_v0
+            WHERE rank IS NOT NULL AND user_address IS NOT NULL AND julianday(timestamp) IS NOT NULL
+            ORDER BY 1, 2
+        """)
+    if 'follower_frames' in legacy:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(follower_frames_v0)")}
+        # Frames written before delta encoding are all keyframes
+        kind, removed = ('kind', 'removed') if 'kind' in columns else (str(KEYFRAME), 'NULL')
+        conn.execute(f"""
+            INSERT OR REPLACE INTO follower_frames
+                (vault, timestamp, kind, count, users, equity, pnl, all_time_pnl, days, removed)
+            SELECT vault, CAST(round(timestamp * 1000) AS INTEGER), {kind}, count,
+                   users, equity, pnl, all_time_pnl, days, {removed}
+            FROM follower_frames_v0 ORDER BY vault, timestamp
+        """)
+    for table in legacy:
+        conn.execute(f"DROP TABLE {table}_v0")
+
+    # Indexes are built after the copy: one sort each instead of random inserts
+    # TVL of every vault over a time range, read from the index alone
+    conn.execute("CREATE INDEX vaults_time ON vaults (timestamp, tvl)")
+    # One user's PnL over time, read from the index alone
+    conn.execute("CREATE INDEX leaderboard_user ON leaderboard (user_address, timestamp, total_pnl, open_vaults)")
+    # The keyframe a rebuild starts from, found without reading any frame
+    conn.execute("CREATE INDEX follower_frames_kind ON follower_frames (vault, kind, timestamp)")
+
+
+def _migrate_v2(conn: sqlite3.Connection):
+    """TVL bars and compaction progress"""
+    # resolution: bar length (ms); timestamp: bar start
+    conn.execute("""
+        CREATE TABLE vault_bars (
+            vault_address TEXT NOT NULL,
+            resolution INTEGER NOT NULL,
+            timestamp INTEGER NOT NULL,
+            open REAL,
+            high REAL,
+            low REAL,
+            close REAL,
+            samples INTEGER NOT NULL,
+            PRIMARY KEY (vault_address, resolution, timestamp)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX vault_bars_time ON vault_bars (resolution, timestamp)")
+    # Everything of ``target`` before ``until`` is downsampled to ``resolution``
+    conn.execute("""
+        CREATE TABLE compaction (
+            target TEXT NOT NULL,
+            resolution INTEGER NOT NULL,
+            until INTEGER NOT NULL,
+            PRIMARY KEY (target, resolution)
+        ) WITHOUT ROWID
+    """)
+
+
+def _migrate_v3(conn: sqlite3.Connection):
+    """FollowerStore's accumulated followers (see hyperliquid_store)
+
+    The table used to be created ad hoc by FollowerStore, so databases it
+    has opened already have it.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS vault_followers (
+            vault TEXT NOT NULL,
+            user TEXT NOT NULL,
+            data TEXT NOT NULL,
+            first_seen REAL NOT NULL,
+            last_seen REAL NOT NULL,
+            PRIMARY KEY (vault, user)
+        )
+    """)
+
+
+# MIGRATIONS[v] upgrades a database at schema version v to v + 1
+MIGRATIONS = [_migrate_v1, _migrate_v2, _migrate_v3]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Upgrade a database to SCHEMA_VERSION
+
+    Pending migrations run in one transaction: a crash leaves the database
+    at its old version, and a second process opening it meanwhile waits
+    for the upgrade instead of running it again.
+
+    Args:
+        conn: Connection in autocommit mode (``isolation_level=None``)
+
+    Returns:
+        Schema version the database was at
+
+    Raises:
+        RuntimeError: The database was written by a newer version
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == SCHEMA_VERSION:
+        return version
+    # In WAL mode a migration that rebuilds tables keeps a second copy of
+    # them in the WAL until it commits. A rollback journal skips pages
+    # appended to the file, so switch when no other connection is open.
+    # With one open (e.g. the dashboard's FollowerStore) SQLite refuses the
+    # switch and the migration runs in the current mode.
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    switched = False
+    try:
+        switched = conn.execute("PRAGMA journal_mode=DELETE").fetchone()[0] != journal_mode
+    except sqlite3.OperationalError:
+        pass
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise RuntimeError(f"Database schema v{version} is newer than this version supports "
+                                   f"(v{SCHEMA_VERSION})")
+            for step in MIGRATIONS[version:]:
+                step(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        if switched:
+            conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    return version
+
+
+class SnapshotStore:
+    """Append-only vault and follower history
+
+    ``append()`` encodes the snapshot on the caller's thread and queues its
+    rows on a BatchWriter, which commits them in batches from its own
+    thread. Reads see committed snapshots only; ``flush()`` waits for
+    everything appended so far.
+
+    The first snapshot of a vault in each process is a keyframe, then every
+    ``keyframe_every``-th one, and any snapshot in which more than half of
+    the followers changed. All others are stored as deltas against the
+    previous snapshot. If the writer drops or fails to write a row, the next
+    snapshot of every vault is a keyframe again, so a lost delta cannot
+    corrupt reconstructions past that point. A delta is only inserted while
+    the frame it was encoded against is in the database: deltas queued
+    before the loss was noticed are skipped instead of being stored against
+    a frame that is missing. This relies on the writer committing rows in
+    the order they were written, which BatchWriter keeps under every
+    backpressure policy; a spilled row is delayed, not lost, so it does not
+    force a keyframe.
+
+    Timestamps are Unix seconds in the API and integer milliseconds in the
+    database (see to_ms).
+    """
+
+    VAULT_SQL = ("INSERT OR REPLACE INTO vaults (vault_address, timestamp, name, leader, tvl, status) "
+                 "VALUES (?, ?, ?, ?, ?, ?)")
+    FRAME_SQL = ("INSERT OR REPLACE INTO follower_frames "
+                 "(vault, timestamp, kind, count, users, equity, pnl, all_time_pnl, days, removed) "
+                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+    # FRAME_SQL for a delta, plus the vault and timestamp of the frame it is a delta against
+    DELTA_SQL = ("INSERT OR REPLACE INTO follower_frames "
+                 "(vault, timestamp, kind, count, users, equity, pnl, all_time_pnl, days, removed) "
+                 "SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ? "
+                 "WHERE EXISTS (SELECT 1 FROM follower_frames WHERE vault = ? AND timestamp = ?)")
+    LEADERBOARD_SQL = ("INSERT OR REPLACE INTO leaderboard (timestamp, rank, user_address, total_pnl, open_vaults) "
+                       "VALUES (?, ?, ?, ?, ?)")
+    WATERMARK_SQL = ("INSERT INTO compaction (target, resolution, until) VALUES (?, ?, ?) "
+                     "ON CONFLICT (target, resolution) DO UPDATE SET until = max(until, excluded.until)")
+
+    # Raw TVL readings -> bars; open and close come from the first and last reading of each bar
+    RAW_BARS_SQL = """
+        INSERT INTO vault_bars (vault_address, resolution, timestamp, open, high, low, close, samples)
+        SELECT b.vault_address, :resolution, b.bucket,
+               (SELECT tvl FROM vaults WHERE vault_address = b.vault_address AND timestamp = b.first),
+               b.high, b.low,
+               (SELECT tvl FROM vaults WHERE vault_address = b.vault_address AND timestamp = b.last),
+               b.samples
+        FROM (SELECT vault_address, timestamp / :resolution * :resolution AS bucket,
+                     MIN(timestamp) AS first, MAX(timestamp) AS last,
+                     MAX(tvl) AS high, MIN(tvl) AS low, COUNT(*) AS samples
+              FROM vaults WHERE timestamp >= :start AND timestamp < :end
+              GROUP BY vault_address, bucket) AS b
+        WHERE true
+        ON CONFLICT (vault_address, resolution, timestamp) DO UPDATE SET
+            high = max(high, excluded.high), low = min(low, excluded.low),
+            close = excluded.close, samples = samples + excluded.samples
+    """
+    # Bars of resolution :source -> bars of :resolution
+    ROLLUP_BARS_SQL = """
+        INSERT INTO vault_bars (vault_address, resolution, timestamp, open, high, low, close, samples)
+        SELECT b.vault_address, :resolution, b.bucket,
+               (SELECT open FROM vault_bars
+                WHERE vault_address = b.vault_address AND resolution = :source AND timestamp = b.first),
+               b.high, b.low,
+               (SELECT close FROM vault_bars
+                WHERE vault_address = b.vault_address AND resolution = :source AND timestamp = b.last),
+               b.samples
+        FROM (SELECT vault_address, timestamp / :resolution * :resolution AS bucket,
+                     MIN(timestamp) AS first, MAX(timestamp) AS last,
+                     MAX(high) AS high, MIN(low) AS low, SUM(samples) AS samples
+              FROM vault_bars WHERE resolution = :source AND timestamp >= :start AND timestamp < :end
+              GROUP BY vault_address, bucket) AS b
+        WHERE true
+        ON CONFLICT (vault_address, resolution, timestamp) DO UPDATE SET
+            high = max(high, excluded.high), low = min(low, excluded.low),
+            close = excluded.close, samples = samples + excluded.samples
+    """
+    # TVL of one vault per :resolution bucket from raw readings and stored bars
+    TVL_BARS_SQL = """
+        SELECT b.bucket, b.first, b.high, b.low, b.samples,
+               (SELECT tvl FROM vaults WHERE vault_address = :vault AND timestamp = b.first),
+               (SELECT tvl FROM vaults WHERE vault_address = :vault AND timestamp = b.last)
+        FROM (SELECT timestamp / :resolution * :resolution AS bucket,
+                     MIN(timestamp) AS first, MAX(timestamp) AS last,
+                     MAX(tvl) AS high, MIN(tvl) AS low, COUNT(*) AS samples
+              FROM vaults WHERE vault_address = :vault AND timestamp BETWEEN :start AND :end
+              GROUP BY bucket) AS b
+        UNION ALL
+        SELECT b.bucket, b.first, b.high, b.low, b.samples,
+               (SELECT open FROM vault_bars
+                WHERE vault_address = :vault AND resolution IN (:minute, :hour) AND timestamp = b.first),
+               (SELECT close FROM vault_bars
+                WHERE vault_address = :vault AND resolution IN (:minute, :hour) AND timestamp = b.last)
+        FROM (SELECT timestamp / :resolution * :resolution AS bucket,
+                     MIN(timestamp) AS first, MAX(timestamp) AS last,
+                     MAX(high) AS high, MIN(low) AS low, SUM(samples) AS samples
+              FROM vault_bars
+              WHERE vault_address = :vault AND resolution IN (:minute, :hour)
+                    AND timestamp BETWEEN :start AND :end
+              GROUP BY bucket) AS b
+        ORDER BY 1, 2
+    """
+    # Keep the last leaderboard of every bucket
+    THIN_LEADERBOARD_SQL = """
+        DELETE FROM leaderboard WHERE timestamp >= :start AND timestamp < :end AND timestamp NOT IN (
+            SELECT MAX(timestamp) FROM leaderboard WHERE timestamp >= :start AND timestamp < :end
+            GROUP BY timestamp / :resolution
+        )
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, batch_size: int = 64,
+                 flush_interval: float = 1.0, keyframe_every: int = 120,
+                 backpressure: str = 'block', writer: Optional[BatchWriter] = None):
+        """
+        Args:
+            path: SQLite file (WAL mode, shared with the other hyperliquid_data tables)
+            batch_size: Rows per write transaction
+            flush_interval: Maximum seconds a row waits for its batch
+            keyframe_every: Frames per keyframe; 1 stores every snapshot in full
+            backpressure: Writer policy when its queue is full - 'block',
+                'drop' or 'spill'
+            writer: Optional writer to share (its own settings apply)
+
+        Raises:
+            RuntimeError: The database was written by a newer version
+        """
+        self.path = path
+        self.keyframe_every = max(1, keyframe_every)
+        self._lock = threading.Lock()
+        # vault -> (last appended Frame, frames since its keyframe, its timestamp)
+        self._previous = {}
+
+        self.snapshots = 0
+        self.keyframes = 0
+
+        self._conn = sqlite3.connect(path, timeout=10, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        migrate(self._conn)
+
+        self._owns_writer = writer is None
+        self.writer = writer or BatchWriter(path, batch_size, flush_interval, backpressure=backpressure)
+        self._writer_losses = 0
+
+    @staticmethod
+    def _frame_row(vault: str, timestamp: int, kind: int, frame: Frame, stored: Frame,
+                   removed: Optional[bytes]) -> tuple:
+        """FRAME_SQL parameters"""
+        blobs = stored.encode()
+        return (vault, timestamp, kind, len(frame), blobs['users'],
+                *(blobs[column] for column in FRAME_COLUMNS), removed)
+
+    def append(self, vault_address: str, vault_data: Dict[str, Any],
+               followers: Optional[FollowerTable] = None, timestamp: Optional[float] = None):
+        """
+        Queue one snapshot of a vault
+
+        Args:
+            vault_address: Vault address
+            vault_data: vaultDetails response (name, leader, isClosed, ...)
+            followers: Parsed followers; parsed from ``vault_data`` when omitted
+            timestamp: Snapshot time (default: now)
+        """
+        timestamp = to_ms(time.time() if timestamp is None else timestamp)
+        if followers is None:
+            followers = FollowerTable.from_followers(vault_data.get('followers', []), keep_raw=False)
+        vault = vault_address.lower()
+        frame = Frame.from_table(followers)
+
+        with self._lock:
+            losses = self.writer.dropped + self.writer.errors
+            if losses != self._writer_losses:
+                # Some row never reached the database: restart every vault from a
+                # keyframe (spilled rows still arrive, in order, so they don't count)
+                self._writer_losses = losses
+                self._previous.clear()
+
+            previous, since_keyframe, previous_timestamp = self._previous.get(vault, (None, 0, None))
+            kind, stored, removed = _encode(frame, previous, since_keyframe, self.keyframe_every)
+            row = self._frame_row(vault, timestamp, kind, frame, stored, removed)
+            if kind == KEYFRAME:
+                queued = self.writer.write(self.FRAME_SQL, row)
+            else:
+                queued = self.writer.write(self.DELTA_SQL, (*row, vault, previous_timestamp))
+            if queued:
+                self._previous[vault] = (frame, 0 if kind == KEYFRAME else since_keyframe + 1, timestamp)
+            else:
+                self._previous.pop(vault, None)
+            self.snapshots += 1
+            self.keyframes += queued and kind == KEYFRAME
+
+        self.writer.write(self.VAULT_SQL, (
+            vault,
+            timestamp,
+            vault_data.get('name'),
+            vault_data.get('leader'),
+            followers.total_equity(),
+            'closed' if vault_data.get('isClosed') else 'open',
+        ))
+
+    def append_leaderboard(self, entries: Iterable[Dict[str, Any]], timestamp: Optional[float] = None,
+                           limit: int = 100):
+        """
+        Queue a cross-vault leaderboard (e.g. merge_leaderboards output)
+
+        Each user's all-time PnL is summed over the vaults they appear in,
+        which are counted as ``open_vaults``; users are ranked by that sum.
+
+        Args:
+            entries: Follower rows tagged with their ``vault``
+            timestamp: Leaderboard time (default: now)
+            limit: Rows to keep
+        """
+        timestamp = to_ms(time.time() if timestamp is None else timestamp)
+        totals = {}
+        for entry in entries:
+            user = entry.get('user')
+            if not user:
+                continue
+            total, vaults = totals.get(user.lower(), (0.0, set()))
+            vaults.add(entry.get('vault'))
+            totals[user.lower()] = (total + float(entry.get('allTimePnl') or 0), vaults)
+        ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        self.writer.write_many(self.LEADERBOARD_SQL, (
+            (timestamp, rank, user, total, len(vaults))
+            for rank, (user, (total, vaults)) in enumerate(ranked, 1)
+        ))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every appended snapshot is committed (False on timeout)"""
+        return self.writer.flush(timeout)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot counts plus the writer's queue and flush metrics"""
+        return {'snapshots': self.snapshots, 'keyframes': self.keyframes, **self.writer.metrics()}
+
+    def describe(self) -> str:
+        """One-line status for the monitor footer"""
+        return f"💾 {self.snapshots} snapshots | {self.writer.describe()}"
+
+    def _query(self, sql: str, params: tuple) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _execute(self, *statements: Tuple[str, Any]) -> List[int]:
+        """
+        Run ``(sql, params)`` statements in one write transaction
+
+        A list of parameter tuples runs the statement once per tuple.
+
+        Returns:
+            Rows changed by each statement
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                changed = [
+                    (self._conn.executemany if isinstance(params, list) else self._conn.execute)(sql, params).rowcount
+                    for sql, params in statements
+                ]
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return changed
+
+    @staticmethod
+    def _window(start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        return (-_UNBOUNDED if start is None else to_ms(start)), (_UNBOUNDED if end is None else to_ms(end))
+
+    def vault_history(self, vault_address: str, start: Optional[float] = None,
+                      end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Recorded vault metadata, oldest first
+
+        Only readings that compaction has not rolled up into bars yet are
+        returned; see tvl_bars() for TVL over longer periods.
+
+        Args:
+            vault_address: Vault address
+            start: First timestamp to include (default: all)
+            end: Last timestamp to include (default: all)
+
+        Returns:
+            Dicts with timestamp (Unix seconds), name, leader, tvl and status
+        """
+        start, end = self._window(start, end)
+        rows = self._query(
+            "SELECT timestamp, name, leader, tvl, status FROM vaults "
+            "WHERE vault_address = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp",
+            (vault_address.lower(), start, end)
+        )
+        return [
+            {'timestamp': from_ms(ts), 'name': name, 'leader': leader, 'tvl': tvl, 'status': status}
+            for ts, name, leader, tvl, status in rows
+        ]
+
+    def tvl_bars(self, vault_address: str, resolution: float = 3600, start: Optional[float] = None,
+                 end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        TVL of a vault as open/high/low/close bars
+
+        Raw readings and compacted bars are combined, so a window can span
+        both. Where only coarser bars are left, a bar covers its own span
+        (e.g. hourly bars in a one-minute query beyond 30 days).
+
+        Args:
+            vault_address: Vault address
+            resolution: Bar length in seconds
+            start: First timestamp to include (default: all)
+            end: Last timestamp to include (default: all)
+
+        Returns:
+            Arrays keyed 'timestamp' (bar start, Unix seconds), 'open',
+            'high', 'low', 'close' and 'samples'
+        """
+        start, end = self._window(start, end)
+        rows = self._query(self.TVL_BARS_SQL, {
+            'vault': vault_address.lower(), 'resolution': to_ms(resolution), 'start': start, 'end': end,
+            'minute': MINUTE, 'hour': HOUR,
+        })
+        if not rows:
+            return {column: np.zeros(0) for column in ('timestamp', 'open', 'high', 'low', 'close', 'samples')}
+        # Raw readings and stored bars can share a bucket: merge them
+        bucket, _, high, low, samples, open_, close = (np.array(column, dtype=np.float64) for column in zip(*rows))
+        first = np.flatnonzero(np.append(True, bucket[1:] != bucket[:-1]))
+        last = np.append(first[1:] - 1, len(bucket) - 1)
+        return {
+            'timestamp': bucket[first] / 1000,
+            'open': open_[first],
+            'high': np.fmax.reduceat(high, first),
+            'low': np.fmin.reduceat(low, first),
+            'close': close[last],
+            'samples': np.add.reduceat(samples, first).astype(np.int64),
+        }
+
+    def leaderboard_history(self, user_address: str, start: Optional[float] = None,
+                            end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        One user's recorded global leaderboard entries, oldest first
+
+        Args:
+            user_address: User address
+            start: First timestamp to include (default: all)
+            end: Last timestamp to include (default: all)
+
+        Returns:
+            Arrays keyed 'timestamp', 'rank', 'total_pnl' and 'open_vaults'
+        """
+        start, end = self._window(start, end)
+        rows = self._query(
+            "SELECT timestamp, rank, total_pnl, open_vaults FROM leaderboard "
+            "WHERE user_address = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp",
+            (user_address.lower(), start, end)
+        )
+        timestamps, ranks, pnl, vaults = zip(*rows) if rows else ((), (), (), ())
+        return {
+            'timestamp': np.array(timestamps, dtype=np.float64) / 1000,
+            'rank': np.array(ranks, dtype=np.int64),
+            'total_pnl': np.array(pnl, dtype=np.float64),
+            'open_vaults': np.array(vaults, dtype=np.int64),
+        }
+
+    def timestamps(self, vault_address: str, start: Optional[float] = None,
+                   end: Optional[float] = None) -> np.ndarray:
+        """Timestamps of the recorded frames of a vault in a window"""
+        start, end = self._window(start, end)
+        rows = self._query(
+            "SELECT timestamp FROM follower_frames WHERE vault = ? AND timestamp BETWEEN ? AND ? "
+            "ORDER BY timestamp",
+            (vault_address.lower(), start, end)
+        )
+        return np.array([ts for ts, in rows], dtype=np.float64) / 1000
+
+    def _rows(self, vault: str, start: int, end: int, columns: str) -> List[tuple]:
+        """Frame rows from the last keyframe at or before ``start`` up to ``end`` (milliseconds)"""
+        keyframe = self._query(
+            "SELECT MAX(timestamp) FROM follower_frames WHERE vault = ? AND kind = ? AND timestamp <= ?",
+            (vault, KEYFRAME, start)
+        )[0][0]
+        return self._query(
+            f"SELECT timestamp, kind, {columns} FROM follower_frames "
+            "WHERE vault = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp",
+            (vault, -_UNBOUNDED if keyframe is None else keyframe, end)
+        )
+
+    def _replay(self, vault: str, start: int, end: int) -> Iterator[Tuple[int, Frame]]:
+        """(timestamp, rebuilt Frame) for every frame up to ``end``, from the keyframe before ``start``"""
+        state = None
+        for timestamp, kind, users, *columns, removed in self._rows(
+                vault, start, end, 'users, equity, pnl, all_time_pnl, days, removed'):
+            frame = Frame.decode(users, dict(zip(FRAME_COLUMNS, columns)))
+            if kind == KEYFRAME:
+                state = frame
+            elif state is not None:
+                state = state.apply(frame, np.frombuffer(removed or b'', dtype=ADDRESS_DTYPE))
+            else:
+                # Deltas without a keyframe before them cannot be rebuilt
+                continue
+            yield timestamp, state
+
+    def frames(self, vault_address: str, start: Optional[float] = None,
+               end: Optional[float] = None) -> Iterator[Tuple[float, FollowerTable]]:
+        """
+        Recorded follower snapshots of a vault, oldest first
+
+        Deltas are applied as the frames are read, so a window costs one
+        keyframe decode plus one merge per frame.
+
+        Yields:
+            (timestamp, FollowerTable ordered by address)
+        """
+        start, end = self._window(start, end)
+        for timestamp, frame in self._replay(vault_address.lower(), start, end):
+            if timestamp >= start:
+                yield from_ms(timestamp), frame.to_table()
+
+    def snapshot_at(self, vault_address: str, timestamp: float) -> Optional[FollowerTable]:
+        """Followers of a vault as last recorded at or before ``timestamp`` (None before the first frame)"""
+        timestamp = to_ms(timestamp)
+        state, deltas = None, []
+        for _, kind, users, *columns, removed in self._rows(
+                vault_address.lower(), timestamp, timestamp, 'users, equity, pnl, all_time_pnl, days, removed'):
+            frame = Frame.decode(users, dict(zip(FRAME_COLUMNS, columns)))
+            if kind == KEYFRAME:
+                state, deltas = frame, []
+            else:
+                deltas.append((frame, np.frombuffer(removed or b'', dtype=ADDRESS_DTYPE)))
+        return None if state is None else state.apply_many(deltas).to_table()
+
+    def user_history(self, vault_address: str, user: Union[str, bytes], start: Optional[float] = None,
+                     end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        One follower's recorded values, oldest first
+
+        Frames in which the user was not following the vault are skipped.
+        Only the user's own entry is looked up in each frame (binary search);
+        nothing else is rebuilt.
+
+        Args:
+            vault_address: Vault address
+            user: Follower address (hex or 20 bytes)
+            start: First timestamp to include (default: all)
+            end: Last timestamp to include (default: all)
+
+        Returns:
+            Arrays keyed 'timestamp', 'equity', 'pnl', 'all_time_pnl', 'days'
+        """
+        start, end = self._window(start, end)
+        needle = np.array([pack_address(user)], dtype=ADDRESS_DTYPE)
+        history = {'timestamp': []}
+        history.update((column, []) for column in FRAME_COLUMNS)
+        values = None
+        for timestamp, kind, users, *columns, removed in self._rows(
+                vault_address.lower(), start, end, 'users, equity, pnl, all_time_pnl, days, removed'):
+            users = np.frombuffer(users, dtype=ADDRESS_DTYPE)
+            if kind == DELTA and _members(np.frombuffer(removed or b'', dtype=ADDRESS_DTYPE), needle)[0]:
+                values = None
+            elif _members(users, needle)[0]:
+                # Read just this row's value out of each column BLOB
+                slot = int(np.searchsorted(users, needle)[0])
+                values = [
+                    np.frombuffer(blob, dtype=dtype, count=1, offset=slot * np.dtype(dtype).itemsize)[0]
+                    for dtype, blob in zip(FRAME_COLUMNS.values(), columns)
+                ]
+            elif kind == KEYFRAME:
+                values = None
+            if values is not None and timestamp >= start:
+                history['timestamp'].append(from_ms(timestamp))
+                for column, value in zip(FRAME_COLUMNS, values):
+                    history[column].append(value)
+        return {
+            column: np.array(values, dtype=FRAME_COLUMNS.get(column, np.float64))
+            for column, values in history.items()
+        }
+
+    def storage(self, vault_address: str) -> Dict[str, int]:
+        """Frame counts and stored BLOB bytes of a vault"""
+        frames, keyframes, stored, followers = self._query(
+            "SELECT COUNT(*), SUM(kind = ?), "
+            "SUM(length(users) + length(equity) + length(pnl) + length(all_time_pnl) + length(days) "
+            "    + IFNULL(length(removed), 0)), SUM(count) "
+            "FROM follower_frames WHERE vault = ?",
+            (KEYFRAME, vault_address.lower())
+        )[0]
+        row_bytes = ADDRESS_DTYPE.itemsize + sum(np.dtype(dtype).itemsize for dtype in FRAME_COLUMNS.values())
+        return {
+            'frames': frames,
+            'keyframes': keyframes or 0,
+            'stored_bytes': stored or 0,
+            'full_bytes': (followers or 0) * row_bytes,
+        }
+
+    def _chunks(self, first_sql: str, params: tuple, resolution: int, cutoff: int,
+                target: Optional[str] = None) -> Iterator[Tuple[int, int]]:
+        """
+        Bucket-aligned ``[start, end)`` windows before ``cutoff`` that hold rows
+
+        ``first_sql`` selects the first timestamp at or after its last two
+        parameters' lower bound and before the upper one. With a ``target``
+        the windows start at its compaction watermark (or the coarser
+        hourly one), which is moved to ``cutoff`` once they are consumed.
+        """
+        until = 0
+        if target is not None:
+            watermarks = self._query("SELECT until FROM compaction WHERE target = ? AND resolution IN (?, ?)",
+                                     (target, resolution, HOUR))
+            until = max([0] + [row[0] for row in watermarks])
+        while True:
+            first = self._query(first_sql, params + (until, cutoff))[0][0]
+            if first is None:
+                break
+            start = first // resolution * resolution
+            # 60 buckets per transaction keeps the database lock short
+            until = min(start + 60 * resolution, cutoff)
+            yield start, until
+        if target is not None:
+            self._execute((self.WATERMARK_SQL, (target, resolution, cutoff)))
+
+    def _downsample_frames(self, vault: str, start: int, end: int, resolution: int) -> int:
+        """Keep the last frame of every bucket in ``[start, end)``; returns frames removed"""
+        kept, pending = [], None
+        for timestamp, frame in self._replay(vault, start, end - 1):
+            if timestamp < start:
+                continue
+            if pending is not None and pending[0] // resolution != timestamp // resolution:
+                kept.append(pending)
+            pending = (timestamp, frame)
+        if pending is not None:
+            kept.append(pending)
+        count = self._query(
+            "SELECT COUNT(*) FROM follower_frames WHERE vault = ? AND timestamp >= ? AND timestamp < ?",
+            (vault, start, end)
+        )[0][0]
+        if count == len(kept):
+            return 0
+
+        # Re-encode the kept frames; the first is a keyframe, so nothing
+        # refers to a removed frame. The last frame of the window is always
+        # kept, so deltas after ``end`` still apply.
+        rows, previous, since_keyframe = [], None, 0
+        for timestamp, frame in kept:
+            kind, stored, removed = _encode(frame, previous, since_keyframe, self.keyframe_every)
+            rows.append(self._frame_row(vault, timestamp, kind, frame, stored, removed))
+            previous, since_keyframe = frame, (0 if kind == KEYFRAME else since_keyframe + 1)
+        deleted, _, _ = self._execute(
+            ("DELETE FROM follower_frames WHERE vault = ? AND timestamp >= ? AND timestamp < ?",
+             (vault, start, end)),
+            (self.FRAME_SQL, rows),
+            (self.WATERMARK_SQL, (vault, resolution, end)),
+        )
+        return deleted - len(rows)
+
+    def compact(self, now: Optional[float] = None, raw_for: float = RAW_RETENTION,
+                minutes_for: float = MINUTE_RETENTION) -> Dict[str, int]:
+        """
+        Downsample history older than ``raw_for``
+
+        Follower snapshots and leaderboards between ``raw_for`` and
+        ``minutes_for`` old are thinned to the last one of every minute,
+        older ones to the last one of every hour; kept snapshots rebuild
+        exactly as recorded. TVL readings are replaced by open/high/low/close
+        bars in ``vault_bars`` at the same resolutions.
+
+        Work is done in short transactions and its progress recorded in the
+        ``compaction`` table, so this can run beside a recording monitor and
+        resumes where an interrupted run stopped. Freed pages are reused by
+        new rows; ``vacuum()`` returns them to the filesystem.
+
+        Args:
+            now: Reference time (default: now)
+            raw_for: Seconds of history kept as recorded
+            minutes_for: Seconds of history kept at one-minute resolution
+
+        Returns:
+            Counts of removed frames, vault rows and leaderboard rows, and
+            of bars written
+        """
+        now = to_ms(time.time() if now is None else now)
+        minute_cutoff = (now - to_ms(raw_for)) // MINUTE * MINUTE
+        hour_cutoff = min((now - to_ms(minutes_for)) // HOUR * HOUR, minute_cutoff)
+        stats = {'frames_removed': 0, 'vault_rows_removed': 0, 'leaderboard_rows_removed': 0, 'bars_written': 0}
+
+        # Hourly first, so the minute pass skips what is already hourly
+        for vault, in self._query("SELECT DISTINCT vault FROM follower_frames", ()):
+            for resolution, cutoff in ((HOUR, hour_cutoff), (MINUTE, minute_cutoff)):
+                for start, end in self._chunks(
+                        "SELECT MIN(timestamp) FROM follower_frames WHERE vault = ? AND timestamp >= ? "
+                        "AND timestamp < ?", (vault,), resolution, cutoff, target=vault):
+                    stats['frames_removed'] += self._downsample_frames(vault, start, end, resolution)
+
+        for resolution, cutoff in ((HOUR, hour_cutoff), (MINUTE, minute_cutoff)):
+            for start, end in self._chunks(
+                    "SELECT MIN(timestamp) FROM leaderboard WHERE timestamp >= ? AND timestamp < ?", (),
+                    resolution, cutoff, target='leaderboard'):
+                removed, _ = self._execute(
+                    (self.THIN_LEADERBOARD_SQL, {'start': start, 'end': end, 'resolution': resolution}),
+                    (self.WATERMARK_SQL, ('leaderboard', resolution, end)),
+                )
+                stats['leaderboard_rows_removed'] += removed
+
+        # Raw TVL readings are consumed as they become minute bars, and
+        # minute bars as they become hourly ones
+        for start, end in self._chunks("SELECT MIN(timestamp) FROM vaults WHERE timestamp >= ? AND timestamp < ?",
+                                       (), MINUTE, minute_cutoff):
+            bars, removed = self._execute(
+                (self.RAW_BARS_SQL, {'resolution': MINUTE, 'start': start, 'end': end}),
+                ("DELETE FROM vaults WHERE timestamp >= ? AND timestamp < ?", (start, end)),
+            )
+            stats['bars_written'] += bars
+            stats['vault_rows_removed'] += removed
+        for start, end in self._chunks(
+                "SELECT MIN(timestamp) FROM vault_bars WHERE resolution = ? AND timestamp >= ? AND timestamp < ?",
+                (MINUTE,), HOUR, hour_cutoff):
+            bars, _ = self._execute(
+                (self.ROLLUP_BARS_SQL, {'source': MINUTE, 'resolution': HOUR, 'start': start, 'end': end}),
+                ("DELETE FROM vault_bars WHERE resolution = ? AND timestamp >= ? AND timestamp < ?",
+                 (MINUTE, start, end)),
+            )
+            stats['bars_written'] += bars
+        return stats
+
+    def vacuum(self):
+        """Rewrite the database file without the pages freed by compact() (needs as much free disk)"""
+        self.flush()
+        with self._lock:
+            self._conn.execute("VACUUM")
+
+    def close(self):
+        """Write everything appended so far and close the database"""
+        if self._conn is not None:
+            if self._owns_writer:
+                self.writer.close()
+            else:
+                self.writer.flush()
+            self._conn.close()
+            self._conn = None
+
+
+def _arg(name: str, default: str) -> str:
+    if name in sys.argv:
+        try:
+            return sys.argv[sys.argv.index(name) + 1]
+        except IndexError:
+            print(f"⚠️  Missing {name} value, using default: {default}")
+    return default
+
+
+def main():
+    store = SnapshotStore(_arg('--db', DEFAULT_DB_PATH))
+    try:
+        print(f"💾 {store.path}: schema v{SCHEMA_VERSION}")
+        if "--compact" in sys.argv:
+            started = time.perf_counter()
+            stats = store.compact()
+            print(f"✅ Compacted in {time.perf_counter() - started:.1f}s: removed {stats['frames_removed']:,} "
+                  f"frames, {stats['vault_rows_removed']:,} vault rows and {stats['leaderboard_rows_removed']:,} "
+                  f"leaderboard rows; wrote {stats['bars_written']:,} TVL bars")
+        if "--vacuum" in sys.argv:
+            started = time.perf_counter()
+            store.vacuum()
+            print(f"✅ Vacuumed in {time.perf_counter() - started:.1f}s")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Hyperliquid JSON - Pluggable response decoder and streaming follower parser
+
+``get_decoder()`` picks orjson when it is installed and falls back to the
+stdlib ``json`` module otherwise.
+
+``iter_followers()`` walks a ``vaultDetails`` body chunk by chunk and yields
+the ``followers`` array one entry at a time, keeping only the fields the
+leaderboard uses. The rest of the body (vault metadata, portfolio history) is
+skipped without being materialised, so peak memory stays flat as follower
+lists grow.
+"""
+
+import json
+import re
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+LEADERBOARD_FIELDS = ('user', 'vaultEquity', 'pnl', 'allTimePnl', 'daysFollowing')
+
+# Bytes that change the parser state: string delimiters, escapes and brackets
+_STRUCTURAL = re.compile(rb'["\\{}\[\]]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+
+def get_decoder(name: str = 'auto') -> Callable[[bytes], Any]:
+    """
+    Return a ``bytes -> object`` JSON decoder
+
+    Args:
+        name: 'auto' (orjson if installed, else json), 'orjson' or 'json'
+
+    Returns:
+        Decoder callable
+    """
+    if name == 'json' or (name == 'auto' and orjson is None):
+        return json.loads
+    if name in ('orjson', 'auto'):
+        if orjson is None:
+            raise ImportError("orjson decoder requested but not installed: pip install orjson")
+        return orjson.loads
+    raise ValueError(f"Unknown JSON decoder: {name}")
+
+
+def decoder_name(decoder: Callable[[bytes], Any]) -> str:
+    """Human-readable name of a decoder returned by get_decoder"""
+    return 'orjson' if orjson is not None and decoder is orjson.loads else 'json'
+
+
+class FollowerStreamParser:
+    """Incremental scanner for the top-level ``followers`` array
+
+    Feed raw body chunks with ``feed()``; each call returns the follower
+    objects completed so far. Only bytes belonging to the follower currently
+    being read are buffered.
+    """
+
+    def __init__(self, decode: Callable[[bytes], Any] = json.loads,
+                 fields: Optional[Sequence[str]] = LEADERBOARD_FIELDS, key: bytes = b'followers'):
+        """
+        Args:
+            decode: Decoder for each individual follower object
+            fields: Fields to keep from each follower (None keeps all)
+            key: Top-level key holding the array
+        """
+        self.decode = decode
+        self.fields = tuple(fields) if fields else None
+        self.key = key
+        self.done = False
+
+        self._buf = b''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._last_string = None
+        self._in_array = False
+        self._object_start = None
+
+    def _project(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        if self.fields is None:
+            return obj
+        return {field: obj[field] for field in self.fields if field in obj}
+
+    def feed(self, chunk: bytes) -> list:
+        """Consume a chunk and return the followers it completed"""
+        if self.done:
+            return []
+
+        buf = self._buf + chunk
+        pos = self._pos
+        depth = self._depth
+        in_string = self._in_string
+        completed = []
+
+        while True:
+            if in_string:
+                # Jump to the next quote or backslash inside the string
+                match = _STRING_SPECIAL.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                if match.group() == b'\\':
+                    if match.end() >= len(buf):
+                        # Escape split across chunks - resume at the backslash
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                in_string = False
+                pos = match.end()
+                if depth == 1 and not self._in_array:
+                    self._last_string = buf[self._string_start:match.start()]
+                continue
+
+            match = _STRUCTURAL.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            token = match.group()
+            pos = match.end()
+
+            if token == b'"':
+                in_string = True
+                self._string_start = pos
+            elif token in (b'{', b'['):
+                if self._in_array and depth == 2 and token == b'{':
+                    # Fast path for flat followers: the next '}' closes the
+                    # object if nothing before it opens a container, escapes
+                    # a character or leaves a string unterminated.
+                    end = buf.find(b'}', pos)
+                    if end != -1:
+                        body = buf[pos:end]
+                        if (b'{' not in body and b'[' not in body and b'\\' not in body
+                                and body.count(b'"') % 2 == 0):
+                            completed.append(self._project(self.decode(buf[match.start():end + 1])))
+                            pos = end + 1
+                            continue
+                    self._object_start = match.start()
+                if depth == 1 and token == b'[' and self._last_string == self.key:
+                    self._in_array = True
+                depth += 1
+            elif token in (b'}', b']'):
+                depth -= 1
+                if self._in_array and depth == 2 and token == b'}' and self._object_start is not None:
+                    completed.append(self._project(self.decode(buf[self._object_start:pos])))
+                    self._object_start = None
+                elif self._in_array and depth == 1:
+                    self.done = True
+                    break
+
+        # Drop everything that no longer needs to be kept
+        if self._object_start is not None:
+            keep_from = self._object_start
+            self._object_start = 0
+        elif in_string and depth == 1 and not self._in_array:
+            keep_from = self._string_start
+            self._string_start = 0
+        else:
+            keep_from = pos
+            if in_string:
+                self._string_start -= keep_from
+        self._buf = buf[keep_from:]
+        self._pos = pos - keep_from
+        self._depth = depth
+        self._in_string = in_string
+        return completed
+
+
+def iter_followers(chunks: Iterable[bytes], decode: Callable[[bytes], Any] = json.loads,
+                   fields: Optional[Sequence[str]] = LEADERBOARD_FIELDS) -> Iterator[Dict[str, Any]]:
+    """
+    Yield followers from a chunked ``vaultDetails`` body as they are parsed
+
+    Args:
+        chunks: Iterable of raw body chunks (e.g. response.iter_content())
+        decode: Decoder for each follower object
+        fields: Fields to keep from each follower (None keeps all)
+
+    Returns:
+        Iterator of (projected) follower dicts
+    """
+    parser = FollowerStreamParser(decode, fields)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
@@ -0,0 +1,220 @@
+"""
+Hyperliquid Latest Snapshot - Memory-mapped follower snapshot file
+
+The monitor (the collector) writes each vault's newest follower snapshot to
+``<snapshot dir>/<vault>.snap`` in a fixed binary layout. The dashboard and
+the CLI map that file with ``np.memmap`` and wrap the mapped bytes as the
+columns of a FollowerTable, so a page load neither fetches nor parses JSON
+and many sessions share one copy through the OS page cache.
+
+File layout (little-endian, every section 8-byte aligned)::
+
+    header   magic (8 bytes) | followers n (u64) | timestamp (f64) | meta length m (u64)
+    meta     m bytes of JSON vault metadata (vaultDetails without followers), padded
+    users    n x 20-byte addresses, padded
+    columns  equity, pnl, all_time_pnl, roi (n x f64 each), days (n x i64)
+
+Rows are stored in all-time PnL order, best first, so a default leaderboard
+is a slice of the mapped arrays. Files are written to a temporary name and
+renamed over the old one: a reader maps either the old or the new file,
+never a partial one, and keeps its mapping valid after the rename.
+
+Usage:
+    python hyperliquid_latest.py <file.snap> [--top 10]
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from hyperliquid_address import ADDRESSES, ADDRESS_DTYPE, NO_ADDRESS
+from hyperliquid_table import FollowerTable
+
+
+DEFAULT_SNAPSHOT_DIR = 'snapshots'
+MAGIC = b'HLSNAP\x00\x01'
+HEADER = struct.Struct('<8sQdQ')
+
+# FollowerTable column -> stored dtype, in file order
+COLUMNS = {
+    'equity': np.dtype('<f8'),
+    'pnl': np.dtype('<f8'),
+    'all_time_pnl': np.dtype('<f8'),
+    'roi': np.dtype('<f8'),
+    'days': np.dtype('<i8'),
+}
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def snapshot_path(vault_address: str, directory: str = DEFAULT_SNAPSHOT_DIR) -> str:
+    """Where the latest snapshot of a vault lives"""
+    return os.path.join(directory, f"{vault_address.lower()}.snap")
+
+
+def write_snapshot(path: str, vault_data: Dict[str, Any], followers: FollowerTable,
+                   timestamp: Optional[float] = None) -> int:
+    """
+    Atomically replace a snapshot file
+
+    Args:
+        path: Target file
+        vault_data: vaultDetails response; everything but ``followers`` is
+            stored as metadata
+        followers: Parsed followers (any order; stored best all-time PnL first)
+        timestamp: Snapshot time (default: now)
+
+    Returns:
+        Bytes written
+    """
+    followers = followers[followers.user_ids != NO_ADDRESS].sort('pnl')
+    meta = json.dumps({k: v for k, v in vault_data.items() if k != 'followers'},
+                      separators=(',', ':'), default=str).encode('utf-8')
+    timestamp = time.time() if timestamp is None else timestamp
+    users = ADDRESSES.packed(followers.user_ids).tobytes()
+
+    parts = [HEADER.pack(MAGIC, len(followers), timestamp, len(meta)),
+             meta.ljust(_padded(len(meta)), b'\0'),
+             users.ljust(_padded(len(users)), b'\0')]
+    parts += [np.ascontiguousarray(getattr(followers, column), dtype=dtype).tobytes()
+              for column, dtype in COLUMNS.items()]
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        for part in parts:
+            f.write(part)
+        f.flush()
+        os.fsync(f.fileno())
+    try:
+        os.replace(temp_path, path)
+    except PermissionError:
+        # Windows refuses to replace a file that a reader still has mapped;
+        # keep the previous snapshot and try again on the next write
+        os.remove(temp_path)
+        return 0
+    return sum(len(part) for part in parts)
+
+
+class MappedSnapshot:
+    """Read-only view of a snapshot file
+
+    ``equity``, ``pnl``, ``all_time_pnl``, ``roi`` and ``days`` are NumPy
+    arrays over the mapped file and ``users`` is the ``S20`` address array;
+    nothing is copied until a caller asks for it. The mapping stays valid
+    after the collector replaces the file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Snapshot file written by write_snapshot
+
+        Raises:
+            OSError: The file cannot be opened
+            ValueError: Not a snapshot file, or truncated
+        """
+        self.path = path
+        data = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is not a follower snapshot")
+        magic, count, self.timestamp, meta_size = HEADER.unpack(data[:HEADER.size].tobytes())
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a follower snapshot")
+
+        offset = HEADER.size
+        self.vault_data = json.loads(data[offset:offset + meta_size].tobytes())
+        offset += _padded(meta_size)
+        users_size = count * ADDRESS_DTYPE.itemsize
+        end = offset + _padded(users_size) + count * sum(dtype.itemsize for dtype in COLUMNS.values())
+        if len(data) < end:
+            raise ValueError(f"{path} is truncated")
+
+        self.users = data[offset:offset + users_size].view(ADDRESS_DTYPE)
+        offset += _padded(users_size)
+        for column, dtype in COLUMNS.items():
+            size = count * dtype.itemsize
+            setattr(self, column, data[offset:offset + size].view(dtype))
+            offset += size
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken"""
+        return time.time() - self.timestamp
+
+    def table(self) -> FollowerTable:
+        """
+        FollowerTable over the mapped columns
+
+        Only the addresses are processed (interned to IDs); the numeric
+        columns are the mapped arrays themselves.
+        """
+        return FollowerTable(
+            user_ids=ADDRESSES.intern_packed(self.users),
+            equity=self.equity,
+            pnl=self.pnl,
+            all_time_pnl=self.all_time_pnl,
+            days=self.days,
+            roi=self.roi,
+        )
+
+
+def open_snapshot(vault_address: str, directory: str = DEFAULT_SNAPSHOT_DIR,
+                  max_age: Optional[float] = None) -> Optional[MappedSnapshot]:
+    """
+    Map the latest snapshot of a vault if there is a usable one
+
+    Args:
+        vault_address: Vault address
+        directory: Snapshot directory the collector writes to
+        max_age: Ignore snapshots older than this many seconds
+
+    Returns:
+        MappedSnapshot, or None when missing, unreadable or too old
+    """
+    try:
+        snapshot = MappedSnapshot(snapshot_path(vault_address, directory))
+    except (OSError, ValueError):
+        return None
+    if max_age is not None and snapshot.age > max_age:
+        return None
+    return snapshot
+
+
+def main():
+    from hyperliquid_api_example import format_vault_data, format_leaderboard_entry
+
+    if len(sys.argv) < 2 or sys.argv[1].startswith('--'):
+        print(__doc__)
+        sys.exit(1)
+    top_n = 10
+    if "--top" in sys.argv:
+        try:
+            top_n = int(sys.argv[sys.argv.index("--top") + 1])
+        except (IndexError, ValueError):
+            print("⚠️  Invalid top value, using default: 10")
+
+    started = time.perf_counter()
+    snapshot = MappedSnapshot(sys.argv[1])
+    leaderboard = snapshot.table()[:top_n]
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print(format_vault_data(snapshot.vault_data))
+    print(f"📂 {len(snapshot)} followers, taken {snapshot.age:.0f}s ago, mapped in {elapsed:.2f}ms\n")
+    for rank, entry in enumerate(leaderboard, 1):
+        print(format_leaderboard_entry(entry, rank))
+
+
+if __name__ == "__main__":
+    main()
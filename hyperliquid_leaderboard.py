@@ -0,0 +1,96 @@
+"""
+Hyperliquid Leaderboard - Ranking vault followers into leaderboards
+
+rank_followers filters and sorts one vault's followers, merge_leaderboards
+combines per-vault leaderboards into a global top-K. Both the sync and the
+async client import them from here.
+"""
+
+import heapq
+from itertools import islice
+from typing import Dict, List, Any
+
+from hyperliquid_table import FollowerTable
+
+
+SORT_KEYS = {
+    'pnl': lambda x: float(x.get('allTimePnl', 0)),
+    'roi': lambda x: (float(x.get('allTimePnl', 0)) / float(x.get('vaultEquity', 1))) * 100 if float(x.get('vaultEquity', 0)) > 0 else 0,
+    'equity': lambda x: float(x.get('vaultEquity', 0)),
+    'days': lambda x: int(x.get('daysFollowing', 0))
+}
+
+
+def sort_key_for(sort_by: str):
+    """Sort key function for a leaderboard metric (defaults to PnL)"""
+    return SORT_KEYS.get(sort_by.lower(), SORT_KEYS['pnl'])
+
+
+def rank_followers(followers, sort_by: str = 'pnl',
+                   min_equity: float = None, min_roi: float = None,
+                   top_n: int = None) -> FollowerTable:
+    """
+    Filter and sort raw vault followers into a leaderboard
+
+    Shared by HyperliquidAPI and AsyncHyperliquidAPI so both clients rank identically.
+
+    Args:
+        followers: Raw follower dicts from a vaultDetails response, or a FollowerTable
+        sort_by: Sort metric ('pnl', 'roi', 'equity', 'days')
+        min_equity: Minimum equity filter
+        min_roi: Minimum ROI filter (in percentage)
+        top_n: Only select the best N followers (partial selection, no full
+            sort); None sorts every follower
+
+    Returns:
+        FollowerTable sorted by the metric, best first. ``total`` is the
+        number of followers that passed the filters.
+    """
+    table = FollowerTable.from_followers(followers)
+    print(f"Creating leaderboard from {len(table)} vault followers...")
+
+    # Apply filters (vectorised over the parsed columns)
+    if min_equity is not None:
+        table = table.filter(min_equity=min_equity)
+        print(f"Filtered to {len(table)} followers with equity >= ${min_equity:,.2f}")
+
+    if min_roi is not None:
+        table = table.filter(min_roi=min_roi)
+        print(f"Filtered to {len(table)} followers with ROI >= {min_roi:.2f}%")
+
+    # Sort by specified metric
+    if top_n is not None:
+        return table.top(top_n, sort_by)
+    return table.sort(sort_by)
+
+
+def merge_leaderboards(leaderboards: Dict[str, List[Dict[str, Any]]], sort_by: str = 'pnl',
+                       top_k: int = 100) -> List[Dict[str, Any]]:
+    """
+    K-way merge per-vault leaderboards into one global top-K
+
+    Each input list must already be sorted by ``sort_by`` (as returned by
+    rank_followers). Only the first ``top_k`` merged entries are visited, so
+    the cost is O(top_k * log(number of vaults)) instead of concatenating and
+    re-sorting every follower.
+
+    Args:
+        leaderboards: Mapping of vault address to its ranked followers
+        sort_by: Sort metric the inputs are ranked by
+        top_k: Number of global entries to return
+
+    Returns:
+        Top-K entries, each a copy of the follower dict tagged with 'vault'
+    """
+    def tagged(vault_address, leaderboard):
+        for follower in leaderboard:
+            entry = dict(follower)
+            entry['vault'] = vault_address
+            yield entry
+
+    merged = heapq.merge(
+        *(tagged(vault, leaderboard) for vault, leaderboard in leaderboards.items()),
+        key=sort_key_for(sort_by),
+        reverse=True
+    )
+    return list(islice(merged, top_k))
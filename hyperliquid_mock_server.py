@@ -0,0 +1,595 @@
+"""
+Hyperliquid Mock Server - Local stand-in for the /info endpoint
+
+Serves ``vaultDetails``, ``portfolio``, ``userVaultEquities`` and ``meta``
+either from a RecordingTransport JSONL file or from seeded synthetic
+generators, so benchmarks and load tests never touch mainnet. Latency, error
+rate and the per-IP weight limit are configurable; throttled requests get a
+429 with ``Retry-After`` just like the real API.
+
+Usage:
+    python hyperliquid_mock_server.py [--port 8787] [--replay recording.jsonl]
+        [--followers 500] [--latency-ms 50] [--jitter-ms 20]
+        [--error-rate 0.02] [--rate-limit 1200] [--seed 42]
+        [--stream-port 8788] [--push-interval 1] [--drop-after 30] [--skip-rate 0.05]
+
+    python hyperliquid_api_example.py --live --base-url http://127.0.0.1:8787/info
+
+With ``--stream-port`` a websocket at ``ws://host:port/ws`` pushes follower
+changes instead of every ``vaultDetails`` call changing the data:
+
+    python hyperliquid_api_example.py --live --base-url http://127.0.0.1:8787/info \\
+        --stream ws://127.0.0.1:8788/ws
+"""
+
+import asyncio
+import gzip
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple
+
+from aiohttp import web, WSMsgType
+
+from hyperliquid_cache import canonical_key
+from hyperliquid_ratelimit import endpoint_weight
+from hyperliquid_transport import load_recordings
+
+
+HLP_VAULT = "0xdfc24b077bc1425ad1dea75bcb6f8158e10df303"
+
+PORTFOLIO_PERIODS = ('day', 'week', 'month', 'allTime')
+META_COINS = ('BTC', 'ETH', 'SOL', 'HYPE', 'ARB', 'DOGE', 'AVAX', 'SUI')
+
+
+def _address(rng: random.Random) -> str:
+    return '0x' + ''.join(rng.choice('0123456789abcdef') for _ in range(40))
+
+
+class SyntheticMarket:
+    """Seeded generator of plausible info responses
+
+    Each vault gets ``num_followers`` followers the first time it is asked
+    for. Every step moves a ``drift`` fraction of them (equity and PnL random
+    walk, occasional joins and exits), so a live monitor pointed at the mock
+    server sees realistic churn. Steps happen on each ``vaultDetails`` call
+    or, for push streams, on each ``tick()``.
+    """
+
+    def __init__(self, num_followers: int = 500, seed: int = 42, drift: float = 0.05,
+                 step_on_read: bool = True):
+        """
+        Args:
+            num_followers: Followers generated per vault
+            seed: Seed for reproducible data
+            drift: Fraction of followers updated per step
+            step_on_read: Step on every vaultDetails call; turn off when a
+                MockStreamServer drives the changes with tick()
+        """
+        self.num_followers = num_followers
+        self.seed = seed
+        self.drift = drift
+        self.step_on_read = step_on_read
+        self._lock = threading.Lock()
+        self._vaults = {}
+
+    def _new_follower(self, rng: random.Random, now_ms: int) -> Dict[str, Any]:
+        equity = rng.uniform(10, 5_000_000)
+        days = rng.randint(1, 900)
+        return {
+            'user': _address(rng),
+            'vaultEquity': equity,
+            'pnl': rng.uniform(-0.1, 0.4) * equity,
+            'allTimePnl': rng.uniform(-0.1, 1.2) * equity,
+            'daysFollowing': days,
+            'vaultEntryTime': now_ms - days * 86_400_000,
+            'lockupUntil': now_ms - days * 86_400_000 + 4 * 86_400_000,
+        }
+
+    def _vault(self, address: str) -> Dict[str, Any]:
+        vault = self._vaults.get(address)
+        if vault is None:
+            rng = random.Random(f"{self.seed}:{address}")
+            now_ms = int(time.time() * 1000)
+            vault = self._vaults[address] = {
+                'rng': rng,
+                'name': 'Hyperliquidity Provider (HLP)' if address == HLP_VAULT else f"Vault {address[:8]}",
+                'leader': _address(rng),
+                'apr': rng.uniform(0.02, 0.4),
+                'followers': [self._new_follower(rng, now_ms) for _ in range(self.num_followers)],
+                'seq': 0,
+            }
+        return vault
+
+    def _step(self, vault: Dict[str, Any]) -> Tuple[list, list]:
+        """Move a ``drift`` fraction of followers; returns (changed followers, removed users)"""
+        rng = vault['rng']
+        followers = vault['followers']
+        if not followers:
+            return [], []
+        now_ms = int(time.time() * 1000)
+        changed, removed = {}, []
+        for _ in range(max(1, int(len(followers) * self.drift))):
+            i = rng.randrange(len(followers))
+            roll = rng.random()
+            if roll < 0.01:
+                removed.append(followers[i]['user'])
+                changed.pop(followers[i]['user'], None)
+                followers[i] = self._new_follower(rng, now_ms)
+            else:
+                f = followers[i]
+                delta = f['vaultEquity'] * rng.gauss(0, 0.002)
+                f['vaultEquity'] = max(0.0, f['vaultEquity'] + delta)
+                f['pnl'] += delta
+                f['allTimePnl'] += delta
+            changed[followers[i]['user']] = followers[i]
+        vault['seq'] += 1
+        return [self._format(f) for f in changed.values()], removed
+
+    @staticmethod
+    def _format(follower: Dict[str, Any]) -> Dict[str, Any]:
+        # The real API sends decimal strings for amounts
+        return {**follower, 'vaultEquity': f"{follower['vaultEquity']:.6f}",
+                'pnl': f"{follower['pnl']:.6f}", 'allTimePnl': f"{follower['allTimePnl']:.6f}"}
+
+    def tick(self, address: str) -> Dict[str, Any]:
+        """Advance a vault one step and return the change as a push message body"""
+        with self._lock:
+            vault = self._vault(address)
+            updates, removed = self._step(vault)
+            return {
+                'vault': address,
+                'seq': vault['seq'],
+                'time': int(time.time() * 1000),
+                'updates': updates,
+                'removed': removed,
+            }
+
+    def vault_details(self, address: str) -> Dict[str, Any]:
+        with self._lock:
+            vault = self._vault(address)
+            if self.step_on_read:
+                self._step(vault)
+            return {
+                'name': vault['name'],
+                'vaultAddress': address,
+                'leader': vault['leader'],
+                'description': 'Synthetic vault served by hyperliquid_mock_server',
+                'apr': vault['apr'],
+                'isClosed': False,
+                'followers': [self._format(f) for f in vault['followers']],
+                # Push sequence number this state corresponds to, so stream
+                # clients can drop pushes the snapshot already contains
+                'seq': vault['seq'],
+            }
+
+    def portfolio(self, user: str) -> list:
+        rng = random.Random(f"{self.seed}:portfolio:{user}")
+        now_ms = int(time.time() * 1000)
+        spans = {'day': 86_400_000, 'week': 7 * 86_400_000, 'month': 30 * 86_400_000,
+                 'allTime': 365 * 86_400_000}
+        value = rng.uniform(100, 2_000_000)
+        result = []
+        for period in PORTFOLIO_PERIODS:
+            step = spans[period] // 24
+            account, pnl, total = [], [], 0.0
+            for i in range(25):
+                ts = now_ms - spans[period] + i * step
+                change = value * rng.gauss(0, 0.01)
+                total += change
+                account.append([ts, f"{value + total:.2f}"])
+                pnl.append([ts, f"{total:.2f}"])
+            result.append([period, {
+                'accountValueHistory': account,
+                'pnlHistory': pnl,
+                'vlm': f"{rng.uniform(0, 50 * value):.2f}",
+            }])
+        return result
+
+    def user_vault_equities(self, user: str) -> list:
+        rng = random.Random(f"{self.seed}:equities:{user}")
+        with self._lock:
+            addresses = list(self._vaults) or [HLP_VAULT]
+        return [
+            {'vaultAddress': address, 'equity': f"{rng.uniform(10, 250_000):.6f}"}
+            for address in addresses[:rng.randint(1, max(1, len(addresses)))]
+        ]
+
+    def meta(self) -> Dict[str, Any]:
+        return {
+            'universe': [
+                {'name': coin, 'szDecimals': 5 - i % 4, 'maxLeverage': 50 if i < 2 else 20}
+                for i, coin in enumerate(META_COINS)
+            ]
+        }
+
+    def respond(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        """Return (status, body object) for an info payload"""
+        request_type = payload.get('type')
+        if request_type == 'vaultDetails' and payload.get('vaultAddress'):
+            return 200, self.vault_details(payload['vaultAddress'].lower())
+        if request_type == 'portfolio' and payload.get('user'):
+            return 200, self.portfolio(payload['user'].lower())
+        if request_type == 'userVaultEquities' and payload.get('user'):
+            return 200, self.user_vault_equities(payload['user'].lower())
+        if request_type == 'meta':
+            return 200, self.meta()
+        return 422, {'error': f"Failed to deserialize the JSON body: unsupported request {request_type!r}"}
+
+
+class MockInfoServer:
+    """Threaded HTTP/1.1 mock of ``POST /info``
+
+    Responses come from ``recordings_path`` when the payload was recorded
+    (cycling through repeated recordings) and from SyntheticMarket otherwise.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 recordings_path: Optional[str] = None, market: Optional[SyntheticMarket] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: Optional[float] = None, seed: Optional[int] = None):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            recordings_path: JSONL file written by RecordingTransport
+            market: Synthetic generator for payloads without a recording
+            latency_ms: Base delay added to every response
+            jitter_ms: Uniform random extra delay on top of latency_ms
+            error_rate: Probability of answering with a 500/502/503
+            rate_limit: Weight per minute before answering 429 (None = unlimited)
+            seed: Seed for latency/error randomness
+        """
+        self.market = market or SyntheticMarket()
+        self.recordings = load_recordings(recordings_path) if recordings_path else {}
+        self._cursors = {key: itertools.cycle(records) for key, records in self.recordings.items()}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self._tokens = rate_limit or 0.0
+        self._updated = time.monotonic()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.replayed = 0
+        self.by_type = {}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Info endpoint URL to pass as HyperliquidAPI(base_url=...)"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/info"
+
+    def _take(self, weight: float) -> float:
+        """Spend ``weight`` from the per-minute budget; returns seconds until it fits (0 = accepted)"""
+        with self._lock:
+            now = time.monotonic()
+            refill = self.rate_limit / 60.0
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._updated) * refill)
+            self._updated = now
+            if self._tokens >= weight:
+                self._tokens -= weight
+                return 0.0
+            return (weight - self._tokens) / refill
+
+    def _next_recording(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        cursor = self._cursors.get(canonical_key(payload))
+        if cursor is None:
+            return None
+        with self._lock:
+            return next(cursor)
+
+    def handle(self, payload: Dict[str, Any]) -> Tuple[int, bytes, Dict[str, str]]:
+        """Produce (status, body, headers) for one request"""
+        request_type = payload.get('type')
+        with self._lock:
+            self.requests += 1
+            self.by_type[request_type] = self.by_type.get(request_type, 0) + 1
+            delay = (self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000
+            fail = self._rng.random() < self.error_rate
+            status = self._rng.choice((500, 502, 503)) if fail else 200
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.rate_limit:
+            wait = self._take(endpoint_weight(request_type))
+            if wait > 0:
+                with self._lock:
+                    self.throttled += 1
+                return 429, b'{"error":"rate limited"}', {'Retry-After': str(max(1, round(wait)))}
+
+        if fail:
+            with self._lock:
+                self.errors += 1
+            return status, b'{"error":"internal error"}', {}
+
+        record = self._next_recording(payload)
+        if record is not None:
+            with self._lock:
+                self.replayed += 1
+            return record['status'], record['body'].encode('utf-8'), dict(record.get('headers') or {})
+
+        status, body = self.market.respond(payload)
+        return status, json.dumps(body, separators=(',', ':')).encode(), {}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                if self.path.rstrip('/') != '/info':
+                    self._reply(404, b'{"error":"not found"}', {})
+                    return
+                raw = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                try:
+                    payload = json.loads(raw)
+                except ValueError:
+                    self._reply(400, b'{"error":"invalid JSON"}', {})
+                    return
+                self._reply(*server.handle(payload if isinstance(payload, dict) else {}))
+
+            def _reply(self, status: int, body: bytes, headers: Dict[str, str]):
+                use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '') and len(body) > 512
+                if use_gzip:
+                    body = gzip.compress(body, compresslevel=5)
+                self.send_response(status)
+                self.send_header('Content-Type', headers.pop('Content-Type', 'application/json'))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if use_gzip:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'MockInfoServer':
+        """Serve in a daemon thread and return self"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'throttled': self.throttled,
+                'replayed': self.replayed,
+                'by_type': dict(self.by_type),
+            }
+
+
+class MockStreamServer:
+    """Websocket server pushing synthetic ``vaultFollowers`` updates
+
+    Speaks the Hyperliquid websocket message format: clients send
+    ``{"method": "subscribe", "subscription": {"type": "vaultFollowers",
+    "vault": ...}}`` and ``{"method": "ping"}``, and receive
+    ``subscriptionResponse``, ``pong`` and ``vaultFollowers`` messages. Each
+    push carries the vault's sequence number, the changed followers and the
+    users who left. Share the SyntheticMarket with a MockInfoServer (with
+    ``step_on_read=False``) so REST snapshots and pushes describe the same
+    state.
+    """
+
+    def __init__(self, market: SyntheticMarket, host: str = '127.0.0.1', port: int = 0,
+                 push_interval: float = 1.0, drop_after: Optional[int] = None,
+                 skip_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Args:
+            market: Synthetic generator advanced once per push
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            push_interval: Seconds between pushes per subscribed vault
+            drop_after: Close each connection after this many pushes, to
+                exercise client reconnects
+            skip_rate: Probability of silently dropping a push, to exercise
+                client gap detection
+            seed: Seed for the skip randomness
+        """
+        self.market = market
+        self.host = host
+        self.port = port
+        self.push_interval = push_interval
+        self.drop_after = drop_after
+        self.skip_rate = skip_rate
+        self._rng = random.Random(seed)
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._sockets = set()
+
+        self.connections = 0
+        self.pushes = 0
+        self.skipped = 0
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/ws"
+
+    async def _push(self, ws: web.WebSocketResponse, vault_address: str):
+        sent = 0
+        while not ws.closed:
+            await asyncio.sleep(self.push_interval)
+            data = self.market.tick(vault_address)
+            if self._rng.random() < self.skip_rate:
+                self.skipped += 1
+                continue
+            await ws.send_str(json.dumps({'channel': 'vaultFollowers', 'data': data},
+                                         separators=(',', ':')))
+            self.pushes += 1
+            sent += 1
+            if self.drop_after and sent >= self.drop_after:
+                await ws.close()
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        self._sockets.add(ws)
+        pushers = []
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    message = json.loads(msg.data)
+                except ValueError:
+                    await ws.send_json({'channel': 'error', 'data': 'invalid JSON'})
+                    continue
+                method = message.get('method')
+                subscription = message.get('subscription') or {}
+                if method == 'ping':
+                    await ws.send_json({'channel': 'pong'})
+                elif method == 'subscribe' and subscription.get('type') == 'vaultFollowers':
+                    await ws.send_json({'channel': 'subscriptionResponse', 'data': message})
+                    vault_address = subscription.get('vault', HLP_VAULT).lower()
+                    pushers.append(asyncio.ensure_future(self._push(ws, vault_address)))
+                else:
+                    await ws.send_json({'channel': 'error', 'data': f"unsupported message {msg.data}"})
+        finally:
+            self._sockets.discard(ws)
+            for pusher in pushers:
+                pusher.cancel()
+            await asyncio.gather(*pushers, return_exceptions=True)
+        return ws
+
+    def _serve(self):
+        loop = self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_get('/ws', self._handle)
+        self._runner = web.AppRunner(app)
+        loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, self.host, self.port)
+        loop.run_until_complete(site.start())
+        self.port = self._runner.addresses[0][1]
+        self._ready.set()
+        loop.run_forever()
+        loop.close()
+
+    async def _shutdown(self):
+        for ws in list(self._sockets):
+            await ws.close()
+        await self._runner.cleanup()
+        asyncio.get_running_loop().stop()
+
+    def start(self) -> 'MockStreamServer':
+        """Serve in a daemon thread and return self once listening"""
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        loop, self._loop = self._loop, None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop)
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'connections': self.connections, 'pushes': self.pushes, 'skipped': self.skipped}
+
+
+def _arg(name: str, default, cast=int):
+    if name in sys.argv:
+        try:
+            return cast(sys.argv[sys.argv.index(name) + 1])
+        except (IndexError, ValueError):
+            print(f"⚠️  Invalid {name} value, using default: {default}")
+    return default
+
+
+def main():
+    stream_port = _arg('--stream-port', None)
+    market = SyntheticMarket(
+        num_followers=_arg('--followers', 500),
+        seed=_arg('--seed', 42),
+        drift=_arg('--drift', 0.05, float),
+        step_on_read=stream_port is None,
+    )
+    server = MockInfoServer(
+        host=_arg('--host', '127.0.0.1', str),
+        port=_arg('--port', 8787),
+        recordings_path=_arg('--replay', None, str),
+        market=market,
+        latency_ms=_arg('--latency-ms', 0.0, float),
+        jitter_ms=_arg('--jitter-ms', 0.0, float),
+        error_rate=_arg('--error-rate', 0.0, float),
+        rate_limit=_arg('--rate-limit', None, float),
+        seed=_arg('--seed', 42),
+    )
+
+    print(f"🧪 Mock Hyperliquid info server on {server.url}")
+    if server.recordings:
+        print(f"   Replaying {sum(len(r) for r in server.recordings.values())} recorded responses")
+    limit = f"{server.rate_limit:g} weight/min" if server.rate_limit else "unlimited"
+    print(f"   {market.num_followers} synthetic followers per vault, latency {server.latency_ms:g}ms "
+          f"(+{server.jitter_ms:g}ms jitter), error rate {server.error_rate:.1%}, rate limit {limit}")
+
+    stream = None
+    if stream_port is not None:
+        stream = MockStreamServer(
+            market,
+            host=_arg('--host', '127.0.0.1', str),
+            port=stream_port,
+            push_interval=_arg('--push-interval', 1.0, float),
+            drop_after=_arg('--drop-after', None),
+            skip_rate=_arg('--skip-rate', 0.0, float),
+            seed=_arg('--seed', 42),
+        ).start()
+        print(f"📡 Pushing vaultFollowers updates on {stream.url} every {stream.push_interval:g}s")
+
+    print("   Press Ctrl+C to stop")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {server.stats()}")
+        if stream:
+            print(f"📊 {stream.stats()}")
+    finally:
+        server.httpd.server_close()
+        if stream:
+            stream.stop()
+
+
+if __name__ == "__main__":
+    main()
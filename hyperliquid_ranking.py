@@ -0,0 +1,221 @@
+"""
+Hyperliquid Ranking - Incrementally maintained follower rankings
+
+Between two refreshes only a few followers of a vault change, yet ranking
+from scratch re-parses and re-sorts all of them. IncrementalRanking keeps one
+``SortedList`` per metric (pnl, roi, equity, days), keyed by interned
+address ID (see hyperliquid_address), and applies only the rows that differ from the previous refresh. Top-N,
+rank-of-user and rank-range queries then cost O(log n) plus the rows
+returned, for any metric, so switching the sort order needs no re-sort.
+"""
+
+from itertools import islice
+from typing import Dict, Any, Iterable, Optional, Tuple, Union
+
+from sortedcontainers import SortedList
+
+from hyperliquid_address import ADDRESSES, NO_ADDRESS
+from hyperliquid_table import FollowerTable
+
+
+METRICS = ('pnl', 'roi', 'equity', 'days')
+
+
+def metric_values(follower: Dict[str, Any]) -> Tuple[float, float, float, int]:
+    """(pnl, roi, equity, days) of one follower dict, parsed like FollowerTable"""
+    equity = float(follower.get('vaultEquity') or 0)
+    all_time_pnl = float(follower.get('allTimePnl') or 0)
+    roi = all_time_pnl / equity * 100 if equity > 0 else 0.0
+    return all_time_pnl, roi, equity, int(follower.get('daysFollowing') or 0)
+
+
+class IncrementalRanking:
+    """Per-metric rankings of one vault's followers, updated by diff
+
+    Each metric's SortedList holds ``(-value, order, user_id)``, so iterating it
+    yields followers best first. ``order`` is a per-user sequence number
+    assigned when the user is first seen, so ties break deterministically by
+    seniority in the ranking - the same as rank_followers' stable sort for
+    as long as the API keeps followers in arrival order - and a follower
+    joining or leaving never re-ranks anyone else.
+
+    Ranks are 1-based and count every follower; the ``min_equity`` /
+    ``min_roi`` filters only apply to ``top()``.
+    """
+
+    def __init__(self, followers: Iterable[Dict[str, Any]] = ()):
+        self._lists = {metric: SortedList() for metric in METRICS}
+        self._rows = {}
+        self._values = {}
+        self._order = {}
+        self._next_order = 0
+
+        self.updates = 0
+        self.last_changed = 0
+        self.last_removed = 0
+        self.apply(followers)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, user: Union[str, int]) -> bool:
+        return self._user_id(user) in self._rows
+
+    @staticmethod
+    def _user_id(user: Union[str, int]) -> Optional[int]:
+        return ADDRESSES.lookup(user) if isinstance(user, str) else int(user)
+
+    def _assign_order(self, user: int) -> int:
+        order = self._order.get(user)
+        if order is None:
+            order = self._order[user] = self._next_order
+            self._next_order += 1
+        return order
+
+    def _remove(self, user: int, forget: bool = True):
+        values = self._values.pop(user)
+        order = self._order.pop(user) if forget else self._order[user]
+        for metric, value in zip(METRICS, values):
+            self._lists[metric].remove((-value, order, user))
+        del self._rows[user]
+
+    def _insert(self, user: int, follower: Dict[str, Any]):
+        order = self._assign_order(user)
+        values = metric_values(follower)
+        for metric, value in zip(METRICS, values):
+            self._lists[metric].add((-value, order, user))
+        self._values[user] = values
+        self._rows[user] = follower
+
+    def _rebuild(self, followers: list):
+        """Replace everything, bulk-sorting each metric once (first load / mass change)"""
+        self._rows = {user: follower for user, follower
+                      in zip(ADDRESSES.intern_many(f['user'] for f in followers).tolist(), followers)
+                      if user != NO_ADDRESS}
+        self._order = {user: self._assign_order(user) for user in self._rows}
+        self._values = {user: metric_values(f) for user, f in self._rows.items()}
+        for i, metric in enumerate(METRICS):
+            self._lists[metric] = SortedList(
+                (-values[i], self._order[user], user) for user, values in self._values.items()
+            )
+
+    def update(self, changed: Iterable[Dict[str, Any]] = (), removed: Iterable[str] = ()) -> int:
+        """
+        Apply known changes (e.g. a stream push) without diffing
+
+        Args:
+            changed: Full follower dicts that were added or changed
+            removed: Addresses (or address IDs) of followers that left the vault
+
+        Returns:
+            Number of rows re-ranked or removed
+        """
+        count = 0
+        for user in removed:
+            user = self._user_id(user)
+            if user in self._rows:
+                self._remove(user)
+                count += 1
+        changed = list(changed)
+        for user, follower in zip(ADDRESSES.intern_many(f.get('user') for f in changed).tolist(), changed):
+            if user == NO_ADDRESS:
+                continue
+            if user in self._rows:
+                self._remove(user, forget=False)
+            self._insert(user, follower)
+            count += 1
+        return count
+
+    def apply(self, followers: Iterable[Dict[str, Any]]) -> int:
+        """
+        Bring the rankings in line with a full follower list
+
+        Only rows that differ from the stored ones are re-ranked; followers
+        missing from ``followers`` are removed.
+
+        Args:
+            followers: Every current follower dict (a vaultDetails response)
+
+        Returns:
+            Number of rows re-ranked or removed
+        """
+        followers = [f for f in followers if f.get('user')]
+        rows = self._rows
+        changed = []
+        seen = set()
+        for user, follower in zip(ADDRESSES.intern_many(f['user'] for f in followers).tolist(), followers):
+            if user == NO_ADDRESS:
+                continue
+            seen.add(user)
+            if rows.get(user) != follower:
+                changed.append(follower)
+        removed = [user for user in rows if user not in seen]
+
+        self.last_changed = len(changed)
+        self.last_removed = len(removed)
+        self.updates += 1
+        if len(changed) + len(removed) > len(rows) // 2:
+            # Most rows changed: one bulk sort beats that many single updates
+            for user in removed:
+                del self._order[user]
+            self._rebuild(followers)
+            return len(changed) + len(removed)
+        return self.update(changed, removed)
+
+    def _list(self, sort_by: str) -> SortedList:
+        return self._lists.get(sort_by.lower(), self._lists['pnl'])
+
+    def _table(self, entries, total: Optional[int] = None) -> FollowerTable:
+        table = FollowerTable.from_followers([self._rows[user] for _, _, user in entries])
+        if total is not None:
+            table.total = total
+        return table
+
+    def count(self, min_equity: float = None, min_roi: float = None) -> int:
+        """Followers passing the filters (bisection when only one is set)"""
+        if min_equity is None and min_roi is None:
+            return len(self)
+        if min_roi is None:
+            return self._lists['equity'].bisect_right((-min_equity, float('inf')))
+        if min_equity is None:
+            return self._lists['roi'].bisect_right((-min_roi, float('inf')))
+        qualified = self._lists['equity'].islice(0, self._lists['equity'].bisect_right((-min_equity, float('inf'))))
+        return sum(1 for _, _, user in qualified if self._values[user][1] >= min_roi)
+
+    def top(self, n: int, sort_by: str = 'pnl', min_equity: float = None,
+            min_roi: float = None) -> FollowerTable:
+        """
+        Best ``n`` followers by a metric
+
+        Args:
+            n: Number of followers to return
+            sort_by: Sort metric ('pnl', 'roi', 'equity', 'days')
+            min_equity: Minimum equity filter
+            min_roi: Minimum ROI filter (in percentage)
+
+        Returns:
+            FollowerTable best first, with ``total`` set to the number of
+            followers passing the filters
+        """
+        entries = iter(self._list(sort_by))
+        if min_equity is not None or min_roi is not None:
+            entries = (
+                entry for entry in entries
+                if (min_equity is None or self._values[entry[2]][2] >= min_equity)
+                and (min_roi is None or self._values[entry[2]][1] >= min_roi)
+            )
+        return self._table(islice(entries, max(0, n)), self.count(min_equity, min_roi))
+
+    def rank_of(self, user: Union[str, int], sort_by: str = 'pnl') -> Optional[int]:
+        """1-based rank of a follower (address or address ID), or None if it is not in the vault"""
+        user = self._user_id(user)
+        values = self._values.get(user)
+        if values is None:
+            return None
+        metric = sort_by.lower() if sort_by.lower() in self._lists else 'pnl'
+        value = values[METRICS.index(metric)]
+        return self._lists[metric].index((-value, self._order[user], user)) + 1
+
+    def between(self, first: int, last: int, sort_by: str = 'pnl') -> FollowerTable:
+        """Followers ranked ``first`` to ``last`` inclusive (1-based)"""
+        return self._table(self._list(sort_by).islice(max(0, first - 1), max(0, last)))
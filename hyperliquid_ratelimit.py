@@ -0,0 +1,295 @@
+"""
+Hyperliquid Rate Limiter - Weighted token bucket shared across processes
+
+Hyperliquid limits REST traffic per IP by request *weight* (1200 per minute).
+Most info requests weigh 20, a handful of cheap ones weigh 2 and ``userRole``
+weighs 60. The live monitor, the Streamlit dashboard and cron exports all run
+from the same IP, so the bucket lives in a small SQLite file by default and
+every process on the host draws from the same budget.
+"""
+
+import asyncio
+import email.utils
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+# https://hyperliquid.gitbook.io/hyperliquid-docs/for-developers/api/rate-limits-and-user-limits
+IP_WEIGHT_PER_MINUTE = 1200
+DEFAULT_WEIGHT = 20
+ENDPOINT_WEIGHTS = {
+    'l2Book': 2,
+    'allMids': 2,
+    'clearinghouseState': 2,
+    'orderStatus': 2,
+    'spotClearinghouseState': 2,
+    'exchangeStatus': 2,
+    'userRole': 60,
+}
+
+DEFAULT_STATE_PATH = os.path.join(tempfile.gettempdir(), 'hyperliquid_ratelimit.db')
+
+
+def endpoint_weight(request_type: Optional[str]) -> int:
+    """Return the rate-limit weight of an info request type"""
+    return ENDPOINT_WEIGHTS.get(request_type, DEFAULT_WEIGHT)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0,
+                  retry_after: Optional[float] = None) -> float:
+    """
+    Exponential backoff with full jitter
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay scale for the first retry
+        cap: Upper bound on the jittered delay
+        retry_after: Server-provided Retry-After seconds, honoured as a floor
+
+    Returns:
+        Seconds to wait before retrying
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        # Never retry earlier than the server asked; add a little jitter so
+        # every waiting process does not return in the same instant.
+        delay = retry_after + random.uniform(0, base)
+    return delay
+
+
+class RateLimiter:
+    """Weighted token bucket with reservation semantics
+
+    ``reserve()`` takes the tokens immediately (the balance may go negative)
+    and returns how long the caller must wait before sending. Callers never
+    poll, and waiters are served in arrival order. With ``state_path`` set the
+    balance is kept in SQLite and updated inside ``BEGIN IMMEDIATE``
+    transactions, which serialises every process on the host. When the state
+    file cannot be used (e.g. still locked after the busy timeout) an update
+    falls back to an in-process bucket that continues from the last shared
+    balance, so callers never see a sqlite3 error.
+    """
+
+    def __init__(self, capacity: float = IP_WEIGHT_PER_MINUTE,
+                 refill_per_second: float = IP_WEIGHT_PER_MINUTE / 60.0,
+                 state_path: Optional[str] = DEFAULT_STATE_PATH, name: str = 'info'):
+        """
+        Args:
+            capacity: Maximum burst weight
+            refill_per_second: Sustained weight per second
+            state_path: SQLite file shared between processes; None keeps the
+                bucket in this process only
+            name: Bucket name, so several budgets can share one state file
+        """
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.state_path = state_path
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.time()
+        self._blocked_until = 0.0
+        self._conn = None
+
+        # Process-local metrics
+        self.requests = 0
+        self.throttled = 0
+        self.backoffs = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.fallbacks = 0
+
+        if state_path:
+            try:
+                self._conn = self._open(state_path, name)
+            except sqlite3.Error as e:
+                print(f"⚠️  Rate limit state {state_path} unavailable, limiting this process only: {e}")
+
+    def _open(self, state_path: str, name: str) -> sqlite3.Connection:
+        """Connect to the shared state file and create this bucket's row"""
+        conn = sqlite3.connect(state_path, timeout=10, isolation_level=None,
+                               check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL,
+                    updated REAL,
+                    blocked_until REAL
+                )
+            """)
+            conn.execute(
+                "INSERT OR IGNORE INTO buckets VALUES (?, ?, ?, 0)",
+                (name, self.capacity, time.time())
+            )
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def _update(self, func):
+        """Apply ``func(tokens, updated, blocked_until, now)`` atomically"""
+        with self._lock:
+            now = time.time()
+            if self._conn is not None:
+                try:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        tokens, updated, blocked_until = self._conn.execute(
+                            "SELECT tokens, updated, blocked_until FROM buckets WHERE name = ?",
+                            (self.name,)
+                        ).fetchone()
+                        tokens, updated, blocked_until, value = func(tokens, updated, blocked_until, now)
+                        self._conn.execute(
+                            "UPDATE buckets SET tokens = ?, updated = ?, blocked_until = ? WHERE name = ?",
+                            (tokens, updated, blocked_until, self.name)
+                        )
+                        self._conn.execute("COMMIT")
+                    except BaseException:
+                        if self._conn.in_transaction:
+                            self._conn.execute("ROLLBACK")
+                        raise
+                except sqlite3.Error as e:
+                    # Shared state unusable right now: carry on from the last
+                    # shared balance in this process and retry it next time
+                    self.fallbacks += 1
+                    if self.fallbacks == 1:
+                        print(f"⚠️  Rate limit state {self.state_path} unavailable, "
+                              f"limiting this process only: {e}")
+                else:
+                    self._tokens, self._updated, self._blocked_until = tokens, updated, blocked_until
+                    return value
+
+            result = func(self._tokens, self._updated, self._blocked_until, now)
+            self._tokens, self._updated, self._blocked_until, value = result
+            return value
+
+    def _refill(self, tokens: float, updated: float, now: float) -> float:
+        return min(self.capacity, tokens + max(0.0, now - updated) * self.refill_per_second)
+
+    def reserve(self, weight: float) -> float:
+        """
+        Take ``weight`` tokens and return the seconds to wait before sending
+
+        Args:
+            weight: Request weight (see endpoint_weight)
+
+        Returns:
+            Wait time in seconds (0 when the budget is available now)
+        """
+        def take(tokens, updated, blocked_until, now):
+            tokens = self._refill(tokens, updated, now) - weight
+            wait = max(0.0, blocked_until - now)
+            if tokens < 0:
+                wait = max(wait, -tokens / self.refill_per_second)
+            return tokens, now, blocked_until, wait
+
+        wait = self._update(take)
+        with self._lock:
+            self.requests += 1
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def acquire(self, weight: float = DEFAULT_WEIGHT) -> float:
+        """Block until ``weight`` tokens are available; returns seconds waited"""
+        wait = self.reserve(weight)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def try_acquire(self, weight: float = DEFAULT_WEIGHT) -> bool:
+        """Take ``weight`` tokens only if they are available right now"""
+        def take_if_free(tokens, updated, blocked_until, now):
+            tokens = self._refill(tokens, updated, now)
+            if blocked_until > now or tokens < weight:
+                return tokens, now, blocked_until, False
+            return tokens - weight, now, blocked_until, True
+
+        taken = self._update(take_if_free)
+        if taken:
+            with self._lock:
+                self.requests += 1
+        return taken
+
+    async def acquire_async(self, weight: float = DEFAULT_WEIGHT) -> float:
+        """
+        Asyncio counterpart of acquire
+
+        The bucket update may wait up to the SQLite busy timeout for another
+        process, so it runs in the default executor instead of the event loop.
+        """
+        wait = await asyncio.get_running_loop().run_in_executor(None, self.reserve, weight)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def penalize(self, delay: float):
+        """
+        Pause every user of the bucket for ``delay`` seconds
+
+        Called after a 429/5xx so that other threads and processes back off
+        too, and empties the bucket so traffic ramps back up gradually.
+        """
+        def block(tokens, updated, blocked_until, now):
+            tokens = min(0.0, self._refill(tokens, updated, now))
+            return tokens, now, max(blocked_until, now + delay), None
+
+        self._update(block)
+        with self._lock:
+            self.backoffs += 1
+
+    async def penalize_async(self, delay: float):
+        """Asyncio counterpart of penalize (run in the default executor)"""
+        await asyncio.get_running_loop().run_in_executor(None, self.penalize, delay)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of bucket state and this process's wait statistics"""
+        def peek(tokens, updated, blocked_until, now):
+            state = (self._refill(tokens, updated, now), max(0.0, blocked_until - now))
+            return tokens, updated, blocked_until, state
+
+        tokens, blocked_for = self._update(peek)
+        return {
+            'tokens': round(tokens, 2),
+            'capacity': self.capacity,
+            'refill_per_second': self.refill_per_second,
+            'blocked_for': round(blocked_for, 3),
+            'shared': self._conn is not None,
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'backoffs': self.backoffs,
+            'total_wait': round(self.total_wait, 3),
+            'max_wait': round(self.max_wait, 3),
+            'fallbacks': self.fallbacks,
+        }
+
+    def close(self):
+        """Close the shared state connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
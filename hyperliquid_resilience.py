@@ -0,0 +1,200 @@
+"""
+Hyperliquid Resilience - Latency tracking, hedged requests and circuit breakers
+
+LatencyTracker keeps a rolling window of response times per info request
+type. HyperliquidAPI uses its p95 as the hedging threshold: when a request
+has not answered by then, an identical duplicate is sent and whichever
+response arrives first is used.
+
+CircuitBreaker stops sending a request type to the API after repeated
+failures. While a breaker is open the client serves the last cached response
+instead of waiting on timeouts; after ``reset_timeout`` one probe request is
+let through and its outcome closes or re-opens the breaker.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+from hyperliquid_transport import HyperliquidAPIError
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(HyperliquidAPIError):
+    """Raised instead of sending a request while its breaker is open"""
+
+
+class LatencyTracker:
+    """Rolling per-endpoint response time percentiles"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Args:
+            window: Samples kept per endpoint
+            min_samples: Samples required before percentile() returns a value
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def record(self, endpoint: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, endpoint: str, q: float = 0.95) -> Optional[float]:
+        """
+        Return the ``q`` quantile of recent latencies in seconds
+
+        Returns:
+            The latency, or None until ``min_samples`` responses were seen
+        """
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def metrics(self) -> Dict[str, Any]:
+        """p50/p95 in milliseconds per endpoint"""
+        with self._lock:
+            endpoints = {endpoint: sorted(samples) for endpoint, samples in self._samples.items()}
+        return {
+            endpoint: {
+                'samples': len(ordered),
+                'p50_ms': round(ordered[len(ordered) // 2] * 1000, 1),
+                'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+            }
+            for endpoint, ordered in endpoints.items() if ordered
+        }
+
+
+class _Breaker:
+    __slots__ = ('state', 'failures', 'opened_at', 'probing', 'trips')
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+
+
+class CircuitBreaker:
+    """Per-endpoint closed / open / half-open circuit breaker
+
+    ``failure_threshold`` consecutive failures open an endpoint's breaker.
+    After ``reset_timeout`` seconds the next ``allow()`` moves it to half-open
+    and lets exactly one probe through; success closes it, failure opens it
+    again for another ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds to stay open before probing
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+        self.rejected = 0
+        self.served_stale = 0
+
+    def _get(self, endpoint: str) -> _Breaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = _Breaker()
+        return breaker
+
+    def allow(self, endpoint: str) -> bool:
+        """True if a request to ``endpoint`` may be sent now"""
+        with self._lock:
+            breaker = self._get(endpoint)
+            if breaker.state == CLOSED:
+                return True
+            if breaker.state == OPEN and time.monotonic() - breaker.opened_at >= self.reset_timeout:
+                breaker.state = HALF_OPEN
+                breaker.probing = False
+            if breaker.state == HALF_OPEN and not breaker.probing:
+                breaker.probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, endpoint: str):
+        with self._lock:
+            breaker = self._get(endpoint)
+            if breaker.state != CLOSED:
+                print(f"✅ Circuit closed for {endpoint}")
+            breaker.state = CLOSED
+            breaker.failures = 0
+            breaker.probing = False
+
+    def record_failure(self, endpoint: str):
+        with self._lock:
+            breaker = self._get(endpoint)
+            breaker.failures += 1
+            if breaker.state == HALF_OPEN or (breaker.state == CLOSED and
+                                              breaker.failures >= self.failure_threshold):
+                breaker.state = OPEN
+                breaker.opened_at = time.monotonic()
+                breaker.probing = False
+                breaker.trips += 1
+                print(f"⛔ Circuit opened for {endpoint} after {breaker.failures} failures "
+                      f"(retrying in {self.reset_timeout:.0f}s)")
+
+    def record_served_stale(self):
+        """Count a request answered from cache because its breaker was open"""
+        with self._lock:
+            self.served_stale += 1
+
+    def state(self, endpoint: str) -> str:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            return breaker.state if breaker else CLOSED
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of every endpoint seen so far"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                endpoint: {
+                    'state': b.state,
+                    'failures': b.failures,
+                    'trips': b.trips,
+                    'retry_in': round(max(0.0, self.reset_timeout - (now - b.opened_at)), 1)
+                    if b.state == OPEN else 0.0,
+                }
+                for endpoint, b in self._breakers.items()
+            }
+
+    def describe(self) -> str:
+        """One-line breaker summary for the monitor header"""
+        states = self.states()
+        tripped = {e: s for e, s in states.items() if s['state'] != CLOSED}
+        if not tripped:
+            return "🟢 API circuits closed"
+        parts = [
+            f"{endpoint} {s['state'].upper()}" + (f" (retry in {s['retry_in']:.0f}s)" if s['state'] == OPEN else "")
+            for endpoint, s in tripped.items()
+        ]
+        return "🔴 " + ", ".join(parts) + " - serving cached data"
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'endpoints': self.states(),
+            'rejected': self.rejected,
+            'served_stale': self.served_stale,
+        }
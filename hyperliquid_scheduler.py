@@ -0,0 +1,480 @@
+"""
+Hyperliquid Scheduler - Many vaults monitored from one process
+
+live_monitor follows one vault in a blocking loop, so watching 30 vaults
+used to take 30 processes. VaultScheduler follows any number of them on one
+asyncio loop. Every vault has its own refresh interval and priority; first
+fetches are spread over each vault's interval and every later tick is
+jittered, so vaults sharing an interval never fire together. All requests go
+through one AsyncHyperliquidAPI and therefore draw from one rate-limit
+bucket (shared with every other process on the host, see
+hyperliquid_ratelimit).
+
+At most ``max_concurrency`` fetches are in flight. When a slot frees up it
+goes to the due vault with the highest priority, so under rate-limit
+pressure the low-priority vaults fall behind first. Each interval a vault
+is overdue raises its priority by one, so none of them is starved. How far
+behind a vault is gets reported as lag: the time between a fetch's
+scheduled start and its actual start. Ticks missed by a whole interval are
+skipped (and counted) instead of being fired back to back.
+
+With ``--adaptive`` every vault's interval follows how often it changes
+(see hyperliquid_adaptive) and each adjustment is printed with its reason.
+
+The combined view lists every vault with its schedule and lag, then the
+global top followers across all vaults.
+
+Usage:
+    python hyperliquid_scheduler.py --vaults <address[:interval[:priority]],...>
+        [--interval 10] [--top 20] [--sort-by pnl] [--min-equity N] [--min-roi N]
+        [--jitter 0.1] [--concurrency 4] [--render-interval 2]
+        [--adaptive] [--min-interval 1] [--max-interval 60] [--target-staleness N]
+        [--base-url URL] [--history hyperliquid_data.db]
+
+    python hyperliquid_scheduler.py --vaults 0xdfc2...f303:5:2,0xabc...:30,0xdef...:60:-1
+"""
+
+import asyncio
+import random
+import sys
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional
+
+from hyperliquid_adaptive import AdaptiveInterval, measure_change
+from hyperliquid_api_example import Colors, format_leaderboard_entry
+from hyperliquid_leaderboard import merge_leaderboards
+from hyperliquid_async import AsyncHyperliquidAPI
+from hyperliquid_history import SnapshotStore
+from hyperliquid_snapshot import VaultSnapshot
+from hyperliquid_table import FollowerTable
+
+
+DEFAULT_INTERVAL = 10.0
+
+
+class ScheduledVault:
+    """Schedule, lag statistics and latest state of one vault
+
+    Times named ``anchor``/``due`` are on the event loop's monotonic clock.
+    """
+
+    def __init__(self, address: str, interval: float = DEFAULT_INTERVAL, priority: int = 0,
+                 adaptive: AdaptiveInterval = None):
+        """
+        Args:
+            address: Vault address
+            interval: Seconds between refreshes
+            priority: Higher is served first when several vaults are due
+            adaptive: Optional controller that re-tunes ``interval`` after
+                every fetch
+        """
+        if interval <= 0:
+            raise ValueError(f"Refresh interval must be positive, got {interval}")
+        self.address = address
+        self.interval = float(interval)
+        self.priority = int(priority)
+        self.adaptive = adaptive
+
+        self.anchor = 0.0  # next tick before jitter
+        self.due = 0.0  # next tick
+        self.last_fetch = None
+        self.in_flight = False
+
+        self.snapshot = None
+        self.leaderboard = FollowerTable.empty()
+        self.version = None
+        self.updated_at = None
+
+        self.fetches = 0
+        self.errors = 0
+        self.changes = 0
+        self.skipped = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.fetch_ms = None
+
+    @classmethod
+    def parse(cls, spec: str, default_interval: float = DEFAULT_INTERVAL) -> 'ScheduledVault':
+        """
+        Build from an ``address[:interval[:priority]]`` spec
+
+        Raises:
+            ValueError: Malformed spec
+        """
+        parts = spec.strip().split(':')
+        if not parts[0] or len(parts) > 3:
+            raise ValueError(f"Invalid vault spec {spec!r}, expected address[:interval[:priority]]")
+        interval = float(parts[1]) if len(parts) > 1 and parts[1] else default_interval
+        priority = int(parts[2]) if len(parts) > 2 and parts[2] else 0
+        return cls(parts[0], interval, priority)
+
+    @property
+    def name(self) -> str:
+        return self.snapshot.vault_data.get('name', '') if self.snapshot else ''
+
+    def metrics(self) -> Dict[str, Any]:
+        """Schedule and lag counters, lags in milliseconds"""
+        return {
+            'interval': self.interval,
+            'adaptive': self.adaptive is not None,
+            'priority': self.priority,
+            'fetches': self.fetches,
+            'errors': self.errors,
+            'changes': self.changes,
+            'skipped': self.skipped,
+            'last_lag_ms': round(self.last_lag * 1000, 1),
+            'max_lag_ms': round(self.max_lag * 1000, 1),
+            'mean_lag_ms': round(self.total_lag / self.fetches * 1000, 1) if self.fetches else None,
+            'fetch_ms': None if self.fetch_ms is None else round(self.fetch_ms, 1),
+            'followers': len(self.snapshot) if self.snapshot else None,
+            'updated_at': self.updated_at,
+        }
+
+
+class VaultScheduler:
+    """Refresh many vaults on their own intervals from one event loop"""
+
+    def __init__(self, api: AsyncHyperliquidAPI, vaults: Iterable[ScheduledVault],
+                 jitter: float = 0.1, max_concurrency: int = 4,
+                 sort_by: str = 'pnl', top_n: int = 20,
+                 min_equity: float = None, min_roi: float = None,
+                 history: SnapshotStore = None):
+        """
+        Args:
+            api: Async client; its rate limiter is the budget every vault shares
+            vaults: Vaults to follow (later duplicates of an address are ignored)
+            jitter: Random shift of every tick, as a fraction of the vault's interval
+            max_concurrency: Maximum fetches in flight
+            sort_by: Sort metric of the per-vault and global leaderboards
+            top_n: Followers kept per vault (and in the global leaderboard)
+            min_equity: Minimum equity filter
+            min_roi: Minimum ROI filter (in percentage)
+            history: Optional snapshot store; every new upstream snapshot is
+                appended to it
+        """
+        self.vaults = {}
+        for vault in vaults:
+            self.vaults.setdefault(vault.address, vault)
+        self.api = api
+        self.jitter = jitter
+        self.max_concurrency = max(1, max_concurrency)
+        self.sort_by = sort_by
+        self.top_n = top_n
+        self.min_equity = min_equity
+        self.min_roi = min_roi
+        self.history = history
+
+        self.changes = 0
+        self._running = False
+        self._slots = None
+        self._wake = None
+
+    async def run(self, duration: Optional[float] = None):
+        """
+        Refresh every vault on its schedule until stop() (or ``duration`` seconds)
+        """
+        loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._wake = asyncio.Event()
+        self._running = True
+        started = loop.time()
+        deadline = None if duration is None else started + duration
+
+        for vault in self.vaults.values():
+            # Spread the first fetches over each interval instead of firing all at once
+            vault.anchor = vault.due = started + random.uniform(0, vault.interval)
+
+        tasks = set()
+        try:
+            while self._running:
+                await self._slots.acquire()
+                vault = await self._next_due(deadline)
+                if vault is None:
+                    self._slots.release()
+                    break
+                vault.in_flight = True
+                task = loop.create_task(self._refresh(vault))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            self._running = False
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self):
+        """End run() after the fetches in flight"""
+        self._running = False
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _next_due(self, deadline: Optional[float]) -> Optional[ScheduledVault]:
+        """Wait for a due vault and return the most important one (None when stopping)"""
+        loop = asyncio.get_running_loop()
+        while self._running:
+            now = loop.time()
+            if deadline is not None and now >= deadline:
+                return None
+
+            idle = [vault for vault in self.vaults.values() if not vault.in_flight]
+            due = [vault for vault in idle if vault.due <= now]
+            if due:
+                # Highest priority first; every interval a vault is overdue
+                # counts as one more level, so low priorities are never starved
+                return max(due, key=lambda vault: (vault.priority + (now - vault.due) / vault.interval, -vault.due))
+
+            # Sleep until the next tick, a finished fetch or stop()
+            timeout = min(vault.due for vault in idle) - now if idle else None
+            if deadline is not None:
+                timeout = deadline - now if timeout is None else min(timeout, deadline - now)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return None
+
+    async def _refresh(self, vault: ScheduledVault):
+        """Fetch one vault, record its lag and schedule its next tick"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        lag = max(0.0, started - vault.due)
+        vault.fetches += 1
+        vault.last_lag = lag
+        vault.max_lag = max(vault.max_lag, lag)
+        vault.total_lag += lag
+
+        try:
+            snapshot = await self.api.get_vault_snapshot(vault.address)
+            vault.fetch_ms = (loop.time() - started) * 1000
+            if snapshot is None:
+                vault.errors += 1
+            else:
+                changed = snapshot.version != vault.version
+                if vault.adaptive:
+                    self._adapt(vault, snapshot if changed else None, started)
+                if changed:
+                    await self._apply(vault, snapshot)
+        except Exception as e:
+            # A bad response must not end the scheduler or, with the vault
+            # left due, make the dispatcher refetch it in a tight loop
+            vault.errors += 1
+            print(f"⚠️  {vault.address[:10]}... refresh failed: {e}")
+        finally:
+            self._reschedule(vault, loop.time())
+            vault.in_flight = False
+            self._slots.release()
+            self._wake.set()
+
+    async def _apply(self, vault: ScheduledVault, snapshot: VaultSnapshot):
+        """Rank a new upstream snapshot of a vault and record it"""
+        vault.snapshot = snapshot
+        vault.version = snapshot.version
+        vault.updated_at = snapshot.fetched_at
+        vault.changes += 1
+        self.changes += 1
+        vault.leaderboard = snapshot.followers.filter(self.min_equity, self.min_roi).top(self.top_n, self.sort_by)
+        if self.history:
+            # The frame diff and a writer blocking on backpressure would stall
+            # every vault on the loop. Awaited, so one vault's appends stay in order
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.history.append, vault.address, snapshot.vault_data,
+                snapshot.followers, snapshot.fetched_at)
+
+    def _adapt(self, vault: ScheduledVault, snapshot: Optional[VaultSnapshot], now: float):
+        """Re-tune an adaptive vault's interval from what this fetch changed (None: nothing)"""
+        change = (0.0, 0.0, 0)
+        if snapshot is not None and vault.snapshot is not None:
+            change = measure_change(vault.snapshot.followers, snapshot.followers, self.top_n, self.sort_by)
+        if vault.last_fetch is not None:
+            reason = vault.adaptive.observe(now - vault.last_fetch, *change)
+            if reason:
+                print(f"🎚️  {vault.address[:10]}... refresh interval: {reason}")
+                vault.interval = vault.adaptive.interval
+        vault.last_fetch = now
+
+    def _reschedule(self, vault: ScheduledVault, now: float):
+        """Advance to the next tick on the vault's fixed-rate grid"""
+        vault.anchor += vault.interval
+        if vault.anchor <= now:
+            # A whole interval behind: skip the missed ticks rather than fire them back to back
+            missed = int((now - vault.anchor) // vault.interval) + 1
+            vault.skipped += missed
+            vault.anchor += missed * vault.interval
+        vault.due = vault.anchor + random.uniform(-self.jitter, self.jitter) * vault.interval
+
+    def global_leaderboard(self, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Top followers across every vault, each tagged with its 'vault'"""
+        leaderboards = {address: vault.leaderboard for address, vault in self.vaults.items() if vault.snapshot}
+        return merge_leaderboards(leaderboards, self.sort_by, top_k or self.top_n)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per-vault schedule and lag counters plus the shared rate-limit budget"""
+        return {
+            'vaults': {address: vault.metrics() for address, vault in self.vaults.items()},
+            'rate_limiter': self.api.rate_limiter.metrics(),
+        }
+
+    def describe(self) -> str:
+        """One-line status for the combined view"""
+        vaults = list(self.vaults.values())
+        fetches = sum(vault.fetches for vault in vaults)
+        errors = sum(vault.errors for vault in vaults)
+        skipped = sum(vault.skipped for vault in vaults)
+        mean_lag = sum(vault.total_lag for vault in vaults) / fetches if fetches else 0.0
+        worst = max(vaults, key=lambda vault: vault.max_lag, default=None)
+        budget = self.api.rate_limiter.metrics()
+
+        line = f"{len(vaults)} vaults | {fetches} fetches | lag mean {mean_lag * 1000:.0f}ms"
+        if worst is not None and worst.max_lag > 0:
+            line += f", max {worst.max_lag * 1000:.0f}ms ({worst.address[:10]}...)"
+        line += f" | {skipped} skipped | {errors} errors"
+        line += f" | budget {budget['tokens']:.0f}/{budget['capacity']:.0f}"
+        return line
+
+
+def _age(updated_at: Optional[float], now: float) -> str:
+    return '-' if updated_at is None else f"{now - updated_at:.0f}s"
+
+
+def display_scheduled_vaults(scheduler: VaultScheduler, top_k: int = 20):
+    """
+    Combined view: every vault's schedule and lag, then the global top followers
+
+    Args:
+        scheduler: Running VaultScheduler
+        top_k: Number of global top performers to display
+    """
+    now = datetime.now()
+    print("\n" + "=" * 80)
+    print(Colors.bold(f"🗓️  HYPERLIQUID MULTI-VAULT MONITOR - {len(scheduler.vaults)} VAULTS"))
+    print(f"⏰  Updated: {Colors.yellow(now.strftime('%Y-%m-%d %H:%M:%S'))} | "
+          f"Sorting: {Colors.bold(scheduler.sort_by.upper())}")
+    print(f"📡  {scheduler.describe()}")
+    print("=" * 80)
+    print(f"{'VAULT':<14}{'NAME':<18}{'PRI':>4}{'EVERY':>7}{'FOLLOWERS':>10}{'AGE':>6}"
+          f"{'LAG':>8}{'MAX LAG':>9}{'ERR':>5}")
+
+    vaults = sorted(scheduler.vaults.values(), key=lambda vault: (-vault.priority, vault.address))
+    for vault in vaults:
+        followers = str(len(vault.snapshot)) if vault.snapshot else '-'
+        lag = f"{vault.last_lag * 1000:.0f}ms" if vault.fetches else '-'
+        max_lag = f"{vault.max_lag * 1000:.0f}ms" if vault.fetches else '-'
+        errors = Colors.red(f"{vault.errors:>5}") if vault.errors else f"{vault.errors:>5}"
+        print(f"{Colors.cyan(vault.address[:10] + '...')} {vault.name[:17]:<18}{vault.priority:>4}"
+              f"{vault.interval:>6.3g}s{followers:>10}{_age(vault.updated_at, now.timestamp()):>6}"
+              f"{lag:>8}{max_lag:>9}{errors}")
+
+    print("=" * 80)
+    print()
+    for i, entry in enumerate(scheduler.global_leaderboard(top_k), 1):
+        print(format_leaderboard_entry(entry, i))
+    print("=" * 80)
+    print("Press Ctrl+C to stop monitoring")
+    print("=" * 80)
+
+
+async def monitor_vaults(scheduler: VaultScheduler, top_k: int = 20, render_interval: float = 2.0,
+                         duration: Optional[float] = None):
+    """
+    Run a scheduler and redraw the combined view whenever a vault changed
+
+    Args:
+        scheduler: VaultScheduler to run
+        top_k: Number of global top performers to display
+        render_interval: Seconds between redraws
+        duration: Stop after this many seconds (default: run until cancelled)
+    """
+    async def render():
+        rendered = None
+        while True:
+            await asyncio.sleep(render_interval)
+            if scheduler.changes != rendered:
+                rendered = scheduler.changes
+                display_scheduled_vaults(scheduler, top_k)
+            else:
+                print(f"⏸  No changes upstream ({datetime.now().strftime('%H:%M:%S')}) | {scheduler.describe()}")
+
+    renderer = asyncio.get_running_loop().create_task(render())
+    try:
+        await scheduler.run(duration)
+    finally:
+        renderer.cancel()
+        await asyncio.gather(renderer, return_exceptions=True)
+
+
+def _arg(name: str, default: Optional[str]) -> Optional[str]:
+    if name in sys.argv:
+        try:
+            return sys.argv[sys.argv.index(name) + 1]
+        except IndexError:
+            print(f"⚠️  Missing {name} value, using default: {default}")
+    return default
+
+
+def main():
+    specs = _arg('--vaults', None)
+    if not specs:
+        print("❌ No vaults provided, use --vaults <address[:interval[:priority]],...>")
+        sys.exit(1)
+
+    try:
+        interval = float(_arg('--interval', str(DEFAULT_INTERVAL)))
+        vaults = [ScheduledVault.parse(spec, interval) for spec in specs.split(',') if spec.strip()]
+        top_k = int(_arg('--top', '20'))
+        jitter = float(_arg('--jitter', '0.1'))
+        concurrency = int(_arg('--concurrency', '4'))
+        render_interval = float(_arg('--render-interval', '2'))
+        min_equity = _arg('--min-equity', None)
+        min_roi = _arg('--min-roi', None)
+        min_equity = float(min_equity) if min_equity is not None else None
+        min_roi = float(min_roi) if min_roi is not None else None
+        if "--adaptive" in sys.argv:
+            target = _arg('--target-staleness', None)
+            for vault in vaults:
+                vault.adaptive = AdaptiveInterval(vault.interval, float(_arg('--min-interval', '1')),
+                                                  float(_arg('--max-interval', '60')),
+                                                  float(target) if target is not None else None)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    sort_by = _arg('--sort-by', 'pnl').lower()
+    if sort_by not in ['pnl', 'roi', 'equity', 'days']:
+        print(f"⚠️  Invalid sort option '{sort_by}', using default: pnl")
+        sort_by = 'pnl'
+
+    history_path = _arg('--history', None)
+    history = SnapshotStore(history_path) if history_path else None
+
+    async def run():
+        async with AsyncHyperliquidAPI(_arg('--base-url', "https://api.hyperliquid.xyz/info")) as api:
+            scheduler = VaultScheduler(api, vaults, jitter, concurrency, sort_by, top_k,
+                                       min_equity, min_roi, history)
+            for vault in scheduler.vaults.values():
+                if vault.adaptive and api.cache:
+                    # Two jittered ticks can be up to 2 * jitter of an interval closer together
+                    vault.adaptive.raise_floor(api.cache.ttls.get('vaultDetails', 0) / max(0.1, 1 - 2 * jitter))
+                    vault.interval = vault.adaptive.interval
+            print(f"\n🚀 Scheduling {len(scheduler.vaults)} vaults "
+                  f"({concurrency} concurrent fetches, ±{jitter:.0%} jitter)")
+            for vault in sorted(scheduler.vaults.values(), key=lambda vault: -vault.priority):
+                mode = " (adaptive)" if vault.adaptive else ""
+                print(f"  📊 {Colors.cyan(vault.address)} every {vault.interval:g}s{mode}, priority {vault.priority}")
+            try:
+                await monitor_vaults(scheduler, top_k, render_interval)
+            finally:
+                print(f"\n📡 {scheduler.describe()}")
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\n✅ Multi-vault monitoring stopped.")
+    finally:
+        if history:
+            history.close()
+
+
+if __name__ == "__main__":
+    main()
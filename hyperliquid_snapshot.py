@@ -0,0 +1,88 @@
+"""
+Hyperliquid Snapshot - One refresh of a vault, shared by every consumer
+
+A VaultSnapshot is what one vaultDetails fetch produces: the response
+(vault metadata and followers), its version, the time it was fetched and
+the followers parsed into a FollowerTable on first use. The live monitor
+hands the same snapshot to alerts, persistence and rendering, so a refresh
+costs one request and at most one parse however many of them are enabled.
+
+StageTimer measures the stages of a refresh for the monitor's ``--debug``
+footer.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Optional
+
+from hyperliquid_table import FollowerTable
+
+
+class VaultSnapshot:
+    """One upstream state of a vault
+
+    ``vault_data`` is the vaultDetails response (shared with the response
+    cache - treat it as read-only). ``followers`` is parsed once, on first
+    access, by ``parse`` when given (e.g. the client's per-version memo).
+    """
+
+    def __init__(self, vault_address: str, vault_data: Dict[str, Any], version: int,
+                 fetched_at: Optional[float] = None,
+                 parse: Optional[Callable[[], FollowerTable]] = None):
+        """
+        Args:
+            vault_address: Vault address
+            vault_data: vaultDetails response including ``followers``
+            version: Response version (see HyperliquidAPI.vault_version)
+            fetched_at: Unix time of the fetch (default: now)
+            parse: Returns the parsed followers (default: FollowerTable.from_followers)
+        """
+        self.vault_address = vault_address
+        self.vault_data = vault_data
+        self.version = version
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self._parse = parse
+        self._followers = None
+
+    def __len__(self) -> int:
+        return len(self.vault_data.get('followers', []))
+
+    @property
+    def followers(self) -> FollowerTable:
+        """Followers in API order"""
+        if self._followers is None:
+            if self._parse is not None:
+                self._followers = self._parse()
+            else:
+                self._followers = FollowerTable.from_followers(self.vault_data.get('followers', []))
+        return self._followers
+
+    @property
+    def tvl(self) -> float:
+        """Total equity of every follower"""
+        return self.followers.total_equity()
+
+
+class StageTimer:
+    """Wall time of each stage of one refresh cycle"""
+
+    def __init__(self):
+        self.stages = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as ``name`` (repeated stages add up)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def describe(self) -> str:
+        """One-line footer, stages in the order they ran"""
+        parts = [f"{name} {ms:.1f}ms" for name, ms in self.stages.items()]
+        return "⏱  " + " | ".join(parts + [f"total {self.total_ms():.1f}ms"])
@@ -0,0 +1,192 @@
+"""
+Hyperliquid Follower Store - Accumulated vault followers in SQLite
+
+``get_vault_details_batched`` keeps every follower it has ever seen for a
+vault so the dashboard can build up past the API's per-response limit. The
+followers used to live in ``vault_cache/<vault>_followers.json``, which was
+read and rewritten in full on every call, raced when the dashboard and the
+monitor wrote at once and was left truncated by a crash mid-write.
+
+FollowerStore keeps them in one WAL-mode SQLite table keyed by
+``(vault, user)``. Each response is upserted with ``INSERT ... ON CONFLICT``,
+and rows whose data has not changed are left alone, so a refresh writes only
+new and changed followers. Old JSON caches are imported once by
+``migrate_json()``.
+
+Usage:
+    python hyperliquid_store.py [--db hyperliquid_data.db] [--cache-dir vault_cache]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+
+from hyperliquid_history import migrate
+
+
+DEFAULT_DB_PATH = 'hyperliquid_data.db'
+LEGACY_CACHE_DIR = 'vault_cache'
+
+# Unchanged rows still get last_seen refreshed, but at most this often
+LAST_SEEN_RESOLUTION = 3600.0
+
+
+def _encode(follower: Dict[str, Any]) -> str:
+    """Canonical JSON of a follower dict, so equal dicts store equal text"""
+    return json.dumps(follower, sort_keys=True, separators=(',', ':'))
+
+
+class FollowerStore:
+    """Followers per vault in SQLite, written by upsert
+
+    Every row holds the latest follower dict as JSON together with
+    ``first_seen`` and ``last_seen`` (Unix seconds). Writers from several
+    processes are serialised by ``BEGIN IMMEDIATE``; readers are never
+    blocked thanks to WAL mode. The table is created and upgraded by the
+    hyperliquid_history migrations, like the history tables.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH,
+                 last_seen_resolution: float = LAST_SEEN_RESOLUTION):
+        """
+        Args:
+            path: SQLite file, shared with the other hyperliquid_data tables
+            last_seen_resolution: Seconds after which an unchanged row's
+                ``last_seen`` is bumped anyway
+
+        Raises:
+            RuntimeError: The database was written by a newer version
+        """
+        self.path = path
+        self.last_seen_resolution = last_seen_resolution
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # vault_followers is part of the versioned hyperliquid_data schema
+        migrate(self._conn)
+
+    def _write(self, sql: str, rows: List[tuple]) -> int:
+        """Run ``sql`` for every row in one transaction; returns rows written"""
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(sql, rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def upsert(self, vault: str, followers: Iterable[Dict[str, Any]],
+               seen_at: Optional[float] = None) -> int:
+        """
+        Store followers of a vault, writing only new or changed rows
+
+        Args:
+            vault: Vault address
+            followers: Follower dicts as returned by vaultDetails
+            seen_at: Timestamp for first_seen/last_seen (default: now)
+
+        Returns:
+            Number of rows inserted or updated
+        """
+        seen_at = time.time() if seen_at is None else seen_at
+        rows = [
+            (vault.lower(), follower['user'].lower(), _encode(follower), seen_at, seen_at)
+            for follower in followers if follower.get('user')
+        ]
+        if not rows:
+            return 0
+        return self._write(f"""
+            INSERT INTO vault_followers (vault, user, data, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (vault, user) DO UPDATE SET
+                data = excluded.data,
+                last_seen = excluded.last_seen
+            WHERE (data IS NOT excluded.data AND last_seen <= excluded.last_seen)
+               OR last_seen < excluded.last_seen - {float(self.last_seen_resolution)!r}
+        """, rows)
+
+    def load(self, vault: str) -> List[Dict[str, Any]]:
+        """Every stored follower of a vault, in the order they were first stored"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM vault_followers WHERE vault = ? ORDER BY rowid",
+                (vault.lower(),)
+            ).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def count(self, vault: str) -> int:
+        """Number of stored followers of a vault"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM vault_followers WHERE vault = ?", (vault.lower(),)
+            ).fetchone()[0]
+
+    def migrate_json(self, cache_dir: str = LEGACY_CACHE_DIR) -> int:
+        """
+        Import ``<cache_dir>/<vault>_followers.json`` files once
+
+        Each imported file is renamed to ``*.json.migrated`` so the next call
+        skips it. Files that cannot be parsed are left in place and reported.
+
+        Args:
+            cache_dir: Directory of the old JSON follower caches
+
+        Returns:
+            Number of followers imported
+        """
+        imported = 0
+        for cache_file in sorted(Path(cache_dir).glob('*_followers.json')):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    cached_data = json.load(f)
+                vault = cached_data.get('vault_address') or cache_file.name[:-len('_followers.json')]
+                try:
+                    seen_at = datetime.fromisoformat(cached_data['cached_at']).timestamp()
+                except (KeyError, TypeError, ValueError):
+                    seen_at = os.path.getmtime(cache_file)
+                count = self.upsert(vault, cached_data.get('followers', []), seen_at)
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"[CACHE] Failed to migrate {cache_file}: {e}")
+                continue
+            os.replace(cache_file, cache_file.with_name(cache_file.name + '.migrated'))
+            print(f"[CACHE] Migrated {count} followers of {vault} from {cache_file}")
+            imported += count
+        return imported
+
+    def close(self):
+        """Close the database connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _arg(name: str, default: str) -> str:
+    if name in sys.argv:
+        try:
+            return sys.argv[sys.argv.index(name) + 1]
+        except IndexError:
+            print(f"⚠️  Missing {name} value, using default: {default}")
+    return default
+
+
+def main():
+    store = FollowerStore(_arg('--db', DEFAULT_DB_PATH))
+    try:
+        imported = store.migrate_json(_arg('--cache-dir', LEGACY_CACHE_DIR))
+        print(f"✅ Imported {imported} followers into {store.path}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Hyperliquid Stream - Push-based vault follower updates over a websocket
+
+VaultFollowerStream keeps a live copy of one vault's followers. It connects
+to a websocket, subscribes with the Hyperliquid message format, applies each
+pushed ``vaultFollowers`` change as it arrives and wakes the caller, so the
+live monitor reacts to events instead of refetching on a timer.
+
+Hyperliquid's public websocket has no vault follower channel, so ``url``
+points at a relay that publishes one (``hyperliquid_mock_server.py
+--stream-port`` locally). The REST client is still used for the full state:
+after every (re)connect, and whenever a gap in the push sequence numbers
+shows that messages were missed, a ``vaultDetails`` snapshot is fetched and
+the pushes received meanwhile that are newer than it are applied on top.
+
+A push is newer than a snapshot when its ``seq`` is above the snapshot's.
+The relay can put the push sequence number the state corresponds to in the
+``vaultDetails`` response as ``seq`` (the mock server does). Hyperliquid's
+REST API has no such field. Without it only pushes that arrive after the
+snapshot response are applied. A change pushed while the request was in
+flight may then be missing until that follower's next push, but an older
+push never rolls the snapshot back.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import aiohttp
+
+from hyperliquid_address import ADDRESSES, NO_ADDRESS
+from hyperliquid_cache import canonical_key
+from hyperliquid_ratelimit import backoff_delay
+
+
+# Hyperliquid closes websocket connections that stay silent for 60 seconds
+PING_INTERVAL = 50.0
+
+CONNECTING = 'connecting'
+SYNCING = 'syncing'
+LIVE = 'live'
+RECONNECTING = 'reconnecting'
+STOPPED = 'stopped'
+
+
+class VaultFollowerStream:
+    """Live follower state of one vault, fed by websocket pushes
+
+    The stream runs its own asyncio loop in a daemon thread. Readers call
+    ``wait()`` to block until the state changes, then ``followers()`` /
+    ``vault_data()`` for a consistent copy.
+    """
+
+    def __init__(self, api, vault_address: str, url: str,
+                 ping_interval: float = PING_INTERVAL, max_backoff: float = 30.0):
+        """
+        Args:
+            api: HyperliquidAPI used for the REST gap-fill snapshots
+            vault_address: Vault to subscribe to
+            url: Websocket URL of the follower update feed
+            ping_interval: Seconds of silence before sending a ping; the
+                connection is dropped after two intervals without traffic
+            max_backoff: Upper bound on the reconnect delay in seconds
+        """
+        self.api = api
+        self.vault_address = vault_address
+        self.url = url
+        self.ping_interval = ping_interval
+        self.max_backoff = max_backoff
+
+        self._cond = threading.Condition()
+        self._vault = {}
+        self._followers = {}  # address ID -> follower dict
+        self._last_seq = None
+        self._thread = None
+        self._stopped = False
+        self._woken = False
+
+        self.state = CONNECTING
+        self.version = 0
+        self.connects = 0
+        self.reconnects = 0
+        self.resyncs = 0
+        self.events = 0
+        self.last_error = None
+        self.last_event_at = None
+        self.lag_ms = None
+
+    def start(self) -> 'VaultFollowerStream':
+        """Start the background connection and return self"""
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Close the connection and wake any waiting reader"""
+        self._stopped = True
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._set_state(STOPPED)
+
+    def wait(self, since_version: int, timeout: Optional[float] = None) -> int:
+        """
+        Block until the state is newer than ``since_version``
+
+        Args:
+            since_version: Version the caller last rendered
+            timeout: Give up after this many seconds
+
+        Returns:
+            The current version (equal to ``since_version`` on timeout or wake())
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != since_version or self._stopped or self._woken, timeout)
+            self._woken = False
+            return self.version
+
+    def wake(self):
+        """Return a blocked wait() early without a state change"""
+        with self._cond:
+            self._woken = True
+            self._cond.notify_all()
+
+    def followers(self) -> List[Dict[str, Any]]:
+        """Current followers (a new list; the dicts are shared, treat as read-only)"""
+        with self._cond:
+            return list(self._followers.values())
+
+    def vault_data(self) -> Dict[str, Any]:
+        """Latest snapshot metadata with the current followers, like get_vault_details"""
+        with self._cond:
+            data = dict(self._vault)
+            data['followers'] = list(self._followers.values())
+            return data
+
+    def status(self) -> Dict[str, Any]:
+        """Connection state and counters for display"""
+        with self._cond:
+            return {
+                'state': self.state,
+                'version': self.version,
+                'followers': len(self._followers),
+                'events': self.events,
+                'reconnects': self.reconnects,
+                'resyncs': self.resyncs,
+                'lag_ms': self.lag_ms,
+                'last_event_at': self.last_event_at,
+                'last_error': self.last_error,
+            }
+
+    def describe(self) -> str:
+        """One-line status for the monitor header"""
+        s = self.status()
+        icon = {LIVE: '🟢', SYNCING: '🟡', CONNECTING: '🟡', RECONNECTING: '🔴'}.get(s['state'], '⚪')
+        line = f"{icon} Stream {s['state']} | {s['events']} events | {s['reconnects']} reconnects | {s['resyncs']} resyncs"
+        if s['lag_ms'] is not None:
+            line += f" | lag {s['lag_ms']:.0f}ms"
+        return line
+
+    def _set_state(self, state: str, error: Optional[str] = None):
+        with self._cond:
+            self.state = state
+            if error is not None:
+                self.last_error = error
+            self._cond.notify_all()
+
+    def _apply_snapshot(self, vault_data: Dict[str, Any]):
+        with self._cond:
+            self._vault = {k: v for k, v in vault_data.items() if k not in ('followers', 'seq')}
+            followers = [f for f in vault_data.get('followers', []) if f.get('user')]
+            self._followers = {user: follower for user, follower
+                               in zip(ADDRESSES.intern_many(f['user'] for f in followers).tolist(), followers)
+                               if user != NO_ADDRESS}
+            self._last_seq = vault_data.get('seq')
+            self.version += 1
+            self._cond.notify_all()
+
+    def _apply_update(self, data: Dict[str, Any]):
+        with self._cond:
+            for user in data.get('removed') or ():
+                self._followers.pop(ADDRESSES.lookup(user), None)
+            updates = data.get('updates') or []
+            self._followers.update((user, follower) for user, follower
+                                   in zip(ADDRESSES.intern_many(f.get('user') for f in updates).tolist(), updates)
+                                   if user != NO_ADDRESS)
+            self._last_seq = data.get('seq')
+            self.events += 1
+            self.last_event_at = time.time()
+            if data.get('time'):
+                self.lag_ms = max(0.0, self.last_event_at * 1000 - data['time'])
+            self.version += 1
+            self._cond.notify_all()
+
+    def _fetch_snapshot(self) -> Tuple[Dict[str, Any], float]:
+        """
+        REST snapshot, bypassing the response cache so it is never older than the pushes
+
+        Returns:
+            (vaultDetails response, time.monotonic() when it arrived)
+        """
+        payload = {"type": "vaultDetails", "vaultAddress": self.vault_address}
+        if self.api.cache:
+            self.api.cache.invalidate(canonical_key(payload))
+        data = self.api.get_vault_details(self.vault_address)
+        if not data or 'followers' not in data:
+            raise ConnectionError("vaultDetails snapshot failed")
+        return data, time.monotonic()
+
+    @staticmethod
+    def _newer_than(snapshot: Dict[str, Any], received_at: float, buffered: list) -> list:
+        """Buffered ``(arrival time, push)`` pairs that are not already part of a snapshot"""
+        seq = snapshot.get('seq')
+        if seq is not None:
+            return [data for _, data in buffered if data.get('seq') is None or data['seq'] > seq]
+        # No sequence number: only a push that arrived after the response is surely newer
+        return [data for arrived, data in buffered if arrived > received_at]
+
+    def _serve(self):
+        asyncio.run(self._run())
+
+    async def _run(self):
+        attempt = 0
+        async with aiohttp.ClientSession() as session:
+            while not self._stopped:
+                try:
+                    async with session.ws_connect(self.url, autoping=True) as ws:
+                        self.connects += 1
+                        if self.connects > 1:
+                            self.reconnects += 1
+                        await ws.send_json({
+                            "method": "subscribe",
+                            "subscription": {"type": "vaultFollowers", "vault": self.vault_address}
+                        })
+                        async for synced in self._session(ws):
+                            if synced:
+                                attempt = 0
+                except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError, OSError, ValueError) as e:
+                    if self._stopped:
+                        break
+                    self._set_state(RECONNECTING, f"{type(e).__name__}: {e}")
+                else:
+                    if self._stopped:
+                        break
+                    self._set_state(RECONNECTING, "connection closed by server")
+
+                delay = backoff_delay(attempt, cap=self.max_backoff)
+                attempt += 1
+                print(f"🔌 Stream disconnected ({self.last_error}), reconnecting in {delay:.1f}s...")
+                deadline = time.monotonic() + delay
+                while not self._stopped and time.monotonic() < deadline:
+                    await asyncio.sleep(min(0.2, delay))
+
+    async def _session(self, ws):
+        """
+        Read one connection until it closes
+
+        Yields True each time a snapshot has been applied and the stream is
+        live again, so the reconnect backoff can be reset.
+        """
+        loop = asyncio.get_running_loop()
+        self._set_state(SYNCING)
+        snapshot = loop.run_in_executor(None, self._fetch_snapshot)
+        buffered = []
+        last_traffic = last_ping = loop.time()
+
+        while not self._stopped:
+            if snapshot is not None and snapshot.done():
+                vault_data, received_at = snapshot.result()
+                self._apply_snapshot(vault_data)
+                # Pushes that raced the snapshot may predate it; replaying
+                # those would roll rows back or bring back removed followers
+                for data in self._newer_than(vault_data, received_at, buffered):
+                    self._apply_update(data)
+                buffered = []
+                snapshot = None
+                self._set_state(LIVE)
+                yield True
+
+            try:
+                msg = await ws.receive(timeout=0.1 if snapshot is not None else 1.0)
+            except asyncio.TimeoutError:
+                now = loop.time()
+                if now - last_traffic > 2 * self.ping_interval:
+                    raise ConnectionError("no traffic from stream")
+                if now - last_ping > self.ping_interval:
+                    await ws.send_json({"method": "ping"})
+                    last_ping = now
+                continue
+
+            if msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED,
+                            aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.ERROR):
+                if snapshot is not None:
+                    snapshot.cancel()
+                return
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                continue
+
+            last_traffic = loop.time()
+            message = json.loads(msg.data)
+            channel = message.get('channel')
+
+            if channel == 'vaultFollowers':
+                data = message.get('data') or {}
+                if snapshot is not None:
+                    buffered.append((time.monotonic(), data))
+                elif (self._last_seq is not None and data.get('seq') is not None
+                      and data['seq'] != self._last_seq + 1):
+                    # Missed pushes - refetch the full state, keep this one for after
+                    self.resyncs += 1
+                    self._set_state(SYNCING)
+                    snapshot = loop.run_in_executor(None, self._fetch_snapshot)
+                    buffered = [(time.monotonic(), data)]
+                else:
+                    self._apply_update(data)
+            elif channel == 'error':
+                raise ConnectionError(f"stream error: {message.get('data')}")
@@ -0,0 +1,280 @@
+"""
+Hyperliquid Follower Table - Columnar NumPy view of vault followers
+
+The API returns followers as dicts with numeric strings. FollowerTable parses
+them once into typed arrays (equity, pnl, allTimePnl, days, precomputed ROI,
+interned address IDs), so filtering, sorting and totals are vectorised
+instead of calling ``float()`` on every row in every pass.
+
+``top()`` selects the best N rows with ``np.argpartition``-style partial
+selection, so a top-100 leaderboard of a large vault costs O(n) plus a sort
+of the N selected rows rather than a full O(n log n) sort.
+
+For code written against lists of dicts, a table still supports ``len()``,
+iteration, ``[i]`` and ``[:n]``; rows come back as read-only ``Mapping``
+views that answer ``.get('vaultEquity')`` etc. with parsed numbers.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from hyperliquid_address import ADDRESSES
+
+
+# API field name -> FollowerTable column
+FIELD_COLUMNS = {
+    'user': 'user_ids',
+    'vaultEquity': 'equity',
+    'pnl': 'pnl',
+    'allTimePnl': 'all_time_pnl',
+    'daysFollowing': 'days',
+    'roi': 'roi',
+}
+
+# Leaderboard sort metric -> column
+SORT_COLUMNS = {
+    'pnl': 'all_time_pnl',
+    'roi': 'roi',
+    'equity': 'equity',
+    'days': 'days',
+}
+
+
+def _floats(followers: List[Dict[str, Any]], field: str) -> np.ndarray:
+    return np.fromiter((float(f.get(field) or 0) for f in followers), dtype=np.float64, count=len(followers))
+
+
+def compute_roi(all_time_pnl: np.ndarray, equity: np.ndarray) -> np.ndarray:
+    """All-time PnL as a percentage of equity (0 where equity is not positive)"""
+    roi = np.zeros_like(equity)
+    np.divide(all_time_pnl, equity, out=roi, where=equity > 0)
+    roi *= 100
+    return roi
+
+
+class FollowerRow(Mapping):
+    """Read-only dict-like view of one table row
+
+    Leaderboard fields come from the typed columns; any other field (e.g.
+    ``vaultEntryTime``) falls back to the original API dict when the table
+    was built from one.
+    """
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'FollowerTable', index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'user':
+            return ADDRESSES.hex(self._table.user_ids[self._index])
+        column = FIELD_COLUMNS.get(key)
+        if column is not None:
+            value = getattr(self._table, column)[self._index]
+            return value.item() if isinstance(value, np.generic) else value
+        raw = self._table.raw
+        if raw is not None:
+            return raw[self._index][key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from FIELD_COLUMNS
+        raw = self._table.raw
+        if raw is not None:
+            for key in raw[self._index]:
+                if key not in FIELD_COLUMNS:
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"FollowerRow({dict(self)!r})"
+
+
+class FollowerTable:
+    """Followers of a vault as parallel NumPy arrays
+
+    Columns: ``user_ids`` (int32 IDs in the shared AddressRegistry),
+    ``equity``, ``pnl``, ``all_time_pnl``, ``roi`` (float64) and ``days``
+    (int64). ``users`` decodes the IDs to hex strings for display.
+    ``raw`` optionally keeps the source dicts for fields the table does not
+    type. Slicing returns a table of array views; ``filter``/``sort``/``top``
+    return new tables. Columns are read-only because ranked tables are shared
+    (e.g. through the leaderboard memo).
+
+    ``total`` is the number of followers the table was selected from: its own
+    length, except for tables returned by ``top()``.
+    """
+
+    def __init__(self, user_ids: np.ndarray, equity: np.ndarray, pnl: np.ndarray,
+                 all_time_pnl: np.ndarray, days: np.ndarray, roi: Optional[np.ndarray] = None,
+                 raw: Optional[np.ndarray] = None, total: Optional[int] = None):
+        self.user_ids = user_ids
+        self.equity = equity
+        self.pnl = pnl
+        self.all_time_pnl = all_time_pnl
+        self.days = days
+        self.roi = compute_roi(all_time_pnl, equity) if roi is None else roi
+        self.raw = raw
+        self.total = len(user_ids) if total is None else total
+        for column in (self.user_ids, self.equity, self.pnl, self.all_time_pnl, self.days, self.roi):
+            column.flags.writeable = False
+
+    @classmethod
+    def from_followers(cls, followers: Iterable[Dict[str, Any]], keep_raw: bool = True) -> 'FollowerTable':
+        """
+        Parse API follower dicts into a table
+
+        Args:
+            followers: Follower dicts from a vaultDetails response (or rows of
+                another table)
+            keep_raw: Keep the source dicts so untyped fields stay reachable
+
+        Returns:
+            New FollowerTable in the input order
+        """
+        if isinstance(followers, FollowerTable):
+            return followers
+        followers = list(followers)
+        raw = None
+        if keep_raw:
+            raw = np.empty(len(followers), dtype=object)
+            raw[:] = followers
+        return cls(
+            user_ids=ADDRESSES.intern_many(f.get('user') for f in followers),
+            equity=_floats(followers, 'vaultEquity'),
+            pnl=_floats(followers, 'pnl'),
+            all_time_pnl=_floats(followers, 'allTimePnl'),
+            days=np.fromiter((int(f.get('daysFollowing') or 0) for f in followers),
+                             dtype=np.int64, count=len(followers)),
+            raw=raw,
+        )
+
+    @classmethod
+    def empty(cls) -> 'FollowerTable':
+        return cls.from_followers([])
+
+    def _take(self, index) -> 'FollowerTable':
+        return FollowerTable(
+            user_ids=self.user_ids[index],
+            equity=self.equity[index],
+            pnl=self.pnl[index],
+            all_time_pnl=self.all_time_pnl[index],
+            days=self.days[index],
+            roi=self.roi[index],
+            raw=None if self.raw is None else self.raw[index],
+        )
+
+    @property
+    def users(self) -> np.ndarray:
+        """Hex address strings (decoded on demand - prefer ``user_ids`` internally)"""
+        users = np.empty(len(self), dtype=object)
+        users[:] = ADDRESSES.hex_many(self.user_ids)
+        return users
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("FollowerTable index out of range")
+            return FollowerRow(self, int(index))
+        return self._take(index)
+
+    def __iter__(self) -> Iterator[FollowerRow]:
+        for i in range(len(self)):
+            yield FollowerRow(self, i)
+
+    def __repr__(self) -> str:
+        return f"<FollowerTable {len(self)} followers>"
+
+    def column(self, sort_by: str) -> np.ndarray:
+        """Array backing a sort metric ('pnl', 'roi', 'equity', 'days'; defaults to pnl)"""
+        return getattr(self, SORT_COLUMNS.get(sort_by.lower(), 'all_time_pnl'))
+
+    def filter(self, min_equity: float = None, min_roi: float = None) -> 'FollowerTable':
+        """Rows with equity >= min_equity and ROI % >= min_roi (None skips a filter)"""
+        if min_equity is None and min_roi is None:
+            return self
+        mask = np.ones(len(self), dtype=bool)
+        if min_equity is not None:
+            mask &= self.equity >= min_equity
+        if min_roi is not None:
+            mask &= self.roi >= min_roi
+        return self._take(mask)
+
+    def sort(self, sort_by: str = 'pnl', descending: bool = True) -> 'FollowerTable':
+        """Stable sort by a metric; ties keep their current order"""
+        key = self.column(sort_by)
+        order = np.argsort(-key if descending else key, kind='stable')
+        return self._take(order)
+
+    def top(self, n: int, sort_by: str = 'pnl', descending: bool = True) -> 'FollowerTable':
+        """
+        Best ``n`` rows by a metric without sorting the whole table
+
+        Rows are chosen by partial selection around the n-th best value and
+        only those are sorted. Ties break by current position, so the result
+        always equals ``sort(sort_by, descending)[:n]``.
+
+        Args:
+            n: Number of rows to keep
+            sort_by: Sort metric ('pnl', 'roi', 'equity', 'days')
+            descending: Best first when True
+
+        Returns:
+            New table of at most ``n`` rows, with ``total`` set to len(self)
+        """
+        key = self.column(sort_by)
+        if descending:
+            key = -key
+        if n >= len(self):
+            order = np.argsort(key, kind='stable')
+        elif n <= 0:
+            order = np.empty(0, dtype=np.intp)
+        else:
+            # Everything strictly better than the n-th value, then the
+            # earliest rows tied with it to fill up to n
+            kth = np.partition(key, n - 1)[n - 1]
+            better = np.flatnonzero(key < kth)
+            tied = np.flatnonzero(key == kth)[:n - len(better)]
+            selected = np.concatenate((better, tied))
+            order = selected[np.lexsort((selected, key[selected]))]
+        table = self._take(order)
+        table.total = len(self)
+        return table
+
+    def total_equity(self) -> float:
+        return float(self.equity.sum())
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Plain dict per row (the source dicts when kept, else typed values)"""
+        if self.raw is not None:
+            return list(self.raw)
+        return [dict(row) for row in self]
+
+    def to_dataframe(self):
+        """
+        DataFrame over the table's arrays without copying them
+
+        Returns:
+            pandas DataFrame with columns user_id, equity, pnl,
+            all_time_pnl, roi and days
+        """
+        import pandas as pd
+
+        return pd.DataFrame({
+            'user_id': self.user_ids,
+            'equity': self.equity,
+            'pnl': self.pnl,
+            'all_time_pnl': self.all_time_pnl,
+            'roi': self.roi,
+            'days': self.days,
+        }, copy=False)
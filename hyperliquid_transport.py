@@ -0,0 +1,271 @@
+"""
+Hyperliquid HTTP Transport - Pooled keep-alive sessions for the /info endpoint
+
+The module-level ``requests.post`` opens a new TCP+TLS connection for every call.
+HyperliquidTransport keeps a shared urllib3 connection pool instead, so repeated
+``vaultDetails`` / ``portfolio`` / ``meta`` requests reuse warm connections.
+
+RecordingTransport captures real request/response pairs to a JSONL file and
+ReplayTransport serves them back, so HyperliquidAPI can run fully offline.
+"""
+
+import itertools
+import json
+import threading
+import time
+import weakref
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from hyperliquid_cache import canonical_key
+
+
+DEFAULT_HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+
+class HyperliquidAPIError(Exception):
+    """Raised when an info request fails after all retries"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class HyperliquidTransport:
+    """Thread-safe pooled HTTP transport with keep-alive and gzip negotiation
+
+    Every thread gets its own lightweight ``requests.Session`` (sessions keep
+    mutable cookie/header state that is not safe to share), but all sessions
+    mount the same ``HTTPAdapter``. The adapter owns the urllib3 pool manager,
+    so connections are pooled and reused across every thread using the
+    transport. A session holds no connections of its own and is only
+    referenced weakly outside its thread, so short-lived threads (executor
+    workers, background refreshes) leave nothing behind when they exit.
+    """
+
+    def __init__(self, pool_size: int = 10, max_connections_per_host: int = 10,
+                 connect_timeout: float = 3.05, read_timeout: float = 10.0,
+                 pool_block: bool = True, gzip: bool = True):
+        """
+        Args:
+            pool_size: Number of per-host connection pools to keep cached
+            max_connections_per_host: Maximum open connections to a single host
+            connect_timeout: Seconds to wait for the TCP/TLS connection
+            read_timeout: Seconds to wait for the response after connecting
+            pool_block: Wait for a free connection instead of opening extra
+                unpooled ones once a host is at its connection limit
+            gzip: Negotiate gzip/deflate response compression
+        """
+        self.pool_size = pool_size
+        self.max_connections_per_host = max_connections_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.headers = dict(DEFAULT_HEADERS)
+        if not gzip:
+            self.headers['Accept-Encoding'] = 'identity'
+
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=max_connections_per_host,
+            pool_block=pool_block,
+            max_retries=0
+        )
+        self._local = threading.local()
+        # Sessions of live threads (each is owned by its thread's local storage)
+        self._sessions = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self):
+        """(connect, read) timeout tuple passed to requests"""
+        return (self.connect_timeout, self.read_timeout)
+
+    def _session(self) -> requests.Session:
+        """Return the calling thread's session, creating it on first use"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.add(session)
+        return session
+
+    def post(self, url: str, payload: Dict[str, Any], stream: bool = False,
+             timeout: Optional[tuple] = None) -> requests.Response:
+        """
+        POST a JSON payload over a pooled connection
+
+        Args:
+            url: Endpoint URL
+            payload: JSON-serialisable request body
+            stream: Leave the body unread so it can be consumed incrementally
+            timeout: Optional (connect, read) override
+
+        Returns:
+            The raw requests.Response (status is not checked here)
+        """
+        body = json.dumps(payload, separators=(',', ':'))
+        return self._session().post(
+            url,
+            data=body,
+            stream=stream,
+            timeout=timeout or self.timeout
+        )
+
+    def close(self):
+        """Close every session and drop pooled connections"""
+        with self._lock:
+            sessions, self._sessions = list(self._sessions), weakref.WeakSet()
+        for session in sessions:
+            session.close()
+        self._adapter.close()
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class RecordingTransport:
+    """Wrap a transport and append every request/response pair to a JSONL file
+
+    Each line is ``{"payload", "status", "headers", "body", "elapsed_ms",
+    "recorded_at"}`` with the decompressed body as text. The file can be
+    replayed with ReplayTransport or served by hyperliquid_mock_server.
+    """
+
+    RECORDED_HEADERS = ('Content-Type', 'Retry-After')
+
+    def __init__(self, path: str, inner: HyperliquidTransport = None):
+        """
+        Args:
+            path: JSONL file to append recordings to
+            inner: Transport that performs the real requests
+        """
+        self.path = path
+        self.inner = inner or HyperliquidTransport()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Timeouts, pool settings etc. come from the wrapped transport
+        return getattr(self.inner, name)
+
+    def post(self, url: str, payload: Dict[str, Any], stream: bool = False,
+             timeout: Optional[tuple] = None) -> requests.Response:
+        started = time.perf_counter()
+        response = self.inner.post(url, payload, stream=False, timeout=timeout)
+        record = {
+            'payload': payload,
+            'status': response.status_code,
+            'headers': {k: response.headers[k] for k in self.RECORDED_HEADERS if k in response.headers},
+            'body': response.content.decode('utf-8', errors='replace'),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+            'recorded_at': time.time(),
+        }
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+        return response
+
+    def close(self):
+        self.inner.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_recordings(path: str) -> Dict[str, list]:
+    """Load a recording file into {canonical payload key: [records...]}"""
+    recordings = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            recordings.setdefault(canonical_key(record['payload']), []).append(record)
+    return recordings
+
+
+def make_response(url: str, status: int, body: bytes, headers: Dict[str, str] = None) -> requests.Response:
+    """Build a fully-read requests.Response from raw parts"""
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response._content_consumed = True
+    response.headers = CaseInsensitiveDict(headers or {'Content-Type': 'application/json'})
+    response.url = url
+    response.encoding = 'utf-8'
+    response.reason = 'OK' if status < 400 else 'Error'
+    return response
+
+
+class ReplayTransport:
+    """Serve recorded responses instead of touching the network
+
+    Requests are matched by canonical payload. When a payload was recorded
+    several times the recordings are returned in order and then cycled, so a
+    replayed live-monitor session sees the same sequence of changes. Unknown
+    payloads get a 404.
+    """
+
+    def __init__(self, path: str, realtime: bool = False):
+        """
+        Args:
+            path: JSONL recording file written by RecordingTransport
+            realtime: Sleep for each recording's original latency
+        """
+        self.path = path
+        self.realtime = realtime
+        self.recordings = load_recordings(path)
+        self._cursors = {key: itertools.cycle(records) for key, records in self.recordings.items()}
+        self._lock = threading.Lock()
+
+        # Transport-compatible settings used by HyperliquidAPI helpers
+        self.max_connections_per_host = 10
+        self.connect_timeout = 3.05
+        self.read_timeout = 10.0
+
+    def post(self, url: str, payload: Dict[str, Any], stream: bool = False,
+             timeout: Optional[tuple] = None) -> requests.Response:
+        key = canonical_key(payload)
+        with self._lock:
+            cursor = self._cursors.get(key)
+            record = next(cursor) if cursor else None
+
+        if record is None:
+            body = json.dumps({'error': f"no recording for payload {key}"}).encode()
+            return make_response(url, 404, body)
+
+        if self.realtime:
+            time.sleep(record.get('elapsed_ms', 0) / 1000)
+        return make_response(url, record['status'], record['body'].encode('utf-8'),
+                             dict(record.get('headers') or {}))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,318 @@
+"""
+Hyperliquid Writer - Background batched SQLite writer
+
+Persisting snapshots must not stall the live refresh loop on disk I/O or on
+another process holding the database lock. BatchWriter takes rows on a
+bounded queue and a dedicated thread writes them: one ``BEGIN IMMEDIATE``
+transaction per batch, consecutive rows for the same statement sent with
+``executemany``. A batch is written when it reaches ``batch_size`` rows or
+its first row has waited ``flush_interval`` seconds.
+
+When the queue is full the ``backpressure`` policy decides what happens to a
+new row:
+
+- ``block``: the caller waits for room (nothing is lost)
+- ``drop``: the row is discarded and counted
+- ``spill``: the row is appended to a spill file next to the database and
+  written once the queue has drained; a spill file left by a crash is
+  written on the next start
+
+Rows are committed in the order they were written, spilled or not: once a
+row is spilled every later row goes to the spill file too, until the rows
+queued before it are committed and the spill file has been written.
+"""
+
+import itertools
+import os
+import pickle
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+
+BACKPRESSURE_POLICIES = ('block', 'drop', 'spill')
+
+# Queue entry asking the writer thread to commit everything before it
+_FLUSH = object()
+
+
+class BatchWriter:
+    """Bounded queue of SQL rows drained by one writer thread
+
+    ``write()`` returns as soon as the row is queued. Rows become visible to
+    readers after their batch commits; ``flush()`` waits for that.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 1.0,
+                 max_queue: int = 10_000, backpressure: str = 'block',
+                 spill_path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite file (opened in WAL mode)
+            batch_size: Rows per transaction
+            flush_interval: Maximum seconds a queued row waits for its batch
+            max_queue: Rows the queue holds before backpressure applies
+            backpressure: 'block', 'drop' or 'spill' (see module docstring)
+            spill_path: Spill file for the 'spill' policy (default: ``<path>.spill``)
+
+        Raises:
+            ValueError: Unknown backpressure policy
+        """
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"backpressure must be one of {BACKPRESSURE_POLICIES}, got {backpressure!r}")
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.backpressure = backpressure
+        self.spill_path = spill_path or f"{path}.spill"
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._spill_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._closed = False
+        # Rows are going to the spill file (see module docstring)
+        self._spilling = False
+
+        # Metrics
+        self.rows_written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+        self._conn = sqlite3.connect(path, timeout=10, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+        self._thread.start()
+
+    def write(self, sql: str, params: tuple) -> bool:
+        """
+        Queue one row
+
+        Returns:
+            False if the row was dropped by the 'drop' policy
+        """
+        if self._closed:
+            raise RuntimeError("BatchWriter is closed")
+        item = (sql, params)
+        if self.backpressure == 'block':
+            self._queue.put(item)
+        elif self.backpressure == 'drop':
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                with self._metrics_lock:
+                    self.dropped += 1
+                return False
+        else:
+            with self._spill_lock:
+                if not self._spilling:
+                    try:
+                        self._queue.put_nowait(item)
+                    except queue.Full:
+                        self._spilling = True
+                if self._spilling:
+                    self._spill(item)
+        depth = self._queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return True
+
+    def write_many(self, sql: str, rows: Iterable[tuple]) -> int:
+        """Queue several rows for one statement; returns how many were queued (not dropped)"""
+        return sum(self.write(sql, params) for params in rows)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every row queued so far (and any spilled row) is committed
+
+        Returns:
+            False if the timeout expired first
+
+        Raises:
+            RuntimeError: The writer is closed (nothing would ever commit)
+        """
+        if self._closed:
+            raise RuntimeError("BatchWriter is closed")
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def _spill(self, item: Tuple[str, tuple]):
+        """Append a row to the spill file (caller holds _spill_lock)"""
+        with open(self.spill_path, 'ab') as f:
+            pickle.dump(item, f)
+        with self._metrics_lock:
+            self.spilled += 1
+
+    def _commit(self, items: List[Tuple[str, tuple]]) -> bool:
+        """Write one batch in a single transaction; False if it failed"""
+        if not items:
+            return True
+        started = time.perf_counter()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, group in itertools.groupby(items, key=lambda item: item[0]):
+                    self._conn.executemany(sql, [params for _, params in group])
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            with self._metrics_lock:
+                self.errors += 1
+            print(f"⚠️  Failed to write a batch of {len(items)} rows to {self.path}: {e}")
+            return False
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._metrics_lock:
+            self.rows_written += len(items)
+            self.batches += 1
+            self.last_flush_ms = elapsed
+            self.max_flush_ms = max(self.max_flush_ms, elapsed)
+            self._total_flush_ms += elapsed
+        return True
+
+    def _drain_spill(self):
+        """
+        Write spilled rows; the file is only removed once they are committed
+
+        A batch that fails stays in the draining file with every row after
+        it, in order, and is retried by the next drain. Writes go back to the queue once nothing is left
+        to drain.
+        """
+        draining = f"{self.spill_path}.draining"
+        if not os.path.exists(draining):
+            with self._spill_lock:
+                if not os.path.exists(self.spill_path):
+                    self._spilling = False
+                    return
+                os.replace(self.spill_path, draining)
+        items = []
+        with open(draining, 'rb') as f:
+            while True:
+                try:
+                    items.append(pickle.load(f))
+                except EOFError:
+                    break
+                except (pickle.UnpicklingError, ValueError):
+                    # A torn last record from a crash mid-spill
+                    break
+        failed = []
+        for start in range(0, len(items), self.batch_size):
+            if not self._commit(items[start:start + self.batch_size]):
+                # Later rows may depend on this batch, so they wait for it
+                failed = items[start:]
+                break
+        if not failed:
+            os.remove(draining)
+            with self._spill_lock:
+                # Rows spilled meanwhile are drained next time
+                self._spilling = os.path.exists(self.spill_path)
+            return
+        if len(failed) < len(items):
+            # Keep only the rows still to write, replacing the file atomically
+            with open(f"{draining}.tmp", 'wb') as f:
+                for item in failed:
+                    pickle.dump(item, f)
+            os.replace(f"{draining}.tmp", draining)
+        with self._spill_lock:
+            self._spilling = True
+        print(f"⚠️  Kept {len(failed)} spilled rows in {draining} for the next drain")
+
+    def _run(self):
+        # Rows spilled by a previous run that did not get to write them
+        self._drain_spill()
+        batch, deadline = [], None
+        # flush() calls waiting for the spill file to be written
+        waiting = []
+        while True:
+            if self._spilling and self._queue.empty():
+                # Every row queued before the first spilled one is in
+                # ``batch`` or committed, so the spill file is next
+                self._commit(batch)
+                batch, deadline = [], None
+                self._drain_spill()
+                for done in waiting:
+                    done.set()
+                waiting = []
+
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._spilling:
+                # Retry a spill file that failed to drain
+                timeout = self.flush_interval if timeout is None else min(timeout, self.flush_interval)
+            try:
+                sql, params = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                if deadline is None or time.monotonic() < deadline:
+                    continue
+                sql = params = None
+            else:
+                if sql is _FLUSH or sql is None:
+                    # flush() or close(): commit everything, spilled rows included
+                    self._commit(batch)
+                    batch, deadline = [], None
+                    if sql is None:
+                        self._drain_spill()
+                        for done in waiting:
+                            done.set()
+                        return
+                    if self._spilling:
+                        # Queued rows come before the spilled ones
+                        waiting.append(params)
+                    else:
+                        params.set()
+                    continue
+                batch.append((sql, params))
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            # Batch full or its deadline reached
+            self._commit(batch)
+            batch, deadline = [], None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, backpressure counts and flush latency"""
+        with self._metrics_lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self.max_depth,
+                'max_queue': self.max_queue,
+                'backpressure': self.backpressure,
+                'rows_written': self.rows_written,
+                'batches': self.batches,
+                'dropped': self.dropped,
+                'spilled': self.spilled,
+                'errors': self.errors,
+                'last_flush_ms': round(self.last_flush_ms, 2),
+                'avg_flush_ms': round(self._total_flush_ms / self.batches, 2) if self.batches else 0.0,
+                'max_flush_ms': round(self.max_flush_ms, 2),
+            }
+
+    def describe(self) -> str:
+        """One-line status for the monitor footer"""
+        m = self.metrics()
+        text = (f"writer queue {m['queue_depth']}/{m['max_queue']} | "
+                f"flush {m['last_flush_ms']:.1f}ms (max {m['max_flush_ms']:.1f}ms)")
+        if m['dropped'] or m['spilled'] or m['errors']:
+            text += f" | {m['dropped']} dropped, {m['spilled']} spilled, {m['errors']} failed batches"
+        return text
+
+    def close(self):
+        """Write everything still queued or spilled, then stop the thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((None, None))
+        self._thread.join()
+        self._conn.close()
@@ -4,8 +4,10 @@ Test script to explore Hyperliquid API pagination options
 
 import requests
 import json
+import sys
 
-API_URL = "https://api.hyperliquid.xyz/info"
+# Pass --base-url http://127.0.0.1:8787/info to run against hyperliquid_mock_server
+API_URL = sys.argv[sys.argv.index("--base-url") + 1] if "--base-url" in sys.argv else "https://api.hyperliquid.xyz/info"
 HLP_VAULT = "0xdfc24b077bc1425ad1dea75bcb6f8158e10df303"
 
 def test_api_parameters():
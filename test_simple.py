@@ -2,10 +2,11 @@
 import sys
 sys.path.insert(0, 'D:/Project/Hyperliquid-Data')
 
-from hyperliquid_api_example import HyperliquidAPI
+from hyperliquid_api_example import api_from_args
 
+# Honours --base-url / --record / --replay, e.g. --replay session.jsonl runs offline
 print("Testing API connection...")
-api = HyperliquidAPI()
+api = api_from_args()
 
 hlp_vault = "0xdfc24b077bc1425ad1dea75bcb6f8158e10df303"
 print(f"\nFetching vault: {hlp_vault}")